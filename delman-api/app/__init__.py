@@ -1,22 +1,39 @@
+import logging
 from flask import Flask
 from config import get_config
 from app.exts import db, jwt, migrate
 from app.routes import register_routes
 from app.services import create_services
 from app.utils import CustomJSONProvider
+from app.cache import create_cache
+from app.cache.fragments import fragments
+from app.passwords import password_hasher
+from app.metrics import timing, install_db_hooks
+from app.metrics.slow_queries import slow_query_log
+from app.metrics.profiling import profiler
+from app.metrics.tracing import tracing
 
 def create_app():
     app = Flask(__name__)
     app.json_provider_class = CustomJSONProvider
     app.json = CustomJSONProvider(app)
     app.config.from_object(get_config())
+    logging.basicConfig(level=app.config['LOG_LEVEL'], format='%(asctime)s %(levelname)s %(name)s %(message)s')
 
     db.init_app(app)
     jwt.init_app(app)
     migrate.init_app(app, db)
+    fragments.init_app(app)
+    password_hasher.init_app(app)
+    timing.init_app(app)
+    slow_query_log.init_app(app)
+    profiler.init_app(app)
+    # Before create_services, which instruments the services and repositories it builds
+    tracing.init_app(app)
+    install_db_hooks()
 
     # Create services
-    services = create_services(db)
+    services = create_services(db, create_cache(app.config))
 
     # Register routes
     register_routes(app, services)
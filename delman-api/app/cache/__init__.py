@@ -0,0 +1,106 @@
+import threading
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+from app.cache.backends import NullBackend, MemoryBackend, SQLiteBackend, RedisBackend
+
+
+class Cache:
+    """Read-through cache with tag-based invalidation.
+
+    Every entry stores the versions of its tags at load time. Invalidating a tag bumps its
+    version in the backend, so with a shared backend an invalidation in one worker is seen
+    by all of them on their next read.
+    """
+
+    def __init__(self, backend=None, default_ttl=300, namespace='delman'):
+        self.backend = backend or NullBackend()
+        self.default_ttl = default_ttl
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    def get_or_load(self, key, tags, loader, ttl=None):
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        # Snapshot versions before loading, a write committed meanwhile makes this entry a miss
+        versions = self.backend.get_versions(tag_keys)
+        entry = self.backend.get(self._entry_key(key))
+        if entry is not None and entry[0] == versions:
+            self._count('hits')
+            return entry[1]
+
+        self._count('misses')
+        value = loader()
+        self.backend.set(self._entry_key(key), (versions, value), ttl or self.default_ttl)
+        return value
+
+    def invalidate(self, *tags):
+        self.backend.incr_versions([self._tag_key(tag) for tag in tags])
+        self._count('invalidations')
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        stats['backend'] = type(self.backend).__name__
+        return stats
+
+    def _count(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def _entry_key(self, key):
+        return f"{self.namespace}:entry:{key}"
+
+    def _tag_key(self, tag):
+        return f"{self.namespace}:tag:{tag}"
+
+
+def create_cache(config):
+    backend_name = config.get('CACHE_BACKEND', 'null')
+    max_entries = config.get('CACHE_MAX_ENTRIES', 10000)
+    if backend_name == 'memory':
+        backend = MemoryBackend(max_entries)
+    elif backend_name == 'sqlite':
+        backend = SQLiteBackend(config['CACHE_URL'], max_entries)
+    elif backend_name == 'redis':
+        backend = RedisBackend(config['CACHE_URL'])
+    elif backend_name == 'null':
+        backend = NullBackend()
+    else:
+        raise ValueError(f"Unknown CACHE_BACKEND '{backend_name}'")
+    return Cache(backend, config.get('CACHE_DEFAULT_TTL', 300))
+
+
+# Never written to a cache; from_row leaves them expired, so they load from the database on access
+UNCACHED_COLUMNS = frozenset(['password'])
+
+
+def to_row(instance):
+    """Loaded column values of an ORM instance, safe to share between workers (credentials left out)."""
+    if instance is None:
+        return None
+    state = inspect(instance)
+    return {
+        attr.key: state.dict[attr.key] for attr in state.mapper.column_attrs
+        if attr.key in state.dict and attr.key not in UNCACHED_COLUMNS
+    }
+
+
+def from_row(session, model, row):
+    """Turn a cached row back into a persistent instance of the current session without a query.
+
+    Columns missing from the row (e.g. after load_only) are left expired and load on access.
+    """
+    if row is None:
+        return None
+    mapper = inspect(model)
+    identity_key = mapper.identity_key_from_primary_key([row[column.key] for column in mapper.primary_key])
+    # Never overwrite an instance the session already holds, it may carry unflushed changes
+    existing = session.identity_map.get(identity_key)
+    if existing is not None:
+        return existing
+    instance = model(**row)
+    make_transient_to_detached(instance)
+    session.add(instance)
+    return instance
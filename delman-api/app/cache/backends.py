@@ -0,0 +1,188 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from app.cache import codec
+
+logger = logging.getLogger(__name__)
+
+
+class NullBackend:
+    """Stores nothing; every read is a miss."""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl):
+        pass
+
+    def get_versions(self, tag_keys):
+        return tuple(0 for _ in tag_keys)
+
+    def incr_versions(self, tag_keys):
+        pass
+
+
+class MemoryBackend:
+    """In-process LRU with per-entry TTL. Only coherent within a single worker."""
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        # Tag versions are kept out of the LRU, an evicted version would let stale entries match again
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_versions(self, tag_keys):
+        with self._lock:
+            return tuple(self._versions.get(key, 0) for key in tag_keys)
+
+    def incr_versions(self, tag_keys):
+        with self._lock:
+            for key in tag_keys:
+                self._versions[key] = self._versions.get(key, 0) + 1
+
+
+def _decode(value):
+    try:
+        return codec.loads(value)
+    except (ValueError, KeyError, TypeError):
+        # Unreadable entry (written by an older version or tampered with): treat it as a miss
+        logger.warning("Dropping undecodable cache entry")
+        return None
+
+
+class SQLiteBackend:
+    """Shared by every worker on the host through a local SQLite file.
+
+    Local stand-in for RedisBackend when all workers run in the same container. The file
+    is created 0600 in a 0700 directory and must belong to the user running the app;
+    entries are stored as JSON (see codec), never pickled.
+    """
+
+    PRUNE_EVERY = 500
+
+    def __init__(self, path, max_entries=10000):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        _private_file(path)
+        self._connection().executescript("""
+            CREATE TABLE IF NOT EXISTS cache_entry (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL);
+            CREATE INDEX IF NOT EXISTS ix_cache_entry_expires_at ON cache_entry (expires_at);
+            CREATE TABLE IF NOT EXISTS cache_tag (key TEXT PRIMARY KEY, version INTEGER NOT NULL);
+        """)
+
+    def _connection(self):
+        # One connection per thread and per process, sqlite connections must not cross a fork
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def get(self, key):
+        row = self._connection().execute(
+            'SELECT value FROM cache_entry WHERE key = ? AND expires_at >= ?', (key, time.time())
+        ).fetchone()
+        return _decode(row[0]) if row else None
+
+    def set(self, key, value, ttl):
+        conn = self._connection()
+        conn.execute(
+            'INSERT OR REPLACE INTO cache_entry (key, value, expires_at) VALUES (?, ?, ?)',
+            (key, codec.dumps(value), time.time() + ttl)
+        )
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 0:
+            self._prune(conn)
+
+    def _prune(self, conn):
+        conn.execute('DELETE FROM cache_entry WHERE expires_at < ?', (time.time(),))
+        conn.execute(
+            'DELETE FROM cache_entry WHERE key IN ('
+            'SELECT key FROM cache_entry ORDER BY expires_at DESC LIMIT -1 OFFSET ?)',
+            (self.max_entries,)
+        )
+
+    def get_versions(self, tag_keys):
+        if not tag_keys:
+            return ()
+        rows = dict(self._connection().execute(
+            f"SELECT key, version FROM cache_tag WHERE key IN ({','.join('?' * len(tag_keys))})", tuple(tag_keys)
+        ).fetchall())
+        return tuple(rows.get(key, 0) for key in tag_keys)
+
+    def incr_versions(self, tag_keys):
+        conn = self._connection()
+        conn.executemany(
+            'INSERT INTO cache_tag (key, version) VALUES (?, 1) '
+            'ON CONFLICT (key) DO UPDATE SET version = version + 1',
+            [(key,) for key in tag_keys]
+        )
+
+
+def _private_file(path):
+    """Create `path` readable by this user only; refuse a file somebody else owns."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        if os.fstat(fd).st_uid != os.getuid():
+            raise RuntimeError(f"Cache file {path} is owned by another user")
+        os.fchmod(fd, 0o600)
+    finally:
+        os.close(fd)
+
+
+class RedisBackend:
+    """Shared across hosts. Needs the optional `redis` package. Entries are stored as JSON."""
+
+    def __init__(self, url):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package to be installed.")
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        value = self.client.get(key)
+        return _decode(value) if value is not None else None
+
+    def set(self, key, value, ttl):
+        self.client.set(key, codec.dumps(value), ex=ttl)
+
+    def get_versions(self, tag_keys):
+        if not tag_keys:
+            return ()
+        return tuple(int(version or 0) for version in self.client.mget(tag_keys))
+
+    def incr_versions(self, tag_keys):
+        pipe = self.client.pipeline()
+        for key in tag_keys:
+            pipe.incr(key)
+        pipe.execute()
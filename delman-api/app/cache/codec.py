@@ -0,0 +1,58 @@
+"""JSON encoding for values kept in shared cache backends.
+
+The shared backends live outside the process (a file, a Redis server), so what they hand
+back is never trusted with pickle: decoding only ever produces JSON types plus the few
+types cached rows hold, tagged by name. Enums are rebuilt only from the classes listed in
+ENUMS, never from a name found in the data.
+"""
+import json
+from datetime import date, datetime, time
+from app.models.appointment import AppointmentStatus
+from app.models.gender import Gender
+
+ENUMS = {cls.__name__: cls for cls in (Gender, AppointmentStatus)}
+
+
+def dumps(value):
+    return json.dumps(_pack(value), separators=(',', ':'))
+
+
+def loads(text):
+    return json.loads(text, object_hook=_unpack)
+
+
+def _pack(value):
+    # datetime before date: a datetime is also a date
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, date):
+        return {'__date__': value.isoformat()}
+    if isinstance(value, time):
+        return {'__time__': value.isoformat()}
+    if isinstance(value, tuple):
+        return {'__tuple__': [_pack(item) for item in value]}
+    if isinstance(value, list):
+        return [_pack(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _pack(item) for key, item in value.items()}
+    enum = ENUMS.get(type(value).__name__)
+    if enum is not None and isinstance(value, enum):
+        return {'__enum__': type(value).__name__, 'value': value.value}
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    raise TypeError(f"Cannot cache a value of type {type(value).__name__}")
+
+
+def _unpack(obj):
+    if len(obj) == 1:
+        if '__datetime__' in obj:
+            return datetime.fromisoformat(obj['__datetime__'])
+        if '__date__' in obj:
+            return date.fromisoformat(obj['__date__'])
+        if '__time__' in obj:
+            return time.fromisoformat(obj['__time__'])
+        if '__tuple__' in obj:
+            return tuple(obj['__tuple__'])
+    if len(obj) == 2 and '__enum__' in obj:
+        return ENUMS[obj['__enum__']](obj['value'])
+    return obj
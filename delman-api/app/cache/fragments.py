@@ -0,0 +1,71 @@
+import threading
+from collections import OrderedDict
+from flask import current_app
+
+
+class FragmentCache:
+    """Per-worker LRU of JSON-encoded rows keyed by (schema, id, updated_at, version), bounded in bytes.
+
+    A row only gets re-serialised when it is written, so list responses mostly become a
+    join of cached byte strings. updated_at alone is not enough: SQLite stores it to the
+    second, and the version column tells apart two writes within the same second.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._fragments = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def init_app(self, app):
+        self.max_bytes = app.config.get('FRAGMENT_CACHE_MAX_BYTES', self.max_bytes)
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._fragments.clear()
+            self._size = 0
+
+    def encode(self, schema, item):
+        updated_at = getattr(item, 'updated_at', None)
+        if updated_at is None:
+            return self._encode(schema, item)
+
+        key = (schema, item.id, updated_at, getattr(item, 'version', None))
+        with self._lock:
+            fragment = self._fragments.get(key)
+            if fragment is not None:
+                self._fragments.move_to_end(key)
+                self.hits += 1
+                return fragment
+            self.misses += 1
+
+        fragment = self._encode(schema, item)
+        self._store(key, fragment)
+        return fragment
+
+    def _encode(self, schema, item):
+        # Same encoder, separators and (field) key order as compact jsonify, so the bytes match
+        return current_app.json.dumps(schema.model_validate(item).model_dump(), separators=(',', ':')).encode()
+
+    def _store(self, key, fragment):
+        if len(fragment) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._fragments.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._fragments[key] = fragment
+            self._size += len(fragment)
+            while self._size > self.max_bytes:
+                _, evicted = self._fragments.popitem(last=False)
+                self._size -= len(evicted)
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._fragments), 'bytes': self._size}
+
+
+fragments = FragmentCache()
@@ -23,3 +23,9 @@ class ValidationError(Exception):
     def __init__(self, message: str):
         self.message = message
         super().__init__(self.message)
+
+class PasswordHasherBusyError(Exception):
+    """Raised when the password hashing pool is saturated and the request should be retried later."""
+    def __init__(self, message: str = "Server is busy, please retry shortly."):
+        self.message = message
+        super().__init__(self.message)
@@ -0,0 +1,219 @@
+import ipaddress
+import json
+import logging
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+from flask import current_app, g, request, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.metrics.slow_queries import slow_query_log
+from app.metrics.tracing import tracing
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:  # optional: timing and Server-Timing still work without it
+    prometheus_client = None
+
+# Request latency buckets in seconds, fine enough around 5-500ms for p50/p95/p99 via histogram_quantile
+LATENCY_BUCKETS = (.005, .01, .025, .05, .075, .1, .15, .25, .35, .5, .75, 1.0, 1.5, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+logger = logging.getLogger('delman.requests')
+
+
+
+def allowed_address(address, networks):
+    """True when `address` falls in one of `networks` (CIDR strings)."""
+    try:
+        address = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(address in ipaddress.ip_network(network, strict=False) for network in networks)
+
+
+class RequestTiming:
+    """Splits each request's time into segments (db, auth, hash, serialize) and exports it.
+
+    It also counts the SQL statements of the request: the count goes to the structured
+    request log (and X-Query-Count in debug), and a statement repeated
+    QUERY_REPEAT_THRESHOLD times is logged as a likely N+1.
+
+    Segments are reported in the Server-Timing header of responses to clients in
+    METRICS_ALLOWED_NETWORKS and, when prometheus_client is installed, aggregated per
+    route into Prometheus metrics. With
+    PROMETHEUS_MULTIPROC_DIR set the metrics of all gunicorn workers are merged on scrape.
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self._request_duration = None
+        self._segment_duration = None
+        self._queries = None
+        self.repeat_threshold = 10
+        self.count_header = False
+
+    def init_app(self, app):
+        self.enabled = app.config.get('REQUEST_TIMING_ENABLED', True)
+        if not self.enabled:
+            return
+        self.repeat_threshold = app.config.get('QUERY_REPEAT_THRESHOLD', self.repeat_threshold)
+        self.count_header = app.config.get('QUERY_COUNT_HEADER', app.debug)
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        jwt_timing_loaders(app)
+        install_db_hooks()
+        if prometheus_client and self._request_duration is None:
+            self._request_duration = prometheus_client.Histogram(
+                'delman_http_request_duration_seconds', 'Request handling time',
+                ['method', 'route', 'status'], buckets=LATENCY_BUCKETS
+            )
+            self._segment_duration = prometheus_client.Counter(
+                'delman_http_request_segment_seconds', 'Request time spent per segment',
+                ['route', 'segment']
+            )
+            self._queries = prometheus_client.Histogram(
+                'delman_http_request_queries', 'SQL statements per request', ['route'], buckets=QUERY_BUCKETS
+            )
+
+    def add(self, segment, seconds):
+        """Add `seconds` to `segment` of the current request; a no-op outside requests."""
+        if has_request_context():
+            segments = g.get('timing_segments')
+            if segments is not None:
+                segments[segment] = segments.get(segment, 0.0) + seconds
+
+    def count_query(self, statement):
+        if has_request_context():
+            queries = g.get('timing_queries')
+            if queries is not None:
+                queries[statement] += 1
+
+    @contextmanager
+    def segment(self, name):
+        started = time.perf_counter()
+        try:
+            with tracing.span(name, **{'delman.layer': name}):
+                yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def _start(self):
+        g.timing_started = time.perf_counter()
+        g.timing_segments = {}
+        g.timing_queries = Counter()
+
+    def _finish(self, response):
+        started = g.get('timing_started')
+        if started is None:
+            return response
+        total = time.perf_counter() - started
+        segments = g.timing_segments
+        # Same audience as /metrics: segment timings tell outsiders which logins hashed a password
+        if allowed_address(request.remote_addr, current_app.config.get('METRICS_ALLOWED_NETWORKS', [])):
+            response.headers['Server-Timing'] = ', '.join(
+                [f'{name};dur={seconds * 1000:.2f}' for name, seconds in segments.items()]
+                + [f'total;dur={total * 1000:.2f}']
+            )
+        # The rule, not the path: /doctors/<int:id> is one series however many ids there are
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        queries = g.timing_queries
+        query_count = sum(queries.values())
+        if self.count_header:
+            response.headers['X-Query-Count'] = str(query_count)
+
+        for statement, count in queries.items():
+            if count >= self.repeat_threshold:
+                logger.warning(json.dumps({
+                    "event": "repeated_query", "method": request.method, "route": route,
+                    "count": count, "statement": _one_line(statement)
+                }))
+        logger.info(json.dumps({
+            "event": "request", "method": request.method, "route": route, "status": response.status_code,
+            "queries": query_count, "db_ms": round(segments.get('db', 0.0) * 1000, 2),
+            "total_ms": round(total * 1000, 2)
+        }))
+
+        if self._request_duration is not None:
+            self._request_duration.labels(request.method, route, response.status_code).observe(total)
+            self._queries.labels(route).observe(query_count)
+            for name, seconds in segments.items():
+                self._segment_duration.labels(route, name).inc(seconds)
+        return response
+
+
+def render_metrics():
+    """(body, content type) of the Prometheus exposition, merged across workers when multiprocess."""
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
+
+
+@contextmanager
+def capture_queries():
+    """Collect the SQL of every statement executed inside the block, on any engine."""
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(Engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, 'before_cursor_execute', record)
+
+
+def jwt_timing_loaders(app):
+    """Time JWT verification: it starts at the decode key lookup and ends at the custom verification hook."""
+    from flask_jwt_extended.config import config
+    from app.exts import jwt
+
+    @jwt.decode_key_loader
+    def decode_key(jwt_header, jwt_data):
+        g.auth_started = time.perf_counter()
+        return config.decode_key
+
+    @jwt.token_verification_loader
+    def verified(jwt_header, jwt_data):
+        started = g.pop('auth_started', None)
+        if started is not None:
+            timing.add('auth', time.perf_counter() - started)
+        return True
+
+
+def install_db_hooks():
+    """Time every statement on every engine, once per process; shared by timing and the slow-query log."""
+    if not event.contains(Engine, 'after_cursor_execute', _after_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(Engine, 'handle_error', _handle_error)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_started'].pop()
+    timing.add('db', elapsed)
+    timing.count_query(statement)
+    slow_query_log.observe(conn, statement, parameters, executemany, elapsed)
+
+
+def _handle_error(context):
+    # after_cursor_execute does not run for a failed statement
+    if context.connection is not None and context.connection.info.get('query_started'):
+        context.connection.info['query_started'].pop()
+
+
+def _one_line(statement):
+    return ' '.join(statement.split())
+
+
+timing = RequestTiming()
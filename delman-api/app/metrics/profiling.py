@@ -0,0 +1,140 @@
+import cProfile
+import json
+import logging
+import os
+import pstats
+import random
+import time
+from flask import g, request
+from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+
+logger = logging.getLogger('delman.profiling')
+
+# First match wins, so app layers are checked before the libraries they call into
+LAYERS = (
+    ('route', ('/app/routes/',)),
+    ('service', ('/app/services/',)),
+    ('repository', ('/app/repositories/',)),
+    ('serialization', ('/app/schemas/', '/app/cache/fragments', '/pydantic', '/json/', "'_json.")),
+    ('db', ('/sqlalchemy/', '/psycopg2/', 'sqlite3')),
+    ('hashing', ('/werkzeug/security', 'hashlib', '/app/passwords/')),
+    ('framework', ('/flask/', '/werkzeug/', '/flask_jwt_extended/', '/jwt/')),
+)
+
+
+class RequestProfiler:
+    """cProfile for single live requests, off unless PROFILING_ENABLED.
+
+    A request is profiled when an employee listed in PROFILING_ADMIN_IDS sends
+    `X-Profile: 1`, or at random with probability PROFILING_SAMPLE_RATE. The raw profile
+    (.prof, for pstats/snakeviz) and a JSON summary split by layer are written to
+    PROFILING_DIR; the response carries the report id in X-Profile-Id.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.admin_ids = set()
+        self.sample_rate = 0.0
+        self.directory = None
+
+    def init_app(self, app):
+        self.enabled = app.config.get('PROFILING_ENABLED', False)
+        self.admin_ids = {int(id) for id in app.config.get('PROFILING_ADMIN_IDS', []) if str(id).strip()}
+        self.sample_rate = app.config.get('PROFILING_SAMPLE_RATE', 0.0)
+        self.directory = app.config.get('PROFILING_DIR') or os.path.join(app.instance_path, 'profiles')
+        if self.enabled:
+            _private_directory(self.directory)
+            app.before_request(self._start)
+            app.after_request(self._finish)
+
+    def is_admin(self):
+        try:
+            verify_jwt_in_request(optional=True)
+        except Exception:
+            return False
+        return get_jwt_identity() in self.admin_ids
+
+    def report_path(self, report_id, suffix='.json'):
+        # Ids are generated here, never taken from the client as a path
+        if not report_id.replace('-', '').replace('_', '').isalnum():
+            return None
+        return os.path.join(self.directory, report_id + suffix)
+
+    def _start(self):
+        requested = request.headers.get('X-Profile') == '1' and self.is_admin()
+        if not requested and not (self.sample_rate and random.random() < self.sample_rate):
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:  # another profiler is already active in this thread
+            return
+        g.profile = profile
+        g.profile_started = time.perf_counter()
+
+    def _finish(self, response):
+        profile = g.pop('profile', None)
+        if profile is None:
+            return response
+        profile.disable()
+        total = time.perf_counter() - g.profile_started
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        report_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{random.getrandbits(32):08x}"
+        try:
+            profile.dump_stats(self.report_path(report_id, '.prof'))
+            summary = summarize(profile, total)
+            summary.update(id=report_id, method=request.method, route=route, status=response.status_code)
+            with open(self.report_path(report_id), 'w') as report:
+                json.dump(summary, report)
+            response.headers['X-Profile-Id'] = report_id
+        except OSError:
+            logger.exception("Could not store profile of %s %s", request.method, route)
+        return response
+
+
+def _private_directory(path):
+    """Create `path` usable by this user only: profiles show request code paths and timings."""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    if os.stat(path).st_uid != os.getuid():
+        raise RuntimeError(f"Profiling directory {path} is owned by another user")
+    os.chmod(path, 0o700)
+
+
+def summarize(profile, total, top=25):
+    """Self time per layer plus the app functions with the highest cumulative time."""
+    stats = pstats.Stats(profile)
+    layers = {}
+    functions = []
+    for (filename, line, name), (_, calls, self_time, cumulative, _) in stats.stats.items():
+        location = filename if filename != '~' else name
+        layer = _layer(location)
+        layers[layer] = layers.get(layer, 0.0) + self_time
+        if layer in ('route', 'service', 'repository') or '/app/' in filename:
+            functions.append({
+                "function": f"{_short(filename)}:{line}({name})",
+                "layer": layer,
+                "calls": calls,
+                "self_ms": round(self_time * 1000, 3),
+                "cumulative_ms": round(cumulative * 1000, 3),
+            })
+    functions.sort(key=lambda function: function["cumulative_ms"], reverse=True)
+    return {
+        "total_ms": round(total * 1000, 3),
+        "layers_ms": {layer: round(seconds * 1000, 3) for layer, seconds in sorted(layers.items(), key=lambda item: -item[1])},
+        "top": functions[:top],
+    }
+
+
+def _layer(location):
+    for layer, markers in LAYERS:
+        if any(marker in location for marker in markers):
+            return layer
+    return 'other'
+
+
+def _short(filename):
+    index = filename.find('/app/')
+    return filename[index + 1:] if index >= 0 else filename
+
+
+profiler = RequestProfiler()
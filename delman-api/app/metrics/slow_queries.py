@@ -0,0 +1,113 @@
+import json
+import logging
+import queue
+import re
+import sys
+import threading
+import time
+from flask import request, has_request_context
+
+logger = logging.getLogger('delman.slow_queries')
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+
+
+class SlowQueryLog:
+    """Logs statements slower than SLOW_QUERY_THRESHOLD_MS, with where they came from.
+
+    Parameters are reduced to their types, the route and repository method are taken from
+    the request and the call stack. On PostgreSQL the plan of a slow statement is captured
+    with EXPLAIN (no ANALYZE, so nothing is executed) on a background thread. At most one
+    plan per statement per SLOW_QUERY_EXPLAIN_INTERVAL seconds, and at most
+    SLOW_QUERY_EXPLAIN_QUEUE waiting, so capturing plans cannot add load of its own.
+    """
+
+    def __init__(self):
+        self.threshold = 0.0
+        self.explain = False
+        self.explain_interval = 60.0
+        self._explained = {}
+        self._explain_queue = queue.Queue(maxsize=4)
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.threshold = app.config.get('SLOW_QUERY_THRESHOLD_MS', 0) / 1000.0
+        self.explain = app.config.get('SLOW_QUERY_EXPLAIN', False)
+        self.explain_interval = app.config.get('SLOW_QUERY_EXPLAIN_INTERVAL', self.explain_interval)
+        self._explain_queue = queue.Queue(maxsize=app.config.get('SLOW_QUERY_EXPLAIN_QUEUE', 4))
+
+    def observe(self, conn, statement, parameters, executemany, elapsed):
+        if not self.threshold or elapsed < self.threshold:
+            return
+        logger.warning(json.dumps({
+            "event": "slow_query",
+            "ms": round(elapsed * 1000, 2),
+            "route": request.url_rule.rule if has_request_context() and request.url_rule else None,
+            "repository": _repository_caller(),
+            "statement": ' '.join(statement.split()),
+            "parameters": redact(parameters),
+        }))
+        if self.explain and not executemany and conn.dialect.name == 'postgresql' \
+                and not statement.lstrip().upper().startswith('EXPLAIN') and self._claim(statement):
+            try:
+                self._explain_queue.put_nowait((conn.engine, statement, parameters))
+                self._ensure_worker()
+            except queue.Full:
+                pass
+
+    def _claim(self, statement):
+        """True at most once per explain_interval for the same statement text."""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._explained.get(statement, float('-inf')) < self.explain_interval:
+                return False
+            self._explained[statement] = now
+            if len(self._explained) > 1000:
+                self._explained = {key: at for key, at in self._explained.items() if now - at < self.explain_interval}
+            return True
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._explain_loop, name='slow-query-explain', daemon=True)
+                self._worker.start()
+
+    def _explain_loop(self):
+        while True:
+            engine, statement, parameters = self._explain_queue.get()
+            try:
+                with engine.connect() as conn:
+                    rows = conn.exec_driver_sql('EXPLAIN ' + statement, parameters).fetchall()
+                # The plan repeats the bound values as literals, keep those out of the log too
+                plan = '\n'.join(_STRING_LITERAL.sub("'?'", row[0]) for row in rows)
+                logger.warning(json.dumps({"event": "slow_query_plan", "statement": ' '.join(statement.split()), "plan": plan}))
+            except Exception:
+                logger.exception("EXPLAIN of a slow query failed")
+
+
+def redact(parameters):
+    """Replace bound values by their type names; the statement shape stays, the data does not."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact(value) if isinstance(value, (dict, list, tuple)) else type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _repository_caller():
+    """'PatientRepository.search' for the innermost repository method on the stack, if any."""
+    helper = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        if frame.f_globals.get('__name__', '').startswith('app.repositories.'):
+            owner = frame.f_locals.get('self')
+            if owner is not None:
+                return f"{type(owner).__name__}.{frame.f_code.co_name}"
+            # A module-level helper such as update_returning; keep looking for its caller
+            helper = helper or frame.f_code.co_name
+        frame = frame.f_back
+    return helper
+
+
+slow_query_log = SlowQueryLog()
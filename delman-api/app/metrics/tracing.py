@@ -0,0 +1,168 @@
+import functools
+import inspect
+import logging
+import os
+from contextlib import contextmanager
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+try:
+    from opentelemetry import trace, context as otel_context
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+except ImportError:  # optional: without it every span below is a no-op
+    trace = None
+
+logger = logging.getLogger('delman.tracing')
+
+
+class Tracing:
+    """OpenTelemetry spans for request → service → repository → SQL statement.
+
+    Off unless TRACING_EXPORTER is set to `console`, `file` (JSON lines in TRACING_FILE)
+    or `otlp` (OTLP/HTTP to TRACING_OTLP_ENDPOINT, e.g. a local collector or Jaeger).
+    Services and repositories are wrapped per instance by `instrument`, so the classes
+    themselves stay untouched and tests that build them directly see no spans.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.tracer = None
+        self._provider = None
+
+    def init_app(self, app):
+        exporter = app.config.get('TRACING_EXPORTER', '')
+        if not exporter:
+            return
+        if trace is None:
+            logger.warning("TRACING_EXPORTER=%s but opentelemetry is not installed, tracing is off", exporter)
+            return
+        if self._provider is None:
+            self._provider = _provider(app.config, exporter)
+        self.tracer = self._provider.get_tracer('delman')
+        self.enabled = True
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.teardown_request(self._teardown)
+        if not event.contains(Engine, 'after_cursor_execute', _after_cursor_execute):
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+            event.listen(Engine, 'handle_error', _handle_error)
+
+    @contextmanager
+    def span(self, name, **attributes):
+        if not self.enabled:
+            yield None
+            return
+        with self.tracer.start_as_current_span(name, attributes=attributes) as span:
+            yield span
+
+    def instrument(self, instance, layer):
+        """Give every method of `instance` (private ones included) a span of its own."""
+        if not self.enabled:
+            return instance
+        cls = type(instance)
+        for name, attribute in inspect.getmembers(cls):
+            if name.startswith('__') or not inspect.isfunction(inspect.getattr_static(cls, name)):
+                continue
+            # A generator's work happens after it returns, a span around the call would be empty
+            if inspect.isgeneratorfunction(attribute):
+                continue
+            setattr(instance, name, self._wrap(getattr(instance, name), f'{cls.__name__}.{name}', layer))
+        return instance
+
+    def _wrap(self, method, name, layer):
+        @functools.wraps(method)
+        def traced(*args, **kwargs):
+            with self.tracer.start_as_current_span(name, attributes={'delman.layer': layer}):
+                return method(*args, **kwargs)
+        return traced
+
+    def _start(self):
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        span = self.tracer.start_span(f'{request.method} {route}', kind=SpanKind.SERVER, attributes={
+            'delman.layer': 'route', 'http.method': request.method, 'http.route': route, 'http.target': request.path
+        })
+        g.trace_span = span
+        g.trace_token = otel_context.attach(trace.set_span_in_context(span))
+
+    def _finish(self, response):
+        span = g.get('trace_span')
+        if span is not None:
+            span.set_attribute('http.status_code', response.status_code)
+            if response.status_code >= 500:
+                span.set_status(Status(StatusCode.ERROR))
+        return response
+
+    def _teardown(self, exc):
+        span = g.pop('trace_span', None)
+        if span is None:
+            return
+        if exc is not None:
+            span.record_exception(exc)
+            span.set_status(Status(StatusCode.ERROR))
+        span.end()
+        otel_context.detach(g.pop('trace_token'))
+
+    def shutdown(self):
+        if self._provider is not None:
+            self._provider.shutdown()
+
+
+def _provider(config, exporter):
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+    if exporter == 'console':
+        span_exporter = ConsoleSpanExporter()
+    elif exporter == 'file':
+        span_exporter = ConsoleSpanExporter(
+            out=open(config.get('TRACING_FILE', '/tmp/delman-traces.jsonl'), 'a'),
+            formatter=lambda span: span.to_json(indent=None) + os.linesep
+        )
+    elif exporter == 'otlp':
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        span_exporter = OTLPSpanExporter(endpoint=config.get('TRACING_OTLP_ENDPOINT', 'http://localhost:4318/v1/traces'))
+    else:
+        raise ValueError(f"Unknown TRACING_EXPORTER {exporter!r}, expected console, file or otlp")
+
+    provider = TracerProvider(
+        resource=Resource.create({'service.name': config.get('TRACING_SERVICE_NAME', 'delman-api')}),
+        sampler=ParentBased(TraceIdRatioBased(config.get('TRACING_SAMPLE_RATIO', 1.0)))
+    )
+    provider.add_span_processor(BatchSpanProcessor(span_exporter))
+    return provider
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not tracing.enabled or context is None:
+        return
+    # Parameters are left out on purpose, they hold patient data
+    context._trace_span = tracing.tracer.start_span(
+        statement.split(None, 1)[0].upper() if statement else 'SQL', kind=SpanKind.CLIENT, attributes={
+            'delman.layer': 'db', 'db.system': conn.dialect.name, 'db.statement': statement,
+            'db.executemany': executemany
+        }
+    )
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    span = getattr(context, '_trace_span', None)
+    if span is not None:
+        span.end()
+        context._trace_span = None
+
+
+def _handle_error(exception_context):
+    context = exception_context.execution_context
+    span = getattr(context, '_trace_span', None)
+    if span is not None:
+        span.record_exception(exception_context.original_exception)
+        span.set_status(Status(StatusCode.ERROR))
+        span.end()
+        context._trace_span = None
+
+
+tracing = Tracing()
@@ -1,5 +1,5 @@
 from app.exts import db
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, literal_column
 from enum import Enum
 
 class AppointmentStatus(Enum):
@@ -17,6 +17,9 @@ class Appointment(db.Model):
     notes = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, server_default=func.now())
     updated_at = db.Column(db.DateTime, server_default=func.now(), onupdate=func.now())
+    # Bumped with updated_at on every write; tells apart two writes within updated_at's one-second resolution
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1', onupdate=literal_column('version') + 1)
 
-    patient = db.relationship('Patient', backref=db.backref('appointments', cascade='all, delete-orphan'))
-    doctor = db.relationship('Doctor', backref=db.backref('appointments', cascade='all, delete-orphan'))
+    # passive_deletes: leave removing appointments to ON DELETE CASCADE instead of loading them first
+    patient = db.relationship('Patient', backref=db.backref('appointments', cascade='all, delete-orphan', passive_deletes=True))
+    doctor = db.relationship('Doctor', backref=db.backref('appointments', cascade='all, delete-orphan', passive_deletes=True))
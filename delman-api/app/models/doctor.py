@@ -1,5 +1,5 @@
 from app.exts import db
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, literal_column
 from app.models.gender import Gender
 
 class Doctor(db.Model):
@@ -13,3 +13,5 @@ class Doctor(db.Model):
     work_end_time = db.Column(db.Time, nullable=False)
     created_at = db.Column(db.DateTime, server_default=func.now())
     updated_at = db.Column(db.DateTime, server_default=func.now(), onupdate=func.now())
+    # Bumped with updated_at on every write; tells apart two writes within updated_at's one-second resolution
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1', onupdate=literal_column('version') + 1)
@@ -1,5 +1,5 @@
 from app.exts import db
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, literal_column
 from app.models.gender import Gender
 
 class Patient(db.Model):
@@ -13,3 +13,12 @@ class Patient(db.Model):
     vaccine_count = db.Column(db.Integer, nullable=True)
     created_at = db.Column(db.DateTime, server_default=func.now())
     updated_at = db.Column(db.DateTime, server_default=func.now(), onupdate=func.now())
+    # Bumped with updated_at on every write; tells apart two writes within updated_at's one-second resolution
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1', onupdate=literal_column('version') + 1)
+
+    # Search indexes, created by migration 8a4e6c0b5d21 (Postgres only).
+    __table_args__ = (
+        db.Index('ix_patient_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+        db.Index('ix_patient_address_trgm', 'address', postgresql_using='gin', postgresql_ops={'address': 'gin_trgm_ops'}),
+        db.Index('ix_patient_no_ktp_prefix', 'no_ktp', postgresql_ops={'no_ktp': 'varchar_pattern_ops'}),
+    )
@@ -0,0 +1,184 @@
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from werkzeug.security import generate_password_hash, check_password_hash, DEFAULT_PBKDF2_ITERATIONS
+from app.exceptions import PasswordHasherBusyError
+from app.metrics import timing
+
+logger = logging.getLogger(__name__)
+
+# Pools are started from request threads of a multi-threaded worker; forking there could copy a
+# lock some other thread holds into the child, so the children come from a forkserver (or spawn)
+POOL_CONTEXT = multiprocessing.get_context(
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+)
+
+
+class PasswordHasher:
+    """Runs password hashing in a small bounded process pool instead of on the request worker.
+
+    At most `workers + queue_limit` hashes are in flight per request worker. Past that,
+    calls fail fast with PasswordHasherBusyError, so a burst of logins gets a quick 503
+    instead of every worker queueing on CPU. workers=0 hashes inline (tests, scripts).
+    """
+
+    def __init__(self, method='pbkdf2:sha256', salt_length=16, workers=0, queue_limit=0, timeout=10, bulk_workers=None):
+        self._lock = threading.Lock()
+        self._bulk_lock = threading.Lock()
+        # Request threads of one worker share the counters; += on an attribute is not atomic
+        self._stats_lock = threading.Lock()
+        self._pool = None
+        self._pool_pid = None
+        self.configure(method, salt_length, workers, queue_limit, timeout, bulk_workers)
+
+    def init_app(self, app):
+        self.configure(
+            app.config.get('PASSWORD_HASH_METHOD', self.method),
+            app.config.get('PASSWORD_HASH_SALT_LENGTH', self.salt_length),
+            app.config.get('PASSWORD_HASH_WORKERS', self.workers),
+            app.config.get('PASSWORD_HASH_QUEUE_LIMIT', self.queue_limit),
+            app.config.get('PASSWORD_HASH_TIMEOUT', self.timeout),
+            app.config.get('PASSWORD_HASH_BULK_WORKERS', self.bulk_workers),
+        )
+
+    def configure(self, method, salt_length, workers, queue_limit, timeout, bulk_workers=None):
+        self.shutdown()
+        self.method = method
+        self.salt_length = salt_length
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.timeout = timeout
+        self.bulk_workers = bulk_workers or os.cpu_count() or 1
+        self._slots = threading.BoundedSemaphore(workers + queue_limit) if workers else None
+        self._prefix = _hash_prefix(method)
+        self.hashes = 0
+        self.verifications = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.seconds = 0.0
+
+    def hash(self, password):
+        self.count('hashes')
+        return self._run(generate_password_hash, password, self.method, self.salt_length)
+
+    def hash_many(self, passwords):
+        """Hash a batch across `bulk_workers` processes. One batch per request worker at a time."""
+        if not self.workers or len(passwords) < 2:
+            return [self.hash(password) for password in passwords]
+        if not self._bulk_lock.acquire(blocking=False):
+            self.count('rejected')
+            raise PasswordHasherBusyError()
+        started = time.perf_counter()
+        try:
+            # A short-lived pool of its own, so a bulk import never queues logins behind it
+            workers = min(self.bulk_workers, len(passwords))
+            with ProcessPoolExecutor(max_workers=workers, mp_context=POOL_CONTEXT) as pool:
+                hashes = list(pool.map(
+                    generate_password_hash, passwords, repeat(self.method), repeat(self.salt_length),
+                    chunksize=max(1, len(passwords) // (workers * 4))
+                ))
+            self.count('hashes', len(hashes))
+            return hashes
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count('seconds', elapsed)
+            timing.add('hash', elapsed)
+            self._bulk_lock.release()
+
+    def verify(self, pwhash, password):
+        self.count('verifications')
+        return self._run(check_password_hash, pwhash, password)
+
+    def count(self, counter, amount=1):
+        """Add `amount` to the `counter` reported by stats(), e.g. 'rehashed'."""
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def needs_rehash(self, pwhash):
+        """True when `pwhash` was made with other parameters than the configured ones."""
+        prefix, _, rest = pwhash.partition('$')
+        salt = rest.partition('$')[0]
+        return prefix != self._prefix or len(salt) != self.salt_length
+
+    def stats(self):
+        with self._stats_lock:
+            hashes, verifications, rehashed, rejected, seconds = (
+                self.hashes, self.verifications, self.rehashed, self.rejected, self.seconds
+            )
+        calls = hashes + verifications
+        return {
+            "workers": self.workers,
+            "queue_limit": self.queue_limit,
+            "bulk_workers": self.bulk_workers,
+            "method": self._prefix,
+            "hashes": hashes,
+            "verifications": verifications,
+            "rehashed": rehashed,
+            "rejected": rejected,
+            "avg_ms": round(seconds / calls * 1000, 2) if calls else None,
+        }
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None and self._pool_pid == os.getpid():
+                self._pool.shutdown(wait=False)
+            self._pool = None
+
+    def _run(self, fn, *args):
+        started = time.perf_counter()
+        try:
+            if not self.workers:
+                return fn(*args)
+            slots = self._slots
+            if not slots.acquire(blocking=False):
+                self.count('rejected')
+                logger.warning("Password hashing pool saturated (%d in flight)", self.workers + self.queue_limit)
+                raise PasswordHasherBusyError()
+            try:
+                future = self._executor().submit(fn, *args)
+            except BaseException:
+                slots.release()
+                raise
+            # The slot is held until the hash is done, also when this call stops waiting for it:
+            # work abandoned after a timeout still occupies the pool and counts against the bound
+            future.add_done_callback(lambda _: slots.release())
+            try:
+                return future.result(timeout=self.timeout)
+            except FutureTimeoutError:
+                self.count('rejected')
+                raise PasswordHasherBusyError()
+            except BrokenProcessPool:
+                # A pool process died (OOM killer, ...); start a fresh pool on the next call
+                self.shutdown()
+                raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count('seconds', elapsed)
+            timing.add('hash', elapsed)
+
+    def _executor(self):
+        # Pools don't survive fork: a gunicorn worker forked from a preloaded master builds its own
+        pid = os.getpid()
+        with self._lock:
+            if self._pool is None or self._pool_pid != pid:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=POOL_CONTEXT)
+                self._pool_pid = pid
+            return self._pool
+
+
+def _hash_prefix(method):
+    """The `method` part werkzeug stores in front of the first '$' for hashes made with `method`."""
+    parts = method.split(':')
+    if parts[0] != 'pbkdf2':
+        return method
+    hash_name = parts[1] if len(parts) > 1 else 'sha256'
+    iterations = parts[2] if len(parts) > 2 else DEFAULT_PBKDF2_ITERATIONS
+    return f'pbkdf2:{hash_name}:{iterations}'
+
+
+password_hasher = PasswordHasher()
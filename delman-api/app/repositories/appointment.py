@@ -1,20 +1,16 @@
 from app.models.appointment import Appointment
+from app.models.doctor import Doctor
+from app.cache import to_row, from_row
 from sqlalchemy import and_
-from typing import List, Optional
-from sqlalchemy.orm import joinedload
+from typing import Optional
+from sqlalchemy.orm import joinedload, selectinload
+from app.repositories.base import BaseRepository
 
-class AppointmentRepository:
-    def __init__(self, db):
-        self.db = db
+class AppointmentRepository(BaseRepository):
+    model = Appointment
 
-    def create(self, appointment_data) -> Appointment:
-        appointment = Appointment(**appointment_data)
-        self.db.session.add(appointment)
-        self.db.session.commit()
-        return appointment
-
-    def get_all(self) -> List[Appointment]:
-        return Appointment.query.all()
+    def cache_tags(self, ids, deleted=False):
+        return ['appointment']
 
     def get_by_id(self, id) -> Optional[Appointment]:
         # return Appointment.query.get(id)
@@ -23,23 +19,14 @@ class AppointmentRepository:
             joinedload(Appointment.doctor)
         ).get(id)
 
-    def update(self, id, appointment_data) -> Optional[Appointment]:
-        appointment = self.get_by_id(id)
-        if appointment:
-            for key, value in appointment_data.items():
-                setattr(appointment, key, value)
-            self.db.session.commit()
-        return appointment
-
-    def delete(self, id) -> bool:
-        appointment = self.get_by_id(id)
-        if appointment:
-            self.db.session.delete(appointment)
-            self.db.session.commit()
-            return True
-        return False
-
     def get_doctor_appointments(self, doctor_id, start_datetime, end_datetime):
+        """The doctor's appointments in the window, read live for the double-booking check.
+
+        Never cached: a booking committed by another worker must be seen at once. The doctor
+        row is locked (FOR UPDATE on Postgres, a no-op on SQLite) until the booking commits,
+        so two concurrent bookings for the same doctor are checked one after the other.
+        """
+        self.db.session.query(Doctor.id).filter(Doctor.id == doctor_id).with_for_update().first()
         return Appointment.query.filter(
             and_(
                 Appointment.doctor_id == doctor_id,
@@ -49,6 +36,15 @@ class AppointmentRepository:
         ).all()
 
     def filter_appointments(self, filters):
+        if filters.expand:
+            return self._filter_appointments(filters)
+        rows = self.cache.get_or_load(
+            f"appointment:filter:{filters.model_dump_json()}", ['appointment'],
+            lambda: [to_row(appointment) for appointment in self._filter_appointments(filters)]
+        )
+        return [from_row(self.db.session, Appointment, row) for row in rows]
+
+    def _filter_appointments(self, filters):
         query = Appointment.query
         if filters.patient_id:
             query = query.filter(Appointment.patient_id == filters.patient_id)
@@ -60,4 +56,7 @@ class AppointmentRepository:
             query = query.filter(Appointment.datetime >= filters.start_date)
         if filters.end_date:
             query = query.filter(Appointment.datetime < filters.end_date)
+        # One extra SELECT ... WHERE id IN (...) per relation, regardless of page size
+        for relation in filters.expand:
+            query = query.options(selectinload(getattr(Appointment, relation)))
         return query.all()
@@ -0,0 +1,167 @@
+from sqlalchemy import update, delete, insert, select, inspect, func, text
+from sqlalchemy.orm.attributes import set_committed_value
+from app.cache import Cache, from_row
+
+def update_returning(session, model, id, values):
+    """Apply `values` to row `id` with one UPDATE ... RETURNING and commit.
+
+    The returned row becomes the instance, so reading it after the commit needs no
+    refresh SELECT. Returns None when no row has that id.
+    """
+    mapper = inspect(model)
+    row = session.execute(
+        update(model).where(mapper.primary_key[0] == id).values(**values).returning(*mapper.local_table.c),
+        execution_options={'synchronize_session': False}
+    ).mappings().first()
+    session.commit()
+    if row is None:
+        return None
+
+    data = {prop.key: row[prop.columns[0].name] for prop in mapper.column_attrs}
+    existing = session.identity_map.get(mapper.identity_key_from_primary_key([id]))
+    if existing is None:
+        return from_row(session, model, data)
+    # Loaded earlier in this request and expired by the commit: fill it in from the row
+    for key, value in data.items():
+        set_committed_value(existing, key, value)
+    return existing
+
+def delete_returning(session, model, id):
+    """Delete row `id` with one DELETE ... RETURNING id and commit. True when a row was deleted.
+
+    Nothing is loaded first; dependent rows go through the FK's ON DELETE CASCADE.
+    """
+    primary_key = inspect(model).primary_key[0]
+    deleted = session.execute(delete(model).where(primary_key == id).returning(primary_key)).first()
+    session.commit()
+    return deleted is not None
+
+
+class BaseRepository:
+    """CRUD plus set-based and streaming operations for `model`.
+
+    Writes invalidate the tags returned by `cache_tags`; repositories that cache reads
+    override it.
+    """
+    model = None
+    # Rows per multi-row INSERT, keeps every statement below SQLite's bound-parameter limit
+    batch_size = 500
+
+    def __init__(self, db, cache: Cache = None):
+        self.db = db
+        self.cache = cache or Cache()
+
+    def cache_tags(self, ids, deleted=False):
+        return []
+
+    def create(self, data):
+        instance = self.model(**data)
+        self.db.session.add(instance)
+        self.db.session.flush()
+        id = instance.id
+        self.db.session.commit()
+        self._invalidate([id])
+        return instance
+
+    def get_all(self):
+        return self.model.query.all()
+
+    def get_by_id(self, id):
+        return self.db.session.get(self.model, id)
+
+    def get_many(self, ids):
+        if not ids:
+            return []
+        return self.model.query.filter(self.model.id.in_(ids)).all()
+
+    def get_by_ids(self, ids):
+        return self.get_many(ids)
+
+    def update(self, id, data):
+        instance = update_returning(self.db.session, self.model, id, data)
+        if instance:
+            self._invalidate([id])
+        return instance
+
+    def delete(self, id):
+        if delete_returning(self.db.session, self.model, id):
+            self._invalidate([id], deleted=True)
+            return True
+        return False
+
+    def bulk_create(self, rows):
+        """Insert all rows in one transaction and return them reloaded with a single SELECT."""
+        # ORM bulk INSERT ... RETURNING: batched into multi-row statements, unlike add_all()
+        ids = list(self.db.session.scalars(insert(self.model).returning(self.model.id), rows))
+        self.db.session.commit()
+        self._invalidate(ids)
+        return self.get_many(ids)
+
+    def bulk_update(self, rows):
+        """Update many rows by primary key, each dict carrying its `id`, in one transaction."""
+        if not rows:
+            return 0
+        self.db.session.execute(update(self.model), rows)
+        self.db.session.commit()
+        self._invalidate([row['id'] for row in rows])
+        return len(rows)
+
+    def upsert_on_conflict(self, rows, index_elements, update_fields=None):
+        """INSERT ... ON CONFLICT (index_elements) DO UPDATE. Returns the ids inserted or updated.
+
+        Only PostgreSQL and SQLite have ON CONFLICT.
+        """
+        if not rows:
+            return []
+        dialect = self.db.engine.dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            raise ValueError(f"upsert_on_conflict is not supported on {dialect}")
+
+        update_fields = update_fields or [key for key in rows[0] if key not in index_elements]
+        columns = self.model.__table__.c
+        ids = []
+        for start in range(0, len(rows), self.batch_size):
+            statement = dialect_insert(self.model).values(rows[start:start + self.batch_size])
+            set_ = {field: statement.excluded[field] for field in update_fields}
+            # ON CONFLICT DO UPDATE skips Column(onupdate=...), so bump updated_at and version here
+            if 'updated_at' in columns and 'updated_at' not in set_:
+                set_['updated_at'] = func.now()
+            if 'version' in columns and 'version' not in set_:
+                set_['version'] = columns.version + 1
+            statement = statement.on_conflict_do_update(index_elements=index_elements, set_=set_)
+            ids.extend(self.db.session.scalars(statement.returning(self.model.id)))
+        self.db.session.commit()
+        self._invalidate(ids)
+        return ids
+
+    def iter_chunks(self, *criteria, chunk_size=1000):
+        """Yield lists of at most `chunk_size` instances matching `criteria`, ordered by id.
+
+        Rows are streamed with yield_per, so memory stays bounded by one chunk
+        however large the table is.
+        """
+        statement = select(self.model).where(*criteria).order_by(self.model.id) \
+            .execution_options(yield_per=chunk_size)
+        for chunk in self.db.session.scalars(statement).partitions():
+            yield chunk
+
+    def count_estimate(self):
+        """Approximate row count. On PostgreSQL this reads the planner statistics instead of scanning."""
+        table = self.model.__table__.name
+        if self.db.engine.dialect.name == 'postgresql':
+            estimate = self.db.session.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"), {'table': table}
+            ).scalar()
+            # -1 (or 0 on older servers) until the table has been vacuumed or analyzed
+            if estimate and estimate > 0:
+                return estimate
+        return self.db.session.query(func.count(self.model.id)).scalar()
+
+    def _invalidate(self, ids, deleted=False):
+        tags = self.cache_tags(ids, deleted)
+        if tags:
+            self.cache.invalidate(*tags)
@@ -1,34 +1,38 @@
 from app.models.doctor import Doctor
+from app.cache import to_row, from_row
 from typing import Optional, List
+from sqlalchemy import func, select
+from sqlalchemy.orm import load_only
+from app.repositories.base import BaseRepository
 
-class DoctorRepository:
-    def __init__(self, db):
-        self.db = db
+class DoctorRepository(BaseRepository):
+    model = Doctor
 
-    def create(self, doctor_data) -> Doctor:
-        doctor = Doctor(**doctor_data)
-        self.db.session.add(doctor)
-        self.db.session.commit()
-        return doctor
+    def cache_tags(self, ids, deleted=False):
+        tags = ['doctor'] + [f'doctor:{id}' for id in ids]
+        # Deleting a doctor cascades to its appointments
+        return tags + ['appointment'] if deleted else tags
 
-    def get_all(self) -> List[Doctor]:
-        return Doctor.query.all()
+    def get_existing_usernames(self, usernames) -> set:
+        if not usernames:
+            return set()
+        return set(self.db.session.scalars(select(Doctor.username).where(Doctor.username.in_(usernames))))
 
-    def get_by_id(self, id) -> Optional[Doctor]:
-        return Doctor.query.get(id)
+    def get_all(self, fields=None) -> List[Doctor]:
+        def load():
+            query = Doctor.query
+            if fields:
+                query = query.options(load_only(*[getattr(Doctor, field) for field in fields]))
+            return [to_row(doctor) for doctor in query.all()]
+
+        rows = self.cache.get_or_load(f"doctor:all:{','.join(fields or [])}", ['doctor'], load)
+        return [from_row(self.db.session, Doctor, row) for row in rows]
 
-    def update(self, id, doctor_data) -> Optional[Doctor]:
-        doctor = self.get_by_id(id)
-        if doctor:
-            for key, value in doctor_data.items():
-                setattr(doctor, key, value)
-            self.db.session.commit()
-        return doctor
+    def get_by_id(self, id) -> Optional[Doctor]:
+        row = self.cache.get_or_load(f'doctor:{id}', [f'doctor:{id}'], lambda: to_row(Doctor.query.get(id)))
+        return from_row(self.db.session, Doctor, row)
 
-    def delete(self, id) -> bool:
-        doctor = self.get_by_id(id)
-        if doctor:
-            self.db.session.delete(doctor)
-            self.db.session.commit()
-            return True
-        return False
+    def get_version(self):
+        return self.cache.get_or_load('doctor:version', ['doctor'], lambda: tuple(
+            self.db.session.query(func.count(Doctor.id), func.max(Doctor.updated_at)).one()
+        ))
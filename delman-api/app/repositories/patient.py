@@ -1,33 +1,54 @@
 from app.models.patient import Patient
+from sqlalchemy import or_, case, func
+from sqlalchemy.orm import load_only
+from app.repositories.base import BaseRepository
 
-class PatientRepository:
-    def __init__(self, db):
-        self.db = db
-
-    def create(self, patient_data):
-        patient = Patient(**patient_data)
-        self.db.session.add(patient)
-        self.db.session.commit()
-        return patient
-
-    def get_all(self):
-        return Patient.query.all()
-
-    def get_by_id(self, id):
-        return Patient.query.get(id)
-
-    def update(self, id, patient_data):
-        patient = self.get_by_id(id)
-        if patient:
-            for key, value in patient_data.items():
-                setattr(patient, key, value)
-            self.db.session.commit()
-        return patient
-
-    def delete(self, id):
-        patient = self.get_by_id(id)
-        if patient:
-            self.db.session.delete(patient)
-            self.db.session.commit()
-            return True
-        return False
+class PatientRepository(BaseRepository):
+    model = Patient
+
+    def cache_tags(self, ids, deleted=False):
+        # Deleting a patient cascades to their appointments
+        return ['appointment'] if deleted else []
+
+    def get_all(self, fields=None):
+        query = Patient.query
+        if fields:
+            query = query.options(load_only(*[getattr(Patient, field) for field in fields]))
+        return query.all()
+
+    def get_version(self):
+        return self.db.session.query(func.count(Patient.id), func.max(Patient.updated_at)).one()
+
+    def get_by_ktp(self, no_ktp):
+        return Patient.query.filter_by(no_ktp=no_ktp).first()
+
+    def get_by_ktps(self, no_ktps):
+        if not no_ktps:
+            return []
+        return Patient.query.filter(Patient.no_ktp.in_(no_ktps)).all()
+
+    def search(self, term, limit, offset=0):
+        escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        ktp_prefix = Patient.no_ktp.like(f"{escaped}%", escape='\\')
+        name_contains = Patient.name.ilike(f"%{escaped}%", escape='\\')
+        address_contains = Patient.address.ilike(f"%{escaped}%", escape='\\')
+
+        if self.db.engine.dialect.name == 'postgresql':
+            # Served by the pg_trgm GIN indexes and the varchar_pattern_ops index on no_ktp.
+            condition = or_(ktp_prefix, Patient.name.op('%')(term), name_contains, address_contains)
+            rank = case((ktp_prefix, 2.0), else_=0.0) + func.greatest(
+                func.similarity(Patient.name, term),
+                func.similarity(Patient.address, term) * 0.5
+            )
+        else:
+            condition = or_(ktp_prefix, name_contains, address_contains)
+            rank = case(
+                (ktp_prefix, 3),
+                (Patient.name.ilike(f"{escaped}%", escape='\\'), 2),
+                (name_contains, 1),
+                else_=0
+            )
+
+        return Patient.query.filter(condition) \
+            .order_by(rank.desc(), Patient.id) \
+            .limit(limit).offset(offset).all()
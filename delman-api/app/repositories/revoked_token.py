@@ -0,0 +1,19 @@
+from app.models.revoked_token import RevokedToken
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime
+
+class RevokedTokenRepository:
+    def __init__(self, db):
+        self.db = db
+
+    def revoke(self, jti, expires_at) -> bool:
+        """Record `jti` as used. Returns False if it already was, the primary key makes this atomic."""
+        # Sweep entries whose token has expired anyway, keeps the table at roughly one row per active session
+        RevokedToken.query.filter(RevokedToken.expires_at < datetime.utcnow()).delete(synchronize_session=False)
+        self.db.session.add(RevokedToken(jti=jti, expires_at=expires_at))
+        try:
+            self.db.session.commit()
+            return True
+        except IntegrityError:
+            self.db.session.rollback()
+            return False
@@ -3,6 +3,10 @@ from app.routes.auth import create_auth_blueprint
 from app.routes.doctor import create_doctor_blueprint
 from app.routes.patient import create_patient_blueprint
 from app.routes.appointment import create_appointment_blueprint
+from app.routes.cache import create_cache_blueprint
+from app.routes.metrics import create_metrics_blueprint
+from app.routes.profiles import create_profiles_blueprint
+from app.metrics.profiling import profiler
 
 def register_routes(app, services):
     app.register_blueprint(create_employee_blueprint(services['employee_service']))
@@ -10,3 +14,6 @@ def register_routes(app, services):
     app.register_blueprint(create_doctor_blueprint(services['doctor_service']))
     app.register_blueprint(create_patient_blueprint(services['patient_service']))
     app.register_blueprint(create_appointment_blueprint(services['appointment_service']))
+    app.register_blueprint(create_cache_blueprint(services['cache']))
+    app.register_blueprint(create_metrics_blueprint())
+    app.register_blueprint(create_profiles_blueprint(profiler))
@@ -4,7 +4,15 @@ from app.schemas.appointment import AppointmentCreate, AppointmentUpdate, Appoin
 from app.services.appointment import AppointmentService
 from app.exceptions import ResourceNotFoundError, ValidationError
 from pydantic import ValidationError as PydanticValidationError
-from app.utils import success_response, error_response
+from app.utils import success_response, error_response, construct_error_msg, list_response
+from app.schemas.base import BatchGetQuery, BasicInfoResponse
+
+def _serialize_appointment(appointment, expand):
+    data = AppointmentResponse.model_validate(appointment).model_dump()
+    # Only touch relations that were eager-loaded, anything else would lazy-load per row
+    for relation in expand:
+        data[relation] = BasicInfoResponse.model_validate(getattr(appointment, relation)).model_dump()
+    return data
 
 def create_appointment_blueprint(appointment_service: AppointmentService):
     bp = Blueprint('appointments', __name__, url_prefix='/appointments')
@@ -28,9 +36,24 @@ def create_appointment_blueprint(appointment_service: AppointmentService):
     @bp.route('', methods=['GET'])
     @jwt_required()
     def get_all_appointments():
-        filter_data = AppointmentFilter(**request.args)
+        if 'ids' in request.args:
+            try:
+                params = BatchGetQuery(**request.args)
+            except PydanticValidationError as e:
+                return error_response(construct_error_msg(e), "appointment/validation-error", 400)
+            appointments, missing = appointment_service.get_appointments_by_ids(params.ids)
+            return success_response({
+                "items": [AppointmentResponse.model_validate(appointment).model_dump() for appointment in appointments],
+                "missing": missing
+            })
+        try:
+            filter_data = AppointmentFilter(**request.args)
+        except PydanticValidationError as e:
+            return error_response(construct_error_msg(e), "appointment/validation-error", 400)
         appointments = appointment_service.filter_appointments(filter_data)
-        return success_response([AppointmentResponse.model_validate(appointment).model_dump() for appointment in appointments])
+        if not filter_data.expand:
+            return list_response(appointments, AppointmentResponse)
+        return success_response([_serialize_appointment(appointment, filter_data.expand) for appointment in appointments])
 
     @bp.route('/<int:id>', methods=['GET'])
     @jwt_required()
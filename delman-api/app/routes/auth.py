@@ -1,8 +1,10 @@
 from flask import Blueprint, request
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
 from app.schemas.auth import LoginRequest
 from app.services.auth import AuthService
 from pydantic import ValidationError
-from app.utils import success_response, error_response
+from app.utils import success_response, error_response, busy_response
+from app.exceptions import PasswordHasherBusyError
 
 def create_auth_blueprint(auth_service: AuthService):
     bp = Blueprint('auth', __name__, url_prefix='/auth')
@@ -17,7 +19,20 @@ def create_auth_blueprint(auth_service: AuthService):
             return error_response("Invalid username or password", "auth/invalid-credentials", 401)
         except ValidationError as e:
             return error_response(str(e.errors()[0]["msg"]), "auth/validation-error", 400)
+        except PasswordHasherBusyError as e:
+            return busy_response(str(e), "auth/busy")
         except Exception as e:
             return error_response("Internal server error", "auth/login-failed", 500)
 
+    @bp.route('/refresh', methods=['POST'])
+    @jwt_required(refresh=True)
+    def refresh():
+        try:
+            tokens = auth_service.refresh(get_jwt_identity(), get_jwt())
+            if tokens:
+                return success_response(tokens)
+            return error_response("Refresh token has been revoked", "auth/token-revoked", 401)
+        except Exception as e:
+            return error_response("Internal server error", "auth/refresh-failed", 500)
+
     return bp
@@ -0,0 +1,20 @@
+from flask import Blueprint
+from flask_jwt_extended import jwt_required
+from app.cache import Cache
+from app.cache.fragments import fragments
+from app.passwords import password_hasher
+from app.utils import success_response
+import os
+
+def create_cache_blueprint(cache: Cache):
+    bp = Blueprint('cache', __name__, url_prefix='/cache')
+
+    @bp.route('/stats', methods=['GET'])
+    @jwt_required()
+    def get_cache_stats():
+        # Counters are per worker
+        return success_response(dict(
+            cache.stats(), fragments=fragments.stats(), passwords=password_hasher.stats(), pid=os.getpid()
+        ))
+
+    return bp
@@ -1,10 +1,11 @@
 from flask import Blueprint, request
 from flask_jwt_extended import jwt_required
-from app.schemas.doctor import DoctorCreate, DoctorUpdate, DoctorResponse
+from app.schemas.doctor import DoctorCreate, DoctorUpdate, DoctorResponse, DoctorFieldsQuery
 from app.services.doctor import DoctorService
-from app.exceptions import UsernameAlreadyExistsError
+from app.exceptions import UsernameAlreadyExistsError, DuplicateResourceError, PasswordHasherBusyError
 from pydantic import ValidationError
-from app.utils import success_response, error_response
+from app.utils import success_response, error_response, busy_response, construct_error_msg, validate_bulk_items, make_etag, conditional_response, list_response
+from app.schemas.base import BatchGetQuery, BulkCreateRequest
 
 def create_doctor_blueprint(doctor_service: DoctorService):
     bp = Blueprint('doctors', __name__, url_prefix='/doctors')
@@ -20,21 +21,72 @@ def create_doctor_blueprint(doctor_service: DoctorService):
             return error_response(str(e.errors()[0]["msg"]), "doctor/validation-error", 400)
         except UsernameAlreadyExistsError as e:
             return error_response(str(e), "doctor/username-exists", 409)
+        except PasswordHasherBusyError as e:
+            return busy_response(str(e), "doctor/busy")
         except Exception as e:
             return error_response(str(e), "doctor/creation-failed", 500)
 
+    @bp.route('/bulk', methods=['POST'])
+    @jwt_required()
+    def bulk_create_doctors():
+        try:
+            payload = BulkCreateRequest(**request.json)
+        except ValidationError as e:
+            return error_response(construct_error_msg(e), "doctor/validation-error", 400)
+        doctors_data, positions, errors = validate_bulk_items(DoctorCreate, payload.items, "doctor/validation-error")
+        try:
+            doctors, failed = doctor_service.bulk_create_doctors(doctors_data)
+        except DuplicateResourceError as e:
+            return error_response(str(e), "doctor/username-exists", 409)
+        except PasswordHasherBusyError as e:
+            return busy_response(str(e), "doctor/busy")
+        except Exception as e:
+            return error_response("Internal server error", "doctor/creation-failed", 500)
+        # Service errors index into the valid items, map them back to the request positions
+        errors += [dict(error, index=positions[error["index"]]) for error in failed]
+        errors.sort(key=lambda error: error["index"])
+        return success_response({
+            "created": [DoctorResponse.model_validate(doctor).model_dump() for doctor in doctors],
+            "errors": errors
+        }, 207 if errors else 201)
+
     @bp.route('', methods=['GET'])
     @jwt_required()
     def get_all_doctors():
-        doctors = doctor_service.get_all_doctors()
-        return success_response([DoctorResponse.model_validate(doctor).model_dump() for doctor in doctors])
+        count, last_modified = doctor_service.get_doctors_version()
+        etag = make_etag('doctors', count, last_modified, request.query_string)
+        return conditional_response(etag, last_modified, list_doctors, collection=True)
+
+    def list_doctors():
+        if 'ids' in request.args:
+            try:
+                params = BatchGetQuery(**request.args)
+            except ValidationError as e:
+                return error_response(construct_error_msg(e), "doctor/validation-error", 400)
+            doctors, missing = doctor_service.get_doctors_by_ids(params.ids)
+            return success_response({
+                "items": [DoctorResponse.model_validate(doctor).model_dump() for doctor in doctors],
+                "missing": missing
+            })
+        try:
+            params = DoctorFieldsQuery(**request.args)
+        except ValidationError as e:
+            return error_response(construct_error_msg(e), "doctor/validation-error", 400)
+        doctors = doctor_service.get_all_doctors(params.fields)
+        if not params.fields:
+            return list_response(doctors, DoctorResponse)
+        schema = params.response_schema()
+        return success_response([schema.model_validate(doctor).model_dump() for doctor in doctors])
 
     @bp.route('/<int:id>', methods=['GET'])
     @jwt_required()
     def get_doctor(id):
         doctor = doctor_service.get_doctor_by_id(id)
         if doctor:
-            return success_response(DoctorResponse.model_validate(doctor).model_dump())
+            return conditional_response(
+                make_etag('doctor', doctor.id, doctor.updated_at), doctor.updated_at,
+                lambda: success_response(DoctorResponse.model_validate(doctor).model_dump())
+            )
         return error_response(f"Doctor with id {id} not found", "doctor/not-found", 404)
 
     @bp.route('/<int:id>', methods=['PUT'])
@@ -50,6 +102,8 @@ def create_doctor_blueprint(doctor_service: DoctorService):
             return error_response(str(e.errors()[0]["msg"]), "doctor/validation-error", 400)
         except UsernameAlreadyExistsError as e:
             return error_response(str(e), "doctor/username-exists", 409)  # 409 Conflict
+        except PasswordHasherBusyError as e:
+            return busy_response(str(e), "doctor/busy")
         except Exception as e:
             return error_response("Internal server error", "doctor/update-failed", 500)
 
@@ -3,8 +3,9 @@ from flask_jwt_extended import jwt_required
 from app.schemas.employee import EmployeeCreate, EmployeeUpdate, EmployeeResponse
 from app.services.employee import EmployeeService
 from pydantic import ValidationError
-from app.utils import success_response, error_response
-from app.exceptions import UsernameAlreadyExistsError
+from app.utils import success_response, error_response, busy_response, construct_error_msg, validate_bulk_items, list_response
+from app.schemas.base import BatchGetQuery, BulkCreateRequest
+from app.exceptions import UsernameAlreadyExistsError, DuplicateResourceError, PasswordHasherBusyError
 
 def create_employee_blueprint(employee_service: EmployeeService):
     bp = Blueprint('employees', __name__, url_prefix='/employees')
@@ -20,14 +21,50 @@ def create_employee_blueprint(employee_service: EmployeeService):
             return error_response(str(e.errors()[0]["msg"]), "employee/validation-error", 400)
         except UsernameAlreadyExistsError as e:
             return error_response(str(e), "employee/username-exists", 409)  # 409 Conflict
+        except PasswordHasherBusyError as e:
+            return busy_response(str(e), "employee/busy")
         except Exception as e:
             return error_response("Internal server error", "employee/creation-failed", 500)
 
+    @bp.route('/bulk', methods=['POST'])
+    @jwt_required()
+    def bulk_create_employees():
+        try:
+            payload = BulkCreateRequest(**request.json)
+        except ValidationError as e:
+            return error_response(construct_error_msg(e), "employee/validation-error", 400)
+        employees_data, positions, errors = validate_bulk_items(EmployeeCreate, payload.items, "employee/validation-error")
+        try:
+            employees, failed = employee_service.bulk_create_employees(employees_data)
+        except DuplicateResourceError as e:
+            return error_response(str(e), "employee/username-exists", 409)
+        except PasswordHasherBusyError as e:
+            return busy_response(str(e), "employee/busy")
+        except Exception as e:
+            return error_response("Internal server error", "employee/creation-failed", 500)
+        # Service errors index into the valid items, map them back to the request positions
+        errors += [dict(error, index=positions[error["index"]]) for error in failed]
+        errors.sort(key=lambda error: error["index"])
+        return success_response({
+            "created": [EmployeeResponse.model_validate(employee).model_dump() for employee in employees],
+            "errors": errors
+        }, 207 if errors else 201)
+
     @bp.route('', methods=['GET'])
     @jwt_required()
     def get_all_employees():
+        if 'ids' in request.args:
+            try:
+                params = BatchGetQuery(**request.args)
+            except ValidationError as e:
+                return error_response(construct_error_msg(e), "employee/validation-error", 400)
+            employees, missing = employee_service.get_employees_by_ids(params.ids)
+            return success_response({
+                "items": [EmployeeResponse.model_validate(employee).model_dump() for employee in employees],
+                "missing": missing
+            })
         employees = employee_service.get_all_employees()
-        return success_response([EmployeeResponse.model_validate(employee).model_dump() for employee in employees])
+        return list_response(employees, EmployeeResponse)
 
     @bp.route('/<int:id>', methods=['GET'])
     @jwt_required()
@@ -50,6 +87,8 @@ def create_employee_blueprint(employee_service: EmployeeService):
             return error_response(str(e.errors()[0]["msg"]), "employee/validation-error", 400)
         except UsernameAlreadyExistsError as e:
             return error_response(str(e), "employee/username-exists", 409)  # 409 Conflict
+        except PasswordHasherBusyError as e:
+            return busy_response(str(e), "employee/busy")
         except Exception as e:
             return error_response("Internal server error", "employee/update-failed", 500)
 
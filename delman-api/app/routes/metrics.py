@@ -0,0 +1,20 @@
+from flask import Blueprint, current_app, request
+from app.metrics import render_metrics, prometheus_client, allowed_address
+from app.utils import error_response
+
+def create_metrics_blueprint():
+    bp = Blueprint('metrics', __name__)
+
+    @bp.route('/metrics', methods=['GET'])
+    def get_metrics():
+        # No JWT for Prometheus, but only scrapers in METRICS_ALLOWED_NETWORKS: the API port is
+        # published, and per-route latency, query counts and status mix are not for the public.
+        # remote_addr is the direct peer; no proxy header is trusted here.
+        if not allowed_address(request.remote_addr, current_app.config.get('METRICS_ALLOWED_NETWORKS', [])):
+            return error_response("Metrics are not available from this address", "metrics/forbidden", 403)
+        if prometheus_client is None:
+            return error_response("prometheus_client is not installed", "metrics/unavailable", 503)
+        body, content_type = render_metrics()
+        return body, 200, {'Content-Type': content_type}
+
+    return bp
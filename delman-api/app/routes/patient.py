@@ -1,11 +1,12 @@
 from flask import Blueprint, request
 from flask_jwt_extended import jwt_required
-from app.schemas.patient import PatientCreate, PatientUpdate, PatientResponse
+from app.schemas.patient import PatientCreate, PatientUpdate, PatientResponse, PatientSearch, PatientLookup, PatientFieldsQuery
 from app.services.patient import PatientService
 from app.exceptions import  DuplicateResourceError
-from app.utils import success_response, error_response
+from app.utils import success_response, error_response, make_etag, conditional_response, list_response
 from pydantic import ValidationError
 from app.utils import construct_error_msg
+from app.schemas.base import BatchGetQuery
 
 def create_patient_blueprint(patient_service: PatientService):
     bp = Blueprint('patients', __name__, url_prefix='/patients')
@@ -27,15 +28,76 @@ def create_patient_blueprint(patient_service: PatientService):
     @bp.route('', methods=['GET'])
     @jwt_required()
     def get_all_patients():
-        patients = patient_service.get_all_patients()
-        return success_response([PatientResponse.model_validate(patient).model_dump() for patient in patients])
+        count, last_modified = patient_service.get_patients_version()
+        etag = make_etag('patients', count, last_modified, request.query_string)
+        return conditional_response(etag, last_modified, list_patients, collection=True)
+
+    def list_patients():
+        if 'ids' in request.args:
+            try:
+                params = BatchGetQuery(**request.args)
+            except ValidationError as e:
+                return error_response(construct_error_msg(e), "patient/validation-error", 400)
+            patients, missing = patient_service.get_patients_by_ids(params.ids)
+            return success_response({
+                "items": [PatientResponse.model_validate(patient).model_dump() for patient in patients],
+                "missing": missing
+            })
+        try:
+            params = PatientFieldsQuery(**request.args)
+        except ValidationError as e:
+            return error_response(construct_error_msg(e), "patient/validation-error", 400)
+        patients = patient_service.get_all_patients(params.fields)
+        if not params.fields:
+            return list_response(patients, PatientResponse)
+        schema = params.response_schema()
+        return success_response([schema.model_validate(patient).model_dump() for patient in patients])
+
+    @bp.route('/search', methods=['GET'])
+    @jwt_required()
+    def search_patients():
+        try:
+            params = PatientSearch(**request.args)
+        except ValidationError as e:
+            return error_response(construct_error_msg(e), "patient/validation-error", 400)
+        patients, has_more = patient_service.search_patients(params)
+        return success_response({
+            "items": [PatientResponse.model_validate(patient).model_dump() for patient in patients],
+            "page": params.page,
+            "per_page": params.per_page,
+            "has_more": has_more
+        })
+
+    @bp.route('/by-ktp/<no_ktp>', methods=['GET'])
+    @jwt_required()
+    def get_patient_by_ktp(no_ktp):
+        patient = patient_service.get_patient_by_ktp(no_ktp)
+        if patient:
+            return success_response(PatientResponse.model_validate(patient).model_dump())
+        return error_response(f"Patient with KTP number {no_ktp} not found", "patient/not-found", 404)
+
+    @bp.route('/lookup', methods=['POST'])
+    @jwt_required()
+    def lookup_patients():
+        try:
+            params = PatientLookup(**request.json)
+        except ValidationError as e:
+            return error_response(construct_error_msg(e), "patient/validation-error", 400)
+        patients, missing = patient_service.lookup_patients(params)
+        return success_response({
+            "items": [PatientResponse.model_validate(patient).model_dump() for patient in patients],
+            "missing": missing
+        })
 
     @bp.route('/<int:id>', methods=['GET'])
     @jwt_required()
     def get_patient(id):
         patient = patient_service.get_patient_by_id(id)
         if patient:
-            return success_response(PatientResponse.model_validate(patient).model_dump())
+            return conditional_response(
+                make_etag('patient', patient.id, patient.updated_at), patient.updated_at,
+                lambda: success_response(PatientResponse.model_validate(patient).model_dump())
+            )
         return error_response(f"Patient with id {id} not found", "patient/not-found", 404)
 
     @bp.route('/<int:id>', methods=['PUT'])
@@ -0,0 +1,22 @@
+from flask import Blueprint
+from flask_jwt_extended import jwt_required
+from app.metrics.profiling import RequestProfiler
+from app.utils import success_response, error_response
+import json
+import os
+
+def create_profiles_blueprint(profiler: RequestProfiler):
+    bp = Blueprint('profiles', __name__, url_prefix='/profiles')
+
+    @bp.route('/<report_id>', methods=['GET'])
+    @jwt_required()
+    def get_profile(report_id):
+        if not profiler.enabled or not profiler.is_admin():
+            return error_response("Profiling is not available", "profile/forbidden", 403)
+        path = profiler.report_path(report_id)
+        if path is None or not os.path.exists(path):
+            return error_response(f"Profile {report_id} not found", "profile/not-found", 404)
+        with open(path) as report:
+            return success_response(json.load(report))
+
+    return bp
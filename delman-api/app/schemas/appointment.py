@@ -1,9 +1,11 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, field_validator
 from datetime import datetime as dt
-from typing import Optional
+from typing import Optional, List
 from app.models.appointment import AppointmentStatus
 from app.schemas.base import BasicInfoResponse
 
+EXPANDABLE_RELATIONS = ('patient', 'doctor')
+
 class AppointmentCreate(BaseModel):
     patient_id: int
     doctor_id: int
@@ -48,3 +50,17 @@ class AppointmentFilter(BaseModel):
     status: Optional[AppointmentStatus] = None
     start_date: Optional[dt] = None
     end_date: Optional[dt] = None
+    expand: List[str] = []
+
+    @field_validator('expand', mode='before')
+    def split_expand(cls, v):
+        if isinstance(v, str):
+            return [part.strip() for part in v.split(',') if part.strip()]
+        return v
+
+    @field_validator('expand')
+    def validate_expand(cls, v):
+        for relation in v:
+            if relation not in EXPANDABLE_RELATIONS:
+                raise ValueError(f"Cannot expand '{relation}'. Allowed values: {', '.join(EXPANDABLE_RELATIONS)}.")
+        return list(dict.fromkeys(v))
@@ -1,7 +1,8 @@
-from pydantic import BaseModel, field_validator, ConfigDict
+from pydantic import BaseModel, Field, field_validator, ConfigDict, create_model
 from datetime import date
 from app.models.gender import Gender
-from typing import Optional
+from typing import Optional, List, ClassVar, Type, Tuple
+from functools import lru_cache
 import re
 
 class BasicInfoCreate(BaseModel):
@@ -113,3 +114,53 @@ class DoctorEmployeeUpdate(BasicInfoUpdate):
 
 class DoctorEmployeeResponse(BasicInfoResponse):
     username: str
+
+
+class BatchGetQuery(BaseModel):
+    ids: List[int] = Field(min_length=1, max_length=500)
+
+    @field_validator('ids', mode='before')
+    def split_ids(cls, v):
+        if isinstance(v, str):
+            return [part.strip() for part in v.split(',') if part.strip()]
+        return v
+
+
+class BulkCreateRequest(BaseModel):
+    """Envelope of a bulk create; each item is validated on its own so errors can be reported per index."""
+    items: List[dict] = Field(min_length=1, max_length=500)
+
+
+class SparseFieldsQuery(BaseModel):
+    """Parses `?fields=a,b`, restricted to the fields of `response_model`."""
+    response_model: ClassVar[Type[BaseModel]] = BasicInfoResponse
+
+    fields: List[str] = []
+
+    @field_validator('fields', mode='before')
+    def split_fields(cls, v):
+        if isinstance(v, str):
+            return [part.strip() for part in v.split(',') if part.strip()]
+        return v
+
+    @field_validator('fields')
+    def validate_fields(cls, v):
+        unknown = [field for field in v if field not in cls.response_model.model_fields]
+        if unknown:
+            raise ValueError(f"Unknown field(s): {', '.join(unknown)}.")
+        return list(dict.fromkeys(v))
+
+    def response_schema(self) -> Type[BaseModel]:
+        if not self.fields:
+            return self.response_model
+        return partial_response_model(self.response_model, tuple(self.fields))
+
+
+@lru_cache(maxsize=None)
+def partial_response_model(model: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """Copy of `model` limited to `fields`, so unrequested (deferred) attributes are never read."""
+    return create_model(
+        f"{model.__name__}Partial",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (model.model_fields[name].annotation, model.model_fields[name]) for name in fields}
+    )
@@ -1,4 +1,4 @@
-from app.schemas.base import DoctorEmployeeCreate, DoctorEmployeeResponse, DoctorEmployeeUpdate
+from app.schemas.base import DoctorEmployeeCreate, DoctorEmployeeResponse, DoctorEmployeeUpdate, SparseFieldsQuery
 from datetime import time
 from typing import Optional
 
@@ -14,3 +14,6 @@ class DoctorUpdate(DoctorEmployeeUpdate):
 class DoctorResponse(DoctorEmployeeResponse):
     work_start_time: time
     work_end_time: time
+
+class DoctorFieldsQuery(SparseFieldsQuery):
+    response_model = DoctorResponse
@@ -1,6 +1,6 @@
-from pydantic import Field
-from typing import Optional
-from app.schemas.base import BasicInfoCreate, BasicInfoResponse, BasicInfoUpdate
+from pydantic import BaseModel, Field, field_validator, constr
+from typing import Optional, List
+from app.schemas.base import BasicInfoCreate, BasicInfoResponse, BasicInfoUpdate, SparseFieldsQuery
 
 class PatientCreate(BasicInfoCreate):
     no_ktp: str = Field(min_length=16, max_length=16, pattern=r'^\d+$', title='Nomor KTP')
@@ -15,3 +15,21 @@ class PatientResponse(BasicInfoResponse):
     address: str
     vaccine_type: Optional[str] = None
     vaccine_count: Optional[int] = None
+
+class PatientSearch(BaseModel):
+    q: str = Field(min_length=1, max_length=200)
+    page: int = Field(1, ge=1)
+    per_page: int = Field(20, ge=1, le=100)
+
+    @field_validator('q')
+    def strip_query(cls, v):
+        v = v.strip()
+        if not v:
+            raise ValueError('Search query cannot be empty.')
+        return v
+
+class PatientLookup(BaseModel):
+    no_ktp: List[constr(min_length=16, max_length=16, pattern=r'^\d+$')] = Field(min_length=1, max_length=500)
+
+class PatientFieldsQuery(SparseFieldsQuery):
+    response_model = PatientResponse
@@ -7,16 +7,20 @@ from app.services.patient import PatientService
 from app.repositories.patient import PatientRepository
 from app.repositories.appointment import AppointmentRepository
 from app.services.appointment import AppointmentService
+from app.repositories.revoked_token import RevokedTokenRepository
+from app.metrics.tracing import tracing
 
-def create_services(db):
-    employee_repo = EmployeeRepository(db)
-    doctor_repo = DoctorRepository(db)
-    patient_repo = PatientRepository(db)
-    appointment_repo = AppointmentRepository(db)
+def create_services(db, cache):
+    employee_repo = tracing.instrument(EmployeeRepository(db), 'repository')
+    doctor_repo = tracing.instrument(DoctorRepository(db, cache), 'repository')
+    patient_repo = tracing.instrument(PatientRepository(db, cache), 'repository')
+    appointment_repo = tracing.instrument(AppointmentRepository(db, cache), 'repository')
+    revoked_token_repo = tracing.instrument(RevokedTokenRepository(db), 'repository')
     return {
-        'employee_service': EmployeeService(employee_repo),
-        'auth_service': AuthService(employee_repo),
-        'doctor_service': DoctorService(doctor_repo),
-        'patient_service': PatientService(patient_repo),
-        'appointment_service': AppointmentService(appointment_repo, doctor_repo, patient_repo)
+        'cache': cache,
+        'employee_service': tracing.instrument(EmployeeService(employee_repo), 'service'),
+        'auth_service': tracing.instrument(AuthService(employee_repo, revoked_token_repo), 'service'),
+        'doctor_service': tracing.instrument(DoctorService(doctor_repo), 'service'),
+        'patient_service': tracing.instrument(PatientService(patient_repo), 'service'),
+        'appointment_service': tracing.instrument(AppointmentService(appointment_repo, doctor_repo, patient_repo), 'service')
     }
@@ -4,6 +4,7 @@ from app.repositories.patient import PatientRepository
 from app.exceptions import ResourceNotFoundError, ValidationError
 from datetime import timedelta, datetime
 from app.schemas.appointment import AppointmentCreate, AppointmentUpdate, AppointmentFilter
+from app.utils import order_by_keys
 
 class AppointmentService:
     def __init__(self, appointment_repo: AppointmentRepository, doctor_repo: DoctorRepository, patient_repo: PatientRepository):
@@ -22,6 +23,9 @@ class AppointmentService:
     def get_appointment_by_id(self, id: int):
         return self.appointment_repo.get_by_id(id)
 
+    def get_appointments_by_ids(self, ids):
+        return order_by_keys(self.appointment_repo.get_by_ids(ids), ids)
+
     def update_appointment(self, id: int, appointment_data: AppointmentUpdate):
         existing_appointment = self.get_appointment_by_id(id)
         if not existing_appointment:
@@ -31,7 +35,13 @@ class AppointmentService:
         
         # If doctor_id, patient_id, or datetime is being updated, we need to validate
         if 'doctor_id' in appointment_data_dict or 'patient_id' in appointment_data_dict or 'datetime' in appointment_data_dict:
-            updated_appointment_data: dict = existing_appointment.__dict__
+            # A copy: writing into the instance's __dict__ bypassed change tracking
+            updated_appointment_data = {
+                'id': existing_appointment.id,
+                'doctor_id': existing_appointment.doctor_id,
+                'patient_id': existing_appointment.patient_id,
+                'datetime': existing_appointment.datetime
+            }
             updated_appointment_data.update(appointment_data_dict)
             self._validate_appointment(updated_appointment_data)
         
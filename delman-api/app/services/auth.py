@@ -1,14 +1,21 @@
-from werkzeug.security import check_password_hash
+from flask import current_app
 from flask_jwt_extended import create_access_token, create_refresh_token
+from datetime import datetime
 from app.repositories.employee import EmployeeRepository
+from app.repositories.revoked_token import RevokedTokenRepository
+from app.passwords import password_hasher
+from app.exceptions import PasswordHasherBusyError
 
 class AuthService:
-    def __init__(self, repo: EmployeeRepository):
+    def __init__(self, repo: EmployeeRepository, revoked_token_repo: RevokedTokenRepository = None):
         self.repo = repo
+        self.revoked_token_repo = revoked_token_repo
 
     def login(self, username: str, password: str):
         employee = self.repo.get_by_username(username)
-        if employee and check_password_hash(employee.password, password):
+        if employee and password_hasher.verify(employee.password, password):
+            if password_hasher.needs_rehash(employee.password):
+                self._rehash(employee, password)
             access_token = create_access_token(identity=employee.id)
             refresh_token = create_refresh_token(identity=employee.id)
             return {
@@ -16,3 +23,28 @@ class AuthService:
                 "refresh_token": refresh_token
             }
         return None
+
+    def _rehash(self, employee, password: str):
+        # The plain password is only known here, so this is where old hashes get upgraded
+        try:
+            self.repo.update(employee.id, {'password': password_hasher.hash(password)})
+            password_hasher.count('rehashed')
+        except PasswordHasherBusyError:
+            pass  # the login itself succeeded; upgrade on a later one
+
+    def refresh(self, identity, refresh_token: dict):
+        """Issue a new access token from a verified refresh token, without any password hashing."""
+        if not self.repo.get_by_id(identity):
+            return None
+
+        if not current_app.config.get('JWT_REFRESH_TOKEN_ROTATION'):
+            return {"access_token": create_access_token(identity=identity)}
+
+        # Rotation: every refresh token can be used once, replaying it is rejected
+        expires_at = datetime.utcfromtimestamp(refresh_token['exp'])
+        if not self.revoked_token_repo.revoke(refresh_token['jti'], expires_at):
+            return None
+        return {
+            "access_token": create_access_token(identity=identity),
+            "refresh_token": create_refresh_token(identity=identity)
+        }
@@ -0,0 +1,33 @@
+from app.exceptions import UsernameAlreadyExistsError
+from app.passwords import password_hasher
+from app.utils import order_by_keys
+
+def bulk_create_accounts(repo, entity_name, items):
+    """Create doctors or employees from validated `items` in one transaction.
+
+    Items whose username is taken, or repeated earlier in the batch, are skipped and reported
+    as {"index", "code", "message"}. Returns (created in input order, errors).
+    """
+    existing = repo.get_existing_usernames([item.username for item in items])
+    seen = set()
+    accepted, errors = [], []
+    for index, item in enumerate(items):
+        if item.username in existing or item.username in seen:
+            errors.append({
+                "index": index,
+                "code": f"{entity_name}/username-exists",
+                "message": str(UsernameAlreadyExistsError(entity_name, item.username))
+            })
+            continue
+        seen.add(item.username)
+        accepted.append(item.model_dump())
+
+    if not accepted:
+        return [], errors
+
+    hashes = password_hasher.hash_many([data['password'] for data in accepted])
+    for data, pwhash in zip(accepted, hashes):
+        data['password'] = pwhash
+    created = repo.bulk_create(accepted)
+    created, _ = order_by_keys(created, [data['username'] for data in accepted], key_attr='username')
+    return created, errors
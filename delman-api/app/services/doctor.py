@@ -1,8 +1,11 @@
 from app.repositories.doctor import DoctorRepository
-from app.exceptions import UsernameAlreadyExistsError
+from app.exceptions import UsernameAlreadyExistsError, DuplicateResourceError
 from sqlalchemy.exc import IntegrityError
-from werkzeug.security import generate_password_hash
+from app.passwords import password_hasher
 from app.schemas.doctor import DoctorCreate, DoctorUpdate
+from app.utils import order_by_keys
+from app.services.bulk import bulk_create_accounts
+from typing import List
 
 class DoctorService:
     def __init__(self, repo: DoctorRepository):
@@ -11,22 +14,40 @@ class DoctorService:
     def create_doctor(self, doctor_data: DoctorCreate):
         try:
             doctor_data_dict = doctor_data.model_dump()
-            doctor_data_dict['password'] = generate_password_hash(doctor_data_dict['password'])
+            doctor_data_dict['password'] = password_hasher.hash(doctor_data_dict['password'])
             return self.repo.create(doctor_data_dict)
         except IntegrityError as e:
             if 'unique constraint' in str(e.orig).lower() and 'username' in str(e.orig).lower():
                 raise UsernameAlreadyExistsError('doctor', doctor_data.username)
             raise e
 
-    def get_all_doctors(self):
-        return self.repo.get_all()
+    def bulk_create_doctors(self, doctors_data: List[DoctorCreate]):
+        try:
+            return bulk_create_accounts(self.repo, 'doctor', doctors_data)
+        except IntegrityError as e:
+            # A username taken concurrently, after the pre-check; nothing was inserted
+            if 'unique constraint' in str(e.orig).lower() and 'username' in str(e.orig).lower():
+                raise DuplicateResourceError("A username in this batch was taken meanwhile, no doctor was created.")
+            raise e
+
+    def get_all_doctors(self, fields=None):
+        return self.repo.get_all(fields=fields)
+
+    def get_doctors_version(self):
+        """(row count, max(updated_at)): changes whenever a doctor is added, updated or removed."""
+        return self.repo.get_version()
 
     def get_doctor_by_id(self, id):
         return self.repo.get_by_id(id)
 
+    def get_doctors_by_ids(self, ids):
+        return order_by_keys(self.repo.get_by_ids(ids), ids)
+
     def update_doctor(self, id: int, doctor_data: DoctorUpdate):
         try:
             doctor_data_dict = doctor_data.model_dump(exclude_unset=True)
+            if 'password' in doctor_data_dict:
+                doctor_data_dict['password'] = password_hasher.hash(doctor_data_dict['password'])
             return self.repo.update(id, doctor_data_dict)
         except IntegrityError as e:
             if 'unique constraint' in str(e.orig).lower() and 'username' in str(e.orig).lower():
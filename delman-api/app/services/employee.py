@@ -1,8 +1,11 @@
 from app.repositories.employee import EmployeeRepository
 from app.schemas.employee import EmployeeCreate, EmployeeUpdate
-from werkzeug.security import generate_password_hash
-from app.exceptions import UsernameAlreadyExistsError
+from app.passwords import password_hasher
+from app.exceptions import UsernameAlreadyExistsError, DuplicateResourceError
 from sqlalchemy.exc import IntegrityError
+from app.utils import order_by_keys, current_user_cache
+from app.services.bulk import bulk_create_accounts
+from typing import List
 
 class EmployeeService:
     def __init__(self, repo: EmployeeRepository):
@@ -11,29 +14,51 @@ class EmployeeService:
     def create_employee(self, employee_data: EmployeeCreate):
         try:
             employee_dict = employee_data.model_dump()
-            employee_dict['password'] = generate_password_hash(employee_dict['password'])
-            return self.repo.create(employee_dict)
+            employee_dict['password'] = password_hasher.hash(employee_dict['password'])
+            employee = self.repo.create(employee_dict)
+            # A miss for this id may have been cached before the row existed
+            current_user_cache.invalidate(f'employee:{employee.id}')
+            return employee
         except IntegrityError as e:
             if 'unique constraint' in str(e.orig).lower() and 'username' in str(e.orig).lower():
                 raise UsernameAlreadyExistsError("employee", employee_data.username)
             raise e
 
+    def bulk_create_employees(self, employees_data: List[EmployeeCreate]):
+        try:
+            employees, errors = bulk_create_accounts(self.repo, 'employee', employees_data)
+        except IntegrityError as e:
+            # A username taken concurrently, after the pre-check; nothing was inserted
+            if 'unique constraint' in str(e.orig).lower() and 'username' in str(e.orig).lower():
+                raise DuplicateResourceError("A username in this batch was taken meanwhile, no employee was created.")
+            raise e
+        for employee in employees:
+            current_user_cache.invalidate(f'employee:{employee.id}')
+        return employees, errors
+
     def get_all_employees(self):
         return self.repo.get_all()
 
     def get_employee_by_id(self, id: int):
         return self.repo.get_by_id(id)
 
+    def get_employees_by_ids(self, ids):
+        return order_by_keys(self.repo.get_by_ids(ids), ids)
+
     def update_employee(self, id: int, employee_data: EmployeeUpdate):
         try:
             employee_dict = employee_data.model_dump(exclude_unset=True)
             if 'password' in employee_dict:
-                employee_dict['password'] = generate_password_hash(employee_dict['password'])
-            return self.repo.update(id, employee_dict)
+                employee_dict['password'] = password_hasher.hash(employee_dict['password'])
+            employee = self.repo.update(id, employee_dict)
+            current_user_cache.invalidate(f'employee:{id}')
+            return employee
         except IntegrityError as e:
             if 'unique constraint' in str(e.orig).lower() and 'username' in str(e.orig).lower():
                 raise UsernameAlreadyExistsError("employee", employee_data.username)
             raise e
 
     def delete_employee(self, id: int):
-        return self.repo.delete(id)
+        deleted = self.repo.delete(id)
+        current_user_cache.invalidate(f'employee:{id}')
+        return deleted
@@ -1,7 +1,8 @@
 from app.repositories.patient import PatientRepository
 from app.exceptions import DuplicateResourceError
 from sqlalchemy.exc import IntegrityError
-from app.schemas.patient import PatientCreate, PatientUpdate
+from app.schemas.patient import PatientCreate, PatientUpdate, PatientSearch, PatientLookup
+from app.utils import order_by_keys
 
 class PatientService:
     def __init__(self, repo: PatientRepository):
@@ -16,12 +17,32 @@ class PatientService:
                 raise DuplicateResourceError(f"A patient with KTP number {patient_data.no_ktp} already exists.")
             raise e
 
-    def get_all_patients(self):
-        return self.repo.get_all()
+    def get_all_patients(self, fields=None):
+        return self.repo.get_all(fields=fields)
+
+    def get_patients_version(self):
+        """(row count, max(updated_at)): changes whenever a patient is added, updated or removed."""
+        return self.repo.get_version()
 
     def get_patient_by_id(self, id: int):
         return self.repo.get_by_id(id)
 
+    def get_patients_by_ids(self, ids):
+        return order_by_keys(self.repo.get_by_ids(ids), ids)
+
+    def get_patient_by_ktp(self, no_ktp: str):
+        return self.repo.get_by_ktp(no_ktp)
+
+    def lookup_patients(self, params: PatientLookup):
+        requested = list(dict.fromkeys(params.no_ktp))
+        return order_by_keys(self.repo.get_by_ktps(requested), requested, key_attr='no_ktp')
+
+    def search_patients(self, params: PatientSearch):
+        offset = (params.page - 1) * params.per_page
+        # Fetch one extra row to know whether another page exists without a COUNT(*)
+        patients = self.repo.search(params.q, params.per_page + 1, offset)
+        return patients[:params.per_page], len(patients) > params.per_page
+
     def update_patient(self, id: int, patient_data: PatientUpdate):
         try:
             patient_dict = patient_data.model_dump(exclude_unset=True)
@@ -1,11 +1,17 @@
 from functools import wraps
 from flask_jwt_extended import get_jwt_identity
 from app.models.employee import Employee
-from flask import jsonify
+from flask import jsonify, request, make_response, current_app
 from flask.json.provider import DefaultJSONProvider
 import json
-from datetime import date, time, datetime
+import hashlib
+from datetime import date, time, datetime, timezone
 from pydantic import ValidationError
+from app.cache import Cache, to_row, from_row
+from app.cache.backends import MemoryBackend
+from app.cache.fragments import fragments
+from app.exts import db
+from app.metrics import timing
 
 class CustomJSONProvider(DefaultJSONProvider):
     def dumps(self, obj, **kwargs):
@@ -29,9 +35,37 @@ def construct_error_msg(e: ValidationError):
 
     return f"{loc}: {msg}"
 
+def order_by_keys(items, keys, key_attr='id'):
+    """Return `items` in the order of `keys` plus the keys that matched nothing."""
+    requested = list(dict.fromkeys(keys))
+    by_key = {getattr(item, key_attr): item for item in items}
+    found = [by_key[key] for key in requested if key in by_key]
+    missing = [key for key in requested if key not in by_key]
+    return found, missing
+
+def validate_bulk_items(schema, items, error_code):
+    """Validate each raw item against `schema`: (valid models, their input positions, per-item errors)."""
+    valid, positions, errors = [], [], []
+    for index, item in enumerate(items):
+        try:
+            valid.append(schema(**item))
+            positions.append(index)
+        except ValidationError as e:
+            errors.append({"index": index, "code": error_code, "message": construct_error_msg(e)})
+    return valid, positions, errors
+
+# Per-worker identity -> employee cache. EmployeeService invalidates it on update/delete in the
+# worker that handled the write; other workers pick the change up after CURRENT_USER_CACHE_TTL.
+current_user_cache = Cache(MemoryBackend(max_entries=1024), default_ttl=60)
+
 def get_current_user():
     user_id = get_jwt_identity()
-    return Employee.query.get(user_id)
+    row = current_user_cache.get_or_load(
+        f'employee:{user_id}', [f'employee:{user_id}'],
+        lambda: to_row(Employee.query.get(user_id)),
+        ttl=current_app.config.get('CURRENT_USER_CACHE_TTL')
+    )
+    return from_row(db.session, Employee, row)
 
 def jwt_and_current_user_required():
     def wrapper(fn):
@@ -53,7 +87,20 @@ def success_response(data=None, status_code=200):
     res = {"ok": True}
     if data:
         res["result"] = data
-    return jsonify(res), status_code
+    with timing.segment('serialize'):
+        return jsonify(res), status_code
+
+def list_response(items, schema):
+    """success_response for a list, assembled from cached per-row JSON fragments."""
+    if not items:
+        return success_response([])
+    provider = current_app.json
+    if provider.compact is False or (provider.compact is None and current_app.debug):
+        # jsonify indents these responses; fragments are compact, so build the body whole
+        return success_response([schema.model_validate(item).model_dump() for item in items])
+    with timing.segment('serialize'):
+        body = b','.join(fragments.encode(schema, item) for item in items)
+    return current_app.response_class(b'{"ok":true,"result":[' + body + b']}\n', mimetype='application/json'), 200
 
 def error_response(message, code, status_code):
     return jsonify({
@@ -63,3 +110,40 @@ def error_response(message, code, status_code):
         },
         "ok": False
     }), status_code
+
+def busy_response(message, code, retry_after=1):
+    response, status_code = error_response(message, code, 503)
+    response.headers['Retry-After'] = str(retry_after)
+    return response, status_code
+
+def make_etag(*parts):
+    return hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()
+
+def conditional_response(etag, last_modified, build_response, collection=False):
+    """Answer 304 when the request's validators match, otherwise call `build_response`.
+
+    `build_response` is only called on a miss, so unchanged resources are never serialised.
+    Validators go on 304 and 2xx responses only, never on errors. With `collection`, only the
+    ETag is used: a collection's newest updated_at stays the same when an older row is
+    deleted, so neither Last-Modified nor If-Modified-Since can tell that it changed.
+    """
+    if collection:
+        last_modified = None
+    if last_modified is not None:
+        last_modified = last_modified.replace(microsecond=0, tzinfo=timezone.utc)
+
+    if request.if_none_match:
+        not_modified = request.if_none_match.contains(etag)
+    else:
+        not_modified = bool(last_modified and request.if_modified_since and last_modified <= request.if_modified_since)
+
+    if not_modified:
+        response, status_code = make_response('', 304), 304
+    else:
+        response, status_code = build_response()
+        if not 200 <= status_code < 300:
+            return response, status_code
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    return response, status_code
@@ -0,0 +1,82 @@
+from datetime import date, datetime, time as clock
+from sqlalchemy import text
+from sqlalchemy.orm import configure_mappers
+from app.models.appointment import Appointment, AppointmentStatus
+from app.models.doctor import Doctor
+from app.models.employee import Employee
+from app.models.gender import Gender
+from app.models.patient import Patient
+from app.schemas.appointment import AppointmentCreate, AppointmentUpdate, AppointmentFilter, AppointmentResponse, AppointmentDetailResponse
+from app.schemas.auth import LoginRequest
+from app.schemas.doctor import DoctorCreate, DoctorUpdate, DoctorResponse
+from app.schemas.employee import EmployeeCreate, EmployeeUpdate, EmployeeResponse
+from app.schemas.patient import PatientCreate, PatientUpdate, PatientSearch, PatientLookup, PatientResponse
+
+ACCOUNT = {
+    'name': 'Warm Up', 'gender': 'male', 'birthdate': '1980-01-01', 'username': 'warm_up', 'password': 'Warm-up1!'
+}
+
+# One valid payload per request schema, so every validator (and the regexes it compiles) has run once
+REQUESTS = (
+    (LoginRequest, {'username': 'warm_up', 'password': 'Warm-up1!'}),
+    (PatientCreate, {'name': 'Warm Up', 'gender': 'female', 'birthdate': '1990-01-01', 'no_ktp': '3201010101900001', 'address': 'Jl. Warm Up'}),
+    (PatientUpdate, {'name': 'Warm Up', 'birthdate': '1990-01-01'}),
+    (PatientSearch, {'q': 'warm'}),
+    (PatientLookup, {'no_ktp': ['3201010101900001']}),
+    (DoctorCreate, dict(ACCOUNT, work_start_time='08:00:00', work_end_time='16:00:00')),
+    (DoctorUpdate, {'name': 'Warm Up', 'password': 'Warm-up1!'}),
+    (EmployeeCreate, ACCOUNT),
+    (EmployeeUpdate, {'username': 'warm_up'}),
+    (AppointmentCreate, {'patient_id': 1, 'doctor_id': 1, 'datetime': '2024-01-01T09:00:00'}),
+    (AppointmentUpdate, {'status': 'DONE', 'diagnose': 'Flu'}),
+    (AppointmentFilter, {'status': 'IN_QUEUE', 'start_date': '2024-01-01T00:00:00', 'expand': 'patient,doctor'}),
+)
+
+
+def warm_schemas(app):
+    """Run every request schema and every response serialiser once; returns the number of models used.
+
+    Pydantic builds validators when a class is defined, but the first call still pays for
+    SQLAlchemy's mapper configuration, the regexes of the field validators and the JSON
+    provider. Done in the gunicorn master before forking, the workers share the result.
+    """
+    configure_mappers()
+    for schema, payload in REQUESTS:
+        schema.model_validate(payload).model_dump(exclude_unset=True)
+
+    born = date(1980, 1, 1)
+    patient = Patient(id=1, name='Warm Up', gender=Gender.FEMALE, birthdate=born, no_ktp='3201010101900001',
+                      address='Jl. Warm Up', vaccine_type='Sinovac', vaccine_count=2)
+    doctor = Doctor(id=1, name='Warm Up', gender=Gender.MALE, birthdate=born, username='warm_up',
+                    work_start_time=clock(8), work_end_time=clock(16))
+    employee = Employee(id=1, name='Warm Up', gender=Gender.MALE, birthdate=born, username='warm_up')
+    appointment = Appointment(id=1, patient_id=1, doctor_id=1, datetime=datetime(2024, 1, 1, 9),
+                              status=AppointmentStatus.IN_QUEUE, patient=patient, doctor=doctor)
+    responses = (
+        (PatientResponse, patient), (DoctorResponse, doctor), (EmployeeResponse, employee),
+        (AppointmentResponse, appointment), (AppointmentDetailResponse, appointment),
+    )
+    body = [schema.model_validate(row).model_dump() for schema, row in responses]
+    app.json.dumps({'ok': True, 'result': body})
+    return len(REQUESTS) + len(responses)
+
+
+def prime_connections(engine, count):
+    """Open `count` pooled connections at once and hand them back, so the first requests find them ready."""
+    connections = []
+    try:
+        for _ in range(count):
+            connection = engine.connect()
+            connections.append(connection)
+            connection.execute(text('SELECT 1'))
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
+
+
+def pool_capacity(engine, wanted):
+    """`wanted` capped to what the engine's pool keeps open between requests."""
+    size = getattr(engine.pool, 'size', None)
+    return min(wanted, size()) if callable(size) else wanted
+
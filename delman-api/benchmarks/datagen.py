@@ -0,0 +1,417 @@
+"""Deterministic synthetic data at production scale, plus the matching BigQuery vaccine feed.
+
+    python -m benchmarks.datagen --preset production --workers 8 --vaccines-dir /tmp/vaccines
+    python -m benchmarks.datagen --patients 200000 --doctors 300 --appointments 2000000 --seed 7 --truncate
+
+Rows go into DATABASE_URL, which must be migrated (`flask db upgrade`) and empty; --truncate
+empties it first. Postgres is loaded with COPY from parallel worker processes, other
+databases with bulk inserts from a single process.
+
+Every chunk draws from its own generator seeded with (seed, table, chunk), so the data
+depends on --seed, the volumes, --today and --chunk-size, never on --workers. Appointments
+are drawn per doctor from that doctor's free 30-minute slots: there are no double bookings.
+
+--vaccines-dir writes the vaccine records as CSV parts in the shape of the scheduler's
+BigQuery query (vaccine_type, vaccine_count, no_ktp). Load them into BigQuery with
+`bq load --skip_leading_rows=1`, or point the scheduler's VACCINE_SOURCE_FILES at them.
+"""
+import argparse
+import csv
+import heapq
+import io
+import multiprocessing
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine, insert, text
+
+from app.models.appointment import Appointment, AppointmentStatus
+from app.models.doctor import Doctor
+from app.models.employee import Employee
+from app.models.gender import Gender
+from app.models.patient import Patient
+
+PRESETS = {
+    'small': {'patients': 10000, 'doctors': 50, 'appointments': 100000, 'days': 365},
+    'medium': {'patients': 500000, 'doctors': 500, 'appointments': 5000000, 'days': 1095},
+    'production': {'patients': 5000000, 'doctors': 2000, 'appointments': 50000000, 'days': 2555},
+}
+
+FIRST_NAMES = ('Budi', 'Siti', 'Agus', 'Dewi', 'Andi', 'Rina', 'Joko', 'Putri', 'Hendra', 'Wulan', 'Bayu',
+               'Indah', 'Rizky', 'Ayu', 'Fajar', 'Lestari', 'Dimas', 'Nur', 'Yusuf', 'Maya', 'Eko', 'Sri',
+               'Arif', 'Ratna', 'Teguh', 'Fitri', 'Wahyu', 'Yuni', 'Hadi', 'Intan')
+LAST_NAMES = ('Santoso', 'Wijaya', 'Saputra', 'Hidayat', 'Pratama', 'Kusuma', 'Nugroho', 'Lubis', 'Siregar',
+              'Halim', 'Gunawan', 'Setiawan', 'Rahman', 'Susanto', 'Putra', 'Sari', 'Hasibuan', 'Nasution',
+              'Wibowo', 'Purnomo')
+STREETS = ('Jl. Merdeka', 'Jl. Sudirman', 'Jl. Diponegoro', 'Jl. Gatot Subroto', 'Jl. Ahmad Yani',
+           'Jl. Imam Bonjol', 'Jl. Pemuda', 'Jl. Veteran', 'Jl. Pahlawan', 'Jl. Kartini')
+CITIES = ('Jakarta', 'Surabaya', 'Bandung', 'Medan', 'Semarang', 'Makassar', 'Palembang', 'Depok',
+          'Tangerang', 'Bekasi', 'Yogyakarta', 'Malang')
+SPECIALTIES = ('Sp.A', 'Sp.PD', 'Sp.OG', 'Sp.JP', 'Sp.M', 'Sp.THT', 'Sp.KK', 'Sp.S')
+DIAGNOSES = ('Common cold', 'Influenza', 'Hypertension', 'Type 2 diabetes', 'Gastritis', 'Dengue fever',
+             'Bronchitis', 'Migraine', 'Dermatitis', 'Routine check-up')
+# (type, weight) and (doses, weight) roughly like the Indonesian rollout
+VACCINES = (('Sinovac', 45), ('AstraZeneca', 20), ('Pfizer', 15), ('Moderna', 10), ('Sinopharm', 8), ('Janssen', 2))
+DOSES = ((1, 10), (2, 45), (3, 35), (4, 10))
+
+# Visits per weekday (Monday first) and 30-minute slot weights: busy mornings, quiet late afternoons
+WEEKDAY_WEIGHTS = (1.0, 1.0, 0.95, 0.95, 0.85, 0.4, 0.05)
+SLOT = timedelta(minutes=30)
+# Every generated shift starts 07:00-09:00 and lasts at least 6 hours, so all doctors work 09:00-13:00
+SHARED_HOURS = (9, 13)
+MIN_SLOTS_PER_DAY = 12
+
+CHUNK_SIZE = 50000
+
+
+class Spec:
+    """Volumes and time window of a dataset; appointments cover `days` before `today` and `future_days` after."""
+
+    def __init__(self, patients, doctors, appointments, days=365, future_days=14, employees=0, today=None,
+                 chunk_size=CHUNK_SIZE):
+        self.patients = patients
+        self.doctors = doctors
+        self.appointments = appointments
+        self.days = days
+        self.future_days = future_days
+        self.employees = employees
+        self.today = today or date.today()
+        self.chunk_size = chunk_size
+
+    @property
+    def first_day(self):
+        return self.today - timedelta(days=self.days)
+
+    def check(self):
+        capacity = self.doctors * (self.days + self.future_days) * MIN_SLOTS_PER_DAY
+        if self.appointments and not self.doctors:
+            raise ValueError("appointments need at least one doctor")
+        if self.appointments and not self.patients:
+            raise ValueError("appointments need at least one patient")
+        if self.appointments > capacity:
+            raise ValueError(f"{self.appointments} appointments may not fit in {capacity} doctor slots; raise days or doctors")
+
+
+def chunk_random(seed, table, index):
+    return random.Random(f'{seed}:{table}:{index}')
+
+
+def person(rng, oldest=90, youngest=0):
+    gender = rng.choice((Gender.MALE, Gender.FEMALE))
+    # Ages skew young-adult like the population, clipped to the allowed range
+    age = min(oldest, max(youngest, int(rng.triangular(youngest, oldest, 30))))
+    birthdate = date(2024 - age, 1, 1) + timedelta(days=rng.randrange(365))
+    return f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}', gender, birthdate
+
+
+def no_ktp(patient_id, gender, birthdate):
+    """A NIK-shaped number: region, birth date (+40 on the day for women), serial.
+
+    Region and serial are both derived from the id, which keeps the numbers unique.
+    """
+    block, serial = divmod(patient_id, 10000)
+    day = birthdate.day + (40 if gender is Gender.FEMALE else 0)
+    return f'{110101 + block:06d}{day:02d}{birthdate.month:02d}{birthdate.year % 100:02d}{serial:04d}'
+
+
+PATIENT_COLUMNS = ('id', 'name', 'gender', 'birthdate', 'no_ktp', 'address')
+
+
+def patient_rows(seed, start, stop, index):
+    rng = chunk_random(seed, 'patient', index)
+    for patient_id in range(start, stop):
+        name, gender, birthdate = person(rng)
+        address = f'{rng.choice(STREETS)} No. {rng.randint(1, 300)}, {rng.choice(CITIES)}'
+        yield (patient_id, name, gender, birthdate, no_ktp(patient_id, gender, birthdate), address)
+
+
+def vaccine_rows(seed, patients, index):
+    """Records for ~85% of `patients`, plus ~1% for KTPs the hospital never saw (region 99)."""
+    rng = chunk_random(seed, 'vaccine', index)
+    types, type_weights = zip(*VACCINES)
+    doses, dose_weights = zip(*DOSES)
+    for patient in patients:
+        if rng.random() < 0.85:
+            yield rng.choices(types, type_weights)[0], rng.choices(doses, dose_weights)[0], patient[4]
+        if rng.random() < 0.01:
+            yield rng.choices(types, type_weights)[0], rng.choices(doses, dose_weights)[0], f'99{rng.randrange(10 ** 14):014d}'
+
+
+def doctor_shift(seed, doctor_id):
+    rng = chunk_random(seed, 'shift', doctor_id)
+    start = rng.choice((7, 8, 8, 9))
+    return datetime.min.time().replace(hour=start), datetime.min.time().replace(hour=start + rng.choice((6, 7, 8, 8)))
+
+
+DOCTOR_COLUMNS = ('id', 'name', 'username', 'password', 'gender', 'birthdate', 'work_start_time', 'work_end_time')
+
+
+def doctor_rows(seed, count, password_hash):
+    rng = chunk_random(seed, 'doctor', 0)
+    for doctor_id in range(1, count + 1):
+        name, gender, birthdate = person(rng, oldest=70, youngest=27)
+        start, end = doctor_shift(seed, doctor_id)
+        yield (doctor_id, f'dr. {name}, {rng.choice(SPECIALTIES)}', f'doctor{doctor_id}', password_hash,
+               gender, birthdate, start, end)
+
+
+EMPLOYEE_COLUMNS = ('id', 'name', 'username', 'password', 'gender', 'birthdate')
+
+
+def employee_rows(seed, count, password_hash):
+    rng = chunk_random(seed, 'employee', 0)
+    for employee_id in range(1, count + 1):
+        name, gender, birthdate = person(rng, oldest=60, youngest=20)
+        yield (employee_id, name, f'employee{employee_id}', password_hash, gender,
+               datetime.combine(birthdate, datetime.min.time()))
+
+
+def appointment_share(spec, doctor_id):
+    """(first id, count) of the appointments of `doctor_id`: an even split, ids contiguous per doctor."""
+    base, extra = divmod(spec.appointments, spec.doctors)
+    return (doctor_id - 1) * base + min(doctor_id - 1, extra) + 1, base + (1 if doctor_id <= extra else 0)
+
+
+APPOINTMENT_COLUMNS = ('id', 'patient_id', 'doctor_id', 'datetime', 'status', 'diagnose', 'notes')
+
+
+def appointment_rows(spec, seed, doctor_id):
+    first_id, count = appointment_share(spec, doctor_id)
+    if not count:
+        return
+    rng = chunk_random(seed, 'appointment', doctor_id)
+    start, end = doctor_shift(seed, doctor_id)
+    shift = [
+        (slot, 1.5 if slot.hour < 11 else 1.0 if slot.hour < 14 else 0.7)
+        for slot in shift_slots(start, end)
+    ]
+    total_days = spec.days + spec.future_days
+    # Weighted sampling without replacement (Efraimidis-Spirakis): the `count` largest keys
+    # random() ** (1 / weight) over every free slot of the doctor; no slot can be taken twice
+    candidates = []
+    for offset in range(total_days):
+        day = spec.first_day + timedelta(days=offset)
+        # Busier over time, with a rainy-season bump from December to February
+        day_weight = WEEKDAY_WEIGHTS[day.weekday()] * (0.6 + 0.4 * offset / total_days) * (1.2 if day.month in (12, 1, 2) else 1.0)
+        for slot, slot_weight in shift:
+            candidates.append((rng.random() ** (1.0 / (day_weight * slot_weight)), day, slot))
+    chosen = sorted((day, slot) for _, day, slot in heapq.nlargest(count, candidates))
+
+    today = datetime.combine(spec.today, datetime.min.time())
+    for offset, (day, slot) in enumerate(chosen):
+        at = datetime.combine(day, slot)
+        # Regulars: low patient ids come back more often
+        patient_id = int(spec.patients * rng.random() ** 1.5) + 1
+        if at >= today:
+            status, diagnose = AppointmentStatus.IN_QUEUE, None
+        elif rng.random() < 0.12:
+            status, diagnose = AppointmentStatus.CANCELLED, None
+        else:
+            status, diagnose = AppointmentStatus.DONE, rng.choice(DIAGNOSES)
+        yield (first_id + offset, patient_id, doctor_id, at, status, diagnose, None)
+
+
+def shift_slots(start, end):
+    slot = datetime.combine(date.min, start)
+    while slot.time() < end:
+        yield slot.time()
+        slot += SLOT
+
+
+class Writer:
+    """Appends rows to one table: COPY on Postgres, executemany inserts elsewhere."""
+
+    MODELS = {'patient': Patient, 'doctor': Doctor, 'employee': Employee, 'appointment': Appointment}
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.copy = engine.dialect.name == 'postgresql'
+
+    def write(self, table, columns, rows):
+        rows = list(rows)
+        if not rows:
+            return 0
+        if self.copy:
+            self._copy(table, columns, rows)
+        else:
+            with self.engine.begin() as connection:
+                connection.execute(insert(self.MODELS[table]), [dict(zip(columns, row)) for row in rows])
+        return len(rows)
+
+    def _copy(self, table, columns, rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            # Enum columns hold the member name; an unquoted empty field is NULL in COPY csv
+            writer.writerow(['' if value is None else value.name if isinstance(value, (Gender, AppointmentStatus)) else value
+                             for value in row])
+        buffer.seek(0)
+        connection = self.engine.raw_connection()
+        try:
+            with connection.cursor() as cursor:
+                cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+            connection.commit()
+        finally:
+            connection.close()
+
+
+def write_vaccines(directory, index, rows):
+    with open(os.path.join(directory, f'vaccines-{index:05d}.csv'), 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(('vaccine_type', 'vaccine_count', 'no_ktp'))
+        writer.writerows(rows)
+
+
+# Chunk tasks; run inline or in worker processes, each worker with its own engine
+
+_worker_writer = None
+
+
+def _init_worker(url):
+    global _worker_writer
+    _worker_writer = Writer(create_engine(url))
+
+
+def _run(task):
+    kind, spec, seed, vaccines_dir, first, last, index = task
+    if kind == 'patients':
+        rows = list(patient_rows(seed, first, last, index))
+        if vaccines_dir:
+            write_vaccines(vaccines_dir, index, vaccine_rows(seed, rows, index))
+        return kind, _worker_writer.write('patient', PATIENT_COLUMNS, rows)
+    written = 0
+    for doctor_id in range(first, last):
+        written += _worker_writer.write('appointment', APPOINTMENT_COLUMNS, appointment_rows(spec, seed, doctor_id))
+    return kind, written
+
+
+def _tasks(spec, seed, vaccines_dir):
+    patients = [
+        ('patients', spec, seed, vaccines_dir, start, min(start + spec.chunk_size, spec.patients + 1), index)
+        for index, start in enumerate(range(1, spec.patients + 1, spec.chunk_size))
+    ]
+    # Whole doctors per task, about chunk_size appointments each
+    per_task = max(1, spec.chunk_size // max(1, spec.appointments // max(1, spec.doctors)))
+    appointments = [
+        ('appointments', spec, seed, None, start, min(start + per_task, spec.doctors + 1), index)
+        for index, start in enumerate(range(1, spec.doctors + 1, per_task))
+    ] if spec.appointments else []
+    return patients, appointments
+
+
+def generate(engine, spec, seed, password_hash, workers=1, vaccines_dir=None, log=None):
+    """Insert `spec` into the (empty) tables of `engine`; returns rows written per table."""
+    global _worker_writer
+    spec.check()
+    log = log or (lambda message: None)
+    if engine.dialect.name != 'postgresql':
+        # SQLite allows one writer at a time, parallel chunks would only queue on the lock
+        workers = 1
+    if vaccines_dir:
+        os.makedirs(vaccines_dir, exist_ok=True)
+    writer = Writer(engine)
+    counts = {
+        'employee': writer.write('employee', EMPLOYEE_COLUMNS, employee_rows(seed, spec.employees, password_hash)),
+        'doctor': writer.write('doctor', DOCTOR_COLUMNS, doctor_rows(seed, spec.doctors, password_hash)),
+        'patient': 0,
+        'appointment': 0,
+    }
+    patients, appointments = _tasks(spec, seed, vaccines_dir)
+    if workers > 1:
+        pool = multiprocessing.get_context('spawn').Pool(
+            workers, initializer=_init_worker, initargs=(engine.url.render_as_string(hide_password=False),)
+        )
+        run = pool.imap_unordered
+    else:
+        _worker_writer = writer
+        run = map
+    try:
+        # Appointments reference patients, so all patients go in first
+        for phase, tasks in (('patient', patients), ('appointment', appointments)):
+            started = time.perf_counter()
+            for done, (_, written) in enumerate(run(_run, tasks), 1):
+                counts[phase] += written
+                log(f'{phase}: {counts[phase]} rows, chunk {done}/{len(tasks)}')
+            elapsed = time.perf_counter() - started
+            log(f'{phase}: {counts[phase]} rows in {elapsed:.1f}s ({counts[phase] / max(elapsed, 1e-9):.0f} rows/s)')
+    finally:
+        if workers > 1:
+            pool.close()
+            pool.join()
+    if engine.dialect.name == 'postgresql':
+        with engine.begin() as connection:
+            for table in ('employee', 'doctor', 'patient', 'appointment'):
+                # Ids were explicit, move the sequences past them
+                connection.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT coalesce(max(id), 0) + 1 FROM {table}), false)"
+                ))
+            connection.execute(text('ANALYZE'))
+    return counts
+
+
+def truncate(engine):
+    with engine.begin() as connection:
+        if engine.dialect.name == 'postgresql':
+            connection.execute(text('TRUNCATE appointment, patient, doctor, employee, revoked_token RESTART IDENTITY CASCADE'))
+        else:
+            for table in ('appointment', 'patient', 'doctor', 'employee', 'revoked_token'):
+                connection.execute(text(f'DELETE FROM {table}'))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--database', default=os.getenv('DATABASE_URL'), help='defaults to DATABASE_URL')
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='small')
+    parser.add_argument('--patients', type=int)
+    parser.add_argument('--doctors', type=int)
+    parser.add_argument('--appointments', type=int)
+    parser.add_argument('--days', type=int, help='days of appointment history')
+    parser.add_argument('--future-days', type=int, default=14, help='days of bookings ahead of --today')
+    parser.add_argument('--employees', type=int, default=5)
+    parser.add_argument('--password', default='Passw0rd!', help='shared by all generated employees and doctors')
+    parser.add_argument('--today', type=date.fromisoformat, default=date.today(), help='yyyy-mm-dd, part of the seed')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--vaccines-dir', help='write the fake BigQuery vaccine records here')
+    parser.add_argument('--truncate', action='store_true', help='empty the tables first')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.database:
+        sys.exit('set DATABASE_URL or pass --database')
+    volumes = dict(PRESETS[args.preset])
+    for name in volumes:
+        if getattr(args, name) is not None:
+            volumes[name] = getattr(args, name)
+    spec = Spec(future_days=args.future_days, employees=args.employees, today=args.today,
+                chunk_size=args.chunk_size, **volumes)
+    try:
+        spec.check()
+    except ValueError as e:
+        sys.exit(str(e))
+
+    from werkzeug.security import generate_password_hash
+    from config import Config
+    engine = create_engine(args.database)
+    if args.truncate:
+        truncate(engine)
+    with engine.connect() as connection:
+        if connection.execute(text('SELECT 1 FROM patient LIMIT 1')).first() is not None:
+            sys.exit('the database already has patients; pass --truncate to empty it')
+
+    started = time.perf_counter()
+    counts = generate(
+        engine, spec, args.seed, generate_password_hash(args.password, Config.PASSWORD_HASH_METHOD, Config.PASSWORD_HASH_SALT_LENGTH),
+        workers=args.workers, vaccines_dir=args.vaccines_dir, log=print
+    )
+    print(f"done in {time.perf_counter() - started:.1f}s: " + ', '.join(f'{count} {table}s' for table, count in counts.items()))
+
+
+if __name__ == '__main__':
+    main()
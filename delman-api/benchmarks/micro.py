@@ -0,0 +1,295 @@
+"""Micro-benchmarks for the per-request hot paths: schema validation, serialisation, booking checks.
+
+    python -m benchmarks.micro                  # run and compare with the stored baseline
+    python -m benchmarks.micro --check          # ... and exit 1 on a regression
+    python -m benchmarks.micro --save           # store this run as the new baseline
+    python -m benchmarks.micro --filter serialize
+
+Each case runs at 1, 100 and 10k objects. Timings are per call; the baseline in
+benchmarks/baselines/micro.json is committed so a slower schema or encoder shows up
+as a diff in review. Timings only compare within one environment: --check refuses a
+baseline recorded on another Python, pydantic or machine (record one with --save first).
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+import pydantic
+from flask import Flask
+
+from app.exts import db
+from app.models.appointment import Appointment, AppointmentStatus
+from app.models.doctor import Doctor
+from app.models.gender import Gender
+from app.models.patient import Patient
+from app.repositories.appointment import AppointmentRepository
+from app.repositories.doctor import DoctorRepository
+from app.repositories.patient import PatientRepository
+from app.schemas.appointment import AppointmentCreate, AppointmentUpdate, AppointmentResponse
+from app.schemas.doctor import DoctorCreate, DoctorResponse
+from app.schemas.patient import PatientCreate, PatientUpdate, PatientResponse
+from app.services.appointment import AppointmentService
+from app.utils import CustomJSONProvider
+from benchmarks import datagen
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'micro.json')
+SIZES = (1, 100, 10000)
+
+CASES = {}
+
+
+def case(name, sizes=SIZES):
+    """Register a benchmark: a generator taking the size, yielding the callable to time, cleaning up after."""
+    def register(setup):
+        CASES[name] = (setup, sizes)
+        return setup
+    return register
+
+
+def patient_payload(number):
+    return {
+        'name': f'Patient {number}', 'gender': 'female', 'birthdate': '1990-05-17',
+        'no_ktp': f'{3200000000000000 + number:016d}', 'address': f'Jl. Merdeka No. {number}, Jakarta'
+    }
+
+
+def doctor_payload(number):
+    return {
+        'name': f'Doctor {number}', 'gender': 'male', 'birthdate': '1975-01-02', 'username': f'doctor_{number}',
+        'password': 'Passw0rd!23', 'work_start_time': '08:00:00', 'work_end_time': '16:00:00'
+    }
+
+
+def appointment_payload(number):
+    return {'patient_id': number, 'doctor_id': number % 50 + 1, 'datetime': '2024-03-01T09:30:00', 'notes': 'Control'}
+
+
+def patients(size):
+    # Transient ORM instances: attribute access goes through SQLAlchemy instrumentation as in a request
+    return [
+        Patient(id=number, name=f'Patient {number}', gender=Gender.FEMALE, birthdate=date(1990, 5, 17),
+                no_ktp=f'{3200000000000000 + number:016d}', address=f'Jl. Merdeka No. {number}, Jakarta',
+                vaccine_type='Sinovac', vaccine_count=2)
+        for number in range(size)
+    ]
+
+
+@case('validate.patient_create')
+def validate_patient_create(size):
+    payloads = [patient_payload(number) for number in range(size)]
+    yield lambda: [PatientCreate(**payload) for payload in payloads]
+
+
+@case('validate.patient_update')
+def validate_patient_update(size):
+    payloads = [{'name': f'Patient {number}', 'no_ktp': f'{number:016d}'} for number in range(size)]
+    yield lambda: [PatientUpdate(**payload).model_dump(exclude_unset=True) for payload in payloads]
+
+
+@case('validate.doctor_create')
+def validate_doctor_create(size):
+    payloads = [doctor_payload(number) for number in range(size)]
+    yield lambda: [DoctorCreate(**payload) for payload in payloads]
+
+
+@case('validate.appointment_create')
+def validate_appointment_create(size):
+    payloads = [appointment_payload(number) for number in range(size)]
+    yield lambda: [AppointmentCreate(**payload) for payload in payloads]
+
+
+@case('validate.appointment_update')
+def validate_appointment_update(size):
+    payloads = [{'status': 'DONE', 'diagnose': 'Flu'} for _ in range(size)]
+    yield lambda: [AppointmentUpdate(**payload).model_dump(exclude_unset=True) for payload in payloads]
+
+
+@case('serialize.patient_response')
+def serialize_patient_response(size):
+    rows = patients(size)
+    yield lambda: [PatientResponse.model_validate(row).model_dump() for row in rows]
+
+
+@case('serialize.doctor_response')
+def serialize_doctor_response(size):
+    rows = [
+        Doctor(id=number, name=f'Doctor {number}', username=f'doctor_{number}', gender=Gender.MALE,
+               birthdate=date(1975, 1, 2), work_start_time=datetime.min.time().replace(hour=8),
+               work_end_time=datetime.min.time().replace(hour=16))
+        for number in range(size)
+    ]
+    yield lambda: [DoctorResponse.model_validate(row).model_dump() for row in rows]
+
+
+@case('serialize.appointment_response')
+def serialize_appointment_response(size):
+    rows = [
+        Appointment(id=number, patient_id=number, doctor_id=1, datetime=datetime(2024, 3, 1, 9, 30),
+                    status=AppointmentStatus.IN_QUEUE, notes='Control')
+        for number in range(size)
+    ]
+    yield lambda: [AppointmentResponse.model_validate(row).model_dump() for row in rows]
+
+
+@case('encode.json_provider')
+def encode_json_provider(size):
+    app = Flask(__name__)
+    provider = CustomJSONProvider(app)
+    body = {'ok': True, 'result': [PatientResponse.model_validate(row).model_dump() for row in patients(size)]}
+    yield lambda: provider.dumps(body)
+
+
+@case('service.validate_appointment', sizes=(1, 100))
+def validate_appointment(size):
+    """`size` booking checks against a seeded in-memory database with a full day for one doctor."""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        datagen.generate(db.engine, datagen.Spec(patients=1000, doctors=20, appointments=5000, days=30, future_days=0), 1, 'x')
+        # Every slot of the doctor's shift but the last taken, so each check compares against the whole day
+        doctor = db.session.get(Doctor, 1)
+        day = date.today() + timedelta(days=1)
+        slots = list(datagen.shift_slots(doctor.work_start_time, doctor.work_end_time))
+        db.session.add_all([
+            Appointment(patient_id=number + 1, doctor_id=1, datetime=datetime.combine(day, slot))
+            for number, slot in enumerate(slots[:-1])
+        ])
+        db.session.commit()
+        service = AppointmentService(AppointmentRepository(db), DoctorRepository(db), PatientRepository(db))
+        booking = {'doctor_id': 1, 'patient_id': 1, 'datetime': datetime.combine(day, slots[-1])}
+
+        def work():
+            for _ in range(size):
+                service._validate_appointment(booking)
+                db.session.rollback()
+
+        yield work
+        db.session.remove()
+        db.drop_all()
+
+
+def measure(work, rounds, min_time):
+    """Seconds per call over `rounds` rounds, each looping long enough to reach `min_time`."""
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            work()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+        loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9)))
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(loops):
+            work()
+        timings.append((time.perf_counter() - started) / loops)
+    # Nanosecond resolution is plenty and keeps baseline diffs readable
+    return {
+        'median': round(statistics.median(timings), 9),
+        'min': round(min(timings), 9),
+        'mean': round(statistics.mean(timings), 9),
+        'stddev': round(statistics.stdev(timings), 9) if len(timings) > 1 else 0.0,
+        'rounds': rounds,
+        'loops': loops,
+    }
+
+
+def run(selected, rounds, min_time, out=sys.stdout):
+    results = {}
+    for name, (setup, sizes) in CASES.items():
+        if selected and selected not in name:
+            continue
+        for size in sizes:
+            steps = setup(size)
+            work = next(steps)
+            key = f'{name}[{size}]'
+            results[key] = dict(measure(work, rounds, min_time), size=size)
+            next(steps, None)
+            print(f"{key:45} {format_time(results[key]['median']):>10}  {format_time(results[key]['median'] / size):>10}/object",
+                  file=out)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """(key, baseline median, median, ratio) for every case that got slower than `tolerance` allows."""
+    regressions = []
+    for key, result in results.items():
+        previous = baseline.get(key)
+        if previous and result['median'] > previous['median'] * (1 + tolerance):
+            regressions.append((key, previous['median'], result['median'], result['median'] / previous['median']))
+    return regressions
+
+
+def environment():
+    return {
+        'python': platform.python_version(), 'pydantic': pydantic.VERSION,
+        'machine': platform.machine(), 'processor': platform.processor() or None,
+    }
+
+
+def environment_mismatch(meta):
+    """The environment keys in which the baseline's `meta` differs from this interpreter."""
+    return [key for key, value in environment().items() if meta.get(key) != value]
+
+
+def format_time(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:.2f}{unit}'
+    return f'{seconds / 1e-9:.0f}ns'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--filter', default='', help='only cases whose name contains this')
+    parser.add_argument('--rounds', type=int, default=7)
+    parser.add_argument('--min-time', type=float, default=0.05, help='seconds each round runs at least')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--save', action='store_true', help='write the results as the new baseline')
+    parser.add_argument('--check', action='store_true', help='exit 1 when a case regressed')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown of the median')
+    args = parser.parse_args(argv)
+
+    results = run(args.filter, args.rounds, args.min_time)
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w') as file:
+            json.dump({
+                'meta': dict(environment(), saved_at=datetime.now().isoformat(timespec='seconds')),
+                'results': results,
+            }, file, indent=2, sort_keys=True)
+            file.write('\n')
+        print(f'baseline written to {args.baseline}')
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f'no baseline at {args.baseline}, run with --save first')
+        return
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    mismatch = environment_mismatch(baseline['meta'])
+    if mismatch:
+        message = (f"baseline was recorded with a different {', '.join(mismatch)} "
+                   f"({', '.join(str(baseline['meta'].get(key)) for key in mismatch)}); timings are not comparable")
+        if args.check:
+            sys.exit(f"{message}, record a baseline here with --save")
+        print(f'warning: {message}', file=sys.stderr)
+    regressions = compare(results, baseline['results'], args.tolerance)
+    for key, before, after, ratio in regressions:
+        print(f'regression: {key} {format_time(before)} -> {format_time(after)} ({ratio:.2f}x)', file=sys.stderr)
+    if regressions and args.check:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -8,14 +8,69 @@ class Config:
     # Database
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///app.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Connections per process: pool_size kept open plus max_overflow on demand (see gunicorn.conf.py
+    # for the total across workers). SQLite uses its own pools, which take no size.
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+    SQLALCHEMY_ENGINE_OPTIONS = {} if SQLALCHEMY_DATABASE_URI.startswith('sqlite') else {
+        'pool_size': DB_POOL_SIZE, 'max_overflow': DB_MAX_OVERFLOW
+    }
 
     # JWT
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'your-secret-key')
     JWT_ACCESS_TOKEN_EXPIRES = int(os.getenv('JWT_ACCESS_TOKEN_EXPIRES', 3600))  # 1 hour by default
     JWT_REFRESH_TOKEN_EXPIRES = int(os.getenv('JWT_REFRESH_TOKEN_EXPIRES', 2592000))  # 30 days by default
     JWT_TOKEN_LOCATION = ['headers']
+    # Single-use refresh tokens: /auth/refresh also returns a new refresh token and revokes the old one
+    JWT_REFRESH_TOKEN_ROTATION = os.getenv('JWT_REFRESH_TOKEN_ROTATION', 'False').lower() in ('true', '1', 't')
+    CURRENT_USER_CACHE_TTL = int(os.getenv('CURRENT_USER_CACHE_TTL', 60))
+
+    # Cache: null, sqlite (shared by the workers of one host), redis, or memory (per worker, so only
+    # coherent with a single worker: a write in one worker leaves the others stale until the TTL)
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'null')
+    # sqlite: a file kept private to the app user (not in a shared directory such as /tmp); redis: a URL
+    CACHE_URL = os.getenv('CACHE_URL', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'delman-cache.sqlite3'))
+    CACHE_DEFAULT_TTL = int(os.getenv('CACHE_DEFAULT_TTL', 300))
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 10000))
+    FRAGMENT_CACHE_MAX_BYTES = int(os.getenv('FRAGMENT_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+
+    # Password hashing: werkzeug method string and salt length; stored hashes are upgraded on login
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:260000')
+    PASSWORD_HASH_SALT_LENGTH = int(os.getenv('PASSWORD_HASH_SALT_LENGTH', 16))
+    # Hashing processes per request worker (0 = inline) and how many more hashes may wait before 503
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 1))
+    PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv('PASSWORD_HASH_QUEUE_LIMIT', 4))
+    PASSWORD_HASH_TIMEOUT = float(os.getenv('PASSWORD_HASH_TIMEOUT', 10))
+    # Processes used by bulk account creation, one short-lived pool per batch (defaults to the CPU count)
+    PASSWORD_HASH_BULK_WORKERS = int(os.getenv('PASSWORD_HASH_BULK_WORKERS', 0)) or None
+
+    # Server-Timing header and Prometheus metrics at /metrics; set PROMETHEUS_MULTIPROC_DIR under gunicorn
+    REQUEST_TIMING_ENABLED = os.getenv('REQUEST_TIMING_ENABLED', 'True').lower() in ('true', '1', 't')
+    # Clients allowed to scrape /metrics (comma-separated CIDRs); add the Prometheus network in deployments
+    METRICS_ALLOWED_NETWORKS = [network.strip() for network in os.getenv('METRICS_ALLOWED_NETWORKS', '127.0.0.0/8,::1/128').split(',') if network.strip()]
+    # A statement run this many times in one request is logged as a likely N+1
+    QUERY_REPEAT_THRESHOLD = int(os.getenv('QUERY_REPEAT_THRESHOLD', 10))
+    # Statements slower than this are logged (0 = off); on PostgreSQL their plan is captured too
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', 200))
+    SLOW_QUERY_EXPLAIN = os.getenv('SLOW_QUERY_EXPLAIN', 'True').lower() in ('true', '1', 't')
+    SLOW_QUERY_EXPLAIN_INTERVAL = float(os.getenv('SLOW_QUERY_EXPLAIN_INTERVAL', 300))
+    SLOW_QUERY_EXPLAIN_QUEUE = int(os.getenv('SLOW_QUERY_EXPLAIN_QUEUE', 4))
+
+    # On-demand cProfile: `X-Profile: 1` from these employee ids, or a random share of requests
+    PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'False').lower() in ('true', '1', 't')
+    PROFILING_ADMIN_IDS = [id for id in os.getenv('PROFILING_ADMIN_IDS', '').split(',') if id.strip()]
+    PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', 0))
+    PROFILING_DIR = os.getenv('PROFILING_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'profiles'))
+
+    # OpenTelemetry spans: TRACING_EXPORTER is console, file or otlp; empty turns tracing off
+    TRACING_EXPORTER = os.getenv('TRACING_EXPORTER', '')
+    TRACING_FILE = os.getenv('TRACING_FILE', '/tmp/delman-traces.jsonl')
+    TRACING_OTLP_ENDPOINT = os.getenv('TRACING_OTLP_ENDPOINT', 'http://localhost:4318/v1/traces')
+    TRACING_SAMPLE_RATIO = float(os.getenv('TRACING_SAMPLE_RATIO', 1.0))
+    TRACING_SERVICE_NAME = os.getenv('TRACING_SERVICE_NAME', 'delman-api')
 
     # Application
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     DEBUG = os.getenv('FLASK_DEBUG', 'False').lower() in ('true', '1', 't')
     SECRET_KEY = os.getenv('SECRET_KEY', 'your-secret-key')
 
@@ -24,13 +79,19 @@ class Config:
 
 class DevelopmentConfig(Config):
     DEBUG = True
+    QUERY_COUNT_HEADER = True
 
 class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    CACHE_BACKEND = 'null'
+    PASSWORD_HASH_WORKERS = 0
 
 class ProductionConfig(Config):
     DEBUG = False
+    # gunicorn runs several workers, the in-process backend would serve stale reads
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'sqlite')
 
 # Dictionary to easily select the desired configuration
 config = {
@@ -2,23 +2,14 @@
 
 set -e
 
-# Wait for database to be ready
-while ! nc -z db 5432; do
-  echo "Waiting for database..."
-  sleep 2
-done
+# Wait for the database, migrate only when behind head, seed only when empty; logs per-phase timings
+python startup.py
 
-echo "Database is ready"
-
-python -m flask db migrate -m "latest migrations"
-
-echo "Running database migrations..."
-python -m flask db upgrade
-
-# Seed database with a check
-echo "Checking and seeding database if necessary..."
-python seed.py --check
+# Per-worker metric files merged by /metrics; files left by a previous run would be counted again
+export PROMETHEUS_MULTIPROC_DIR=${PROMETHEUS_MULTIPROC_DIR:-/tmp/delman-metrics}
+rm -rf "$PROMETHEUS_MULTIPROC_DIR" && mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
 
 # Start the application
 echo "Starting the application..."
-exec python -m gunicorn -w 4 -b 0.0.0.0:3000 main:app
+# Workers, threads and warm-up are set in gunicorn.conf.py
+exec python -m gunicorn -c gunicorn.conf.py main:app
@@ -0,0 +1,78 @@
+"""gunicorn settings for the API: python -m gunicorn -c gunicorn.conf.py main:app
+
+The app is built once in the master (preload_app) and warmed there, so workers fork with
+imports, mappers and schemas done and share those pages copy-on-write. Each worker drops
+the engine pool it inherited, then opens its own connections before taking requests.
+Worker and thread counts default from the CPU count; GUNICORN_* variables override them,
+as do the usual command-line flags.
+
+Database connections: each worker's pool holds DB_POOL_SIZE (default: threads) plus
+DB_MAX_OVERFLOW (default 2, for the slow-query EXPLAIN thread and bursts) connections,
+so the server opens at most workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW). With the defaults
+on 8 CPUs that is 8 * (4 + 2) = 48, under Postgres' default max_connections of 100 with
+room for the scheduler, migrations and psql. Set the pool variables explicitly when
+passing --threads on the command line.
+"""
+import gc
+import multiprocessing
+import os
+import time
+
+cpus = multiprocessing.cpu_count()
+
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{os.getenv('PORT', '3000')}")
+# One worker per CPU: every worker also brings its own connection pool and hashing process
+workers = int(os.getenv('GUNICORN_WORKERS', cpus))
+threads = int(os.getenv('GUNICORN_THREADS', min(max(cpus, 2), 4)))
+# Read by config.py when the app is preloaded below: one pooled connection per thread
+os.environ.setdefault('DB_POOL_SIZE', str(threads))
+os.environ.setdefault('DB_MAX_OVERFLOW', '2')
+preload_app = True
+# Recycle workers now and then to cap slow memory growth; the jitter keeps them from restarting together
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 200))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+accesslog = os.getenv('GUNICORN_ACCESS_LOG') or None
+
+
+def when_ready(server):
+    from main import app
+    from app.warmup import warm_schemas
+
+    started = time.perf_counter()
+    with app.app_context():
+        models = warm_schemas(app)
+    # Objects that survive until now live as long as the master: keep the collector off their pages after fork
+    gc.freeze()
+    server.log.info("Warmed up %d schemas in %.1fms", models, (time.perf_counter() - started) * 1000)
+
+
+def post_fork(server, worker):
+    from main import app
+    from app.exts import db
+
+    # Connections opened by the master must not be shared; close=False leaves them to the master
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    from main import app
+    from app.exts import db
+    from app.warmup import prime_connections, pool_capacity
+
+    started = time.perf_counter()
+    with app.app_context():
+        opened = prime_connections(db.engine, pool_capacity(db.engine, worker.cfg.threads))
+    worker.log.info("Worker %s opened %d connections in %.1fms", worker.pid, opened, (time.perf_counter() - started) * 1000)
+
+
+def child_exit(server, worker):
+    # prometheus_client's multiprocess mode asks for this so a dead worker's live gauges leave /metrics
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        try:
+            from prometheus_client import multiprocess
+        except ImportError:
+            return
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,82 @@
+"""initial schema
+
+Revision ID: 3f1c2a9d7b10
+Revises: 
+Create Date: 2026-10-19 09:12:44.118203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d7b10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('doctor',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=120), nullable=False),
+    sa.Column('username', sa.String(length=32), nullable=False),
+    sa.Column('password', sa.String(length=128), nullable=False),
+    sa.Column('gender', sa.Enum('MALE', 'FEMALE', name='gender'), nullable=False),
+    sa.Column('birthdate', sa.Date(), nullable=False),
+    sa.Column('work_start_time', sa.Time(), nullable=False),
+    sa.Column('work_end_time', sa.Time(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('username')
+    )
+    op.create_table('employee',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=120), nullable=False),
+    sa.Column('username', sa.String(length=32), nullable=False),
+    sa.Column('password', sa.String(length=128), nullable=False),
+    sa.Column('gender', sa.Enum('MALE', 'FEMALE', name='gender'), nullable=False),
+    sa.Column('birthdate', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('username')
+    )
+    op.create_table('patient',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=120), nullable=False),
+    sa.Column('gender', sa.Enum('MALE', 'FEMALE', name='gender'), nullable=False),
+    sa.Column('birthdate', sa.Date(), nullable=False),
+    sa.Column('no_ktp', sa.String(length=16), nullable=False),
+    sa.Column('address', sa.String(length=200), nullable=False),
+    sa.Column('vaccine_type', sa.String(length=50), nullable=True),
+    sa.Column('vaccine_count', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('no_ktp')
+    )
+    op.create_table('appointment',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('patient_id', sa.Integer(), nullable=False),
+    sa.Column('doctor_id', sa.Integer(), nullable=False),
+    sa.Column('datetime', sa.DateTime(), nullable=False),
+    sa.Column('status', sa.Enum('IN_QUEUE', 'DONE', 'CANCELLED', name='appointmentstatus'), nullable=False),
+    sa.Column('diagnose', sa.Text(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['doctor_id'], ['doctor.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['patient_id'], ['patient.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('appointment')
+    op.drop_table('patient')
+    op.drop_table('employee')
+    op.drop_table('doctor')
+    sa.Enum(name='appointmentstatus').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='gender').drop(op.get_bind(), checkfirst=True)
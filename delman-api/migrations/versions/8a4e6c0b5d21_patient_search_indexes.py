@@ -0,0 +1,37 @@
+"""patient search indexes
+
+Revision ID: 8a4e6c0b5d21
+Revises: 3f1c2a9d7b10
+Create Date: 2026-10-19 10:03:27.551962
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8a4e6c0b5d21'
+down_revision = '3f1c2a9d7b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Trigram and pattern_ops indexes only exist on Postgres; other backends
+    # fall back to LIKE scans in PatientRepository.search.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('ix_patient_name_trgm', 'patient', ['name'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_patient_address_trgm', 'patient', ['address'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'address': 'gin_trgm_ops'})
+    op.create_index('ix_patient_no_ktp_prefix', 'patient', ['no_ktp'], unique=False,
+                    postgresql_ops={'no_ktp': 'varchar_pattern_ops'})
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_patient_no_ktp_prefix', table_name='patient')
+    op.drop_index('ix_patient_address_trgm', table_name='patient')
+    op.drop_index('ix_patient_name_trgm', table_name='patient')
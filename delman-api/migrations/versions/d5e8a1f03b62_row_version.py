@@ -0,0 +1,29 @@
+"""row version
+
+Revision ID: d5e8a1f03b62
+Revises: c7d2e91f4a35
+Create Date: 2026-10-19 21:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5e8a1f03b62'
+down_revision = 'c7d2e91f4a35'
+branch_labels = None
+depends_on = None
+
+TABLES = ('patient', 'doctor', 'employee', 'appointment')
+
+
+def upgrade():
+    for table in TABLES:
+        op.add_column(table, sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    for table in TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('version')
@@ -65,5 +65,9 @@ def seed_data():
 if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == "--check":
         seed_data()
+    elif len(sys.argv) > 1 and sys.argv[1] == "--generate":
+        # Volumes for performance work, see benchmarks/datagen.py --help
+        from benchmarks.datagen import main
+        main(sys.argv[2:])
     else:
-        print("Run with --check to perform database seeding.")
+        print("Run with --check to perform database seeding, or --generate [options] for synthetic data at scale.")
@@ -0,0 +1,225 @@
+"""Container start: wait for the database, migrate only when behind, seed only when empty.
+
+Run by entrypoint.sh before gunicorn. On a database that is already at head with its seed
+accounts in place this costs three small queries and no app import: the revision check is
+one SELECT on alembic_version against the heads of the committed scripts in migrations/.
+Migrating and seeding run under one Postgres advisory lock, so when several replicas start
+together one does the work and the others wait, re-check and move on. A database stamped
+with the autogenerated revision used before migrations/ was committed is adopted: stamped
+with the committed baseline, then upgraded. Any other revision this image does not know
+stops the start-up instead of serving a schema the app does not match. Every phase is
+timed and the timings are logged as one JSON line.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+from alembic.config import Config as AlembicConfig
+from alembic.script import ScriptDirectory
+from alembic.util import CommandError
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.exc import DBAPIError
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+# Advisory lock id for migrations; any constant works as long as every replica uses the same one
+MIGRATION_LOCK = 7301049
+# First committed revision; its tables are what every database made before it already has
+BASELINE = '3f1c2a9d7b10'
+BASELINE_TABLES = ('doctor', 'employee', 'patient', 'appointment')
+# Created by a revision after the baseline: present means the schema is newer than the baseline
+LATER_TABLES = ('revoked_token',)
+
+logger = logging.getLogger('delman.startup')
+
+
+class Phases:
+    def __init__(self):
+        self.timings = {}
+
+    @contextmanager
+    def time(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = round((time.perf_counter() - started) * 1000, 1)
+
+
+def wait_for_database(engine, timeout):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with engine.connect():
+                return
+        except DBAPIError:
+            if time.monotonic() > deadline:
+                raise
+            logger.info("Waiting for database...")
+            time.sleep(1)
+
+
+def script_directory(directory=MIGRATIONS):
+    config = AlembicConfig()
+    config.set_main_option('script_location', directory)
+    return ScriptDirectory.from_config(config)
+
+
+def known(scripts, revision):
+    try:
+        return scripts.get_revision(revision) is not None
+    except CommandError:
+        return False
+
+
+def current_revisions(engine):
+    """The revisions stamped in alembic_version, empty for a database that was never migrated."""
+    with engine.connect() as connection:
+        try:
+            return {row[0] for row in connection.execute(text('SELECT version_num FROM alembic_version'))}
+        except DBAPIError:
+            return set()
+
+
+@contextmanager
+def migration_lock(engine):
+    # SQLite has a single writer anyway; the lock matters for replicas sharing a Postgres
+    if engine.dialect.name != 'postgresql':
+        yield
+        return
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+        connection.execute(text('SELECT pg_advisory_lock(:key)'), {'key': MIGRATION_LOCK})
+        try:
+            yield
+        finally:
+            connection.execute(text('SELECT pg_advisory_unlock(:key)'), {'key': MIGRATION_LOCK})
+
+
+class StartupError(RuntimeError):
+    pass
+
+
+def upgrade(url, stamp=None, revision='heads'):
+    """`flask db upgrade` on a bare app: migrations need the db extension, not routes or services.
+
+    With `stamp`, alembic_version is first replaced by that revision (`flask db stamp --purge`).
+    """
+    from flask import Flask
+    from flask_migrate import stamp as flask_stamp, upgrade as flask_upgrade
+    from app.exts import db, migrate
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = url
+    db.init_app(app)
+    migrate.init_app(app, db, directory=MIGRATIONS)
+    with app.app_context():
+        if stamp:
+            flask_stamp(directory=MIGRATIONS, revision=stamp, purge=True)
+        flask_upgrade(directory=MIGRATIONS, revision=revision)
+        db.engine.dispose()
+    # migrations/env.py runs logging.fileConfig: it disables existing loggers and sets the root to WARN
+    logger.disabled = False
+
+
+def needs_seed(engine):
+    with engine.connect() as connection:
+        return any(
+            connection.execute(text(f'SELECT 1 FROM {table} LIMIT 1')).first() is None
+            for table in ('employee', 'doctor')
+        )
+
+
+def existing_tables(engine, tables):
+    names = set(inspect(engine).get_table_names())
+    return [table for table in tables if table in names]
+
+
+def migrate(engine, url, scripts, heads):
+    """Bring the schema to `heads`; called under migration_lock. Returns how it went."""
+    # Read again under the lock: another replica may have migrated while this one waited
+    current = current_revisions(engine)
+    if current == heads:
+        return 'up-to-date'
+    if all(known(scripts, revision) for revision in current):
+        upgrade(url)
+        return 'migrated'
+
+    if len(existing_tables(engine, BASELINE_TABLES)) == len(BASELINE_TABLES) and not existing_tables(engine, LATER_TABLES):
+        # The autogenerated revision of databases made before migrations/ was committed
+        logger.warning("Database is at unknown revision %s with the baseline schema; stamping %s and upgrading",
+                       sorted(current), BASELINE)
+        upgrade(url, stamp=BASELINE)
+        return 'adopted'
+
+    raise StartupError(
+        f"Database is at revision {', '.join(sorted(current))}, unknown to the scripts in {MIGRATIONS}, "
+        f"and its schema is not the baseline one. Not starting on a schema the app may not match. "
+        f"If the database was written by a newer image, deploy that image. Otherwise bring the schema to "
+        f"the baseline tables ({', '.join(BASELINE_TABLES)}) and run `flask db stamp {BASELINE}`."
+    )
+
+
+def prepare(url, wait_timeout=60, seed=True):
+    """Bring the database at `url` to head and seed it if needed; returns the startup report.
+
+    Raises StartupError when the database is at a revision that cannot be migrated safely.
+    """
+    engine = create_engine(url)
+    phases = Phases()
+    report = {'event': 'startup', 'phases': phases.timings}
+    try:
+        with phases.time('wait_db'):
+            wait_for_database(engine, wait_timeout)
+
+        with phases.time('check'):
+            scripts = script_directory()
+            heads = set(scripts.get_heads())
+            current = current_revisions(engine)
+            # Only a migrated database has tables to look at
+            pending_seed = seed and (current != heads or needs_seed(engine))
+        report['heads'] = sorted(heads)
+        report['from'] = sorted(current)
+
+        if current == heads and not pending_seed:
+            report['migration'] = 'up-to-date'
+            return report
+
+        # Migration and seeding under one lock, so concurrent replicas never both seed
+        with migration_lock(engine):
+            with phases.time('migrate'):
+                migration = migrate(engine, url, scripts, heads)
+            report['migration'] = 'done-elsewhere' if migration == 'up-to-date' and current != heads else migration
+            if seed:
+                with phases.time('seed'):
+                    if needs_seed(engine):
+                        from seed import seed_data
+                        seed_data()
+    finally:
+        engine.dispose()
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--wait-timeout', type=float, default=float(os.getenv('DB_WAIT_TIMEOUT', 60)))
+    parser.add_argument('--skip-seed', action='store_true')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO'), format='%(asctime)s %(levelname)s %(name)s %(message)s')
+    logger.setLevel(os.getenv('LOG_LEVEL', 'INFO'))
+
+    from config import Config
+    started = time.perf_counter()
+    try:
+        report = prepare(Config.SQLALCHEMY_DATABASE_URI, args.wait_timeout, seed=not args.skip_seed)
+    except StartupError as e:
+        logger.error("%s", e)
+        return 1
+    report['total_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    logger.info(json.dumps(report))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
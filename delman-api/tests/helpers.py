@@ -0,0 +1,31 @@
+import unittest
+from contextlib import contextmanager
+from flask import Flask
+from app.exts import db
+from app.metrics import capture_queries
+
+class QueryCountAssertions:
+    """Mixin for TestCase: fail when a block runs more SQL statements than allowed."""
+
+    @contextmanager
+    def assertMaxQueries(self, limit):
+        with capture_queries() as statements:
+            yield statements
+        if len(statements) > limit:
+            self.fail(f"{len(statements)} queries executed, at most {limit} expected:\n" + '\n'.join(statements))
+
+class SQLiteTestCase(unittest.TestCase):
+    """TestCase with the models created in an in-memory SQLite database and an app context pushed."""
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        db.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
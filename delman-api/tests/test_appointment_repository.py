@@ -0,0 +1,80 @@
+import unittest
+from datetime import date, datetime, time, timedelta
+from app.exts import db
+from app.models.gender import Gender
+from app.models.patient import Patient
+from app.models.doctor import Doctor
+from app.models.appointment import Appointment
+from app.repositories.appointment import AppointmentRepository
+from app.schemas.appointment import AppointmentFilter
+from app.metrics import capture_queries
+from app.cache import Cache
+from app.cache.backends import MemoryBackend
+from tests.helpers import QueryCountAssertions, SQLiteTestCase
+
+class TestAppointmentRepository(QueryCountAssertions, SQLiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.repo = AppointmentRepository(db)
+
+    def _seed(self, count, offset=0):
+        start = datetime(2024, 1, 1, 9, 0)
+        for i in range(offset, offset + count):
+            doctor = Doctor(name=f"Doctor {i}", username=f"doctor{i}", password="x", gender=Gender.FEMALE,
+                            birthdate=date(1980, 1, 1), work_start_time=time(9, 0), work_end_time=time(17, 0))
+            patient = Patient(name=f"Patient {i}", gender=Gender.MALE, birthdate=date(1990, 1, 1),
+                              no_ktp=f"{i:016d}", address="Jl. Sudirman")
+            db.session.add(Appointment(patient=patient, doctor=doctor, datetime=start + timedelta(days=i)))
+        db.session.commit()
+        db.session.expunge_all()
+
+    def _count_queries(self, fn):
+        with capture_queries() as statements:
+            fn()
+        return len(statements)
+
+    def _list_expanded(self):
+        appointments = self.repo.filter_appointments(AppointmentFilter(expand='patient,doctor'))
+        return [(a.patient.name, a.doctor.name) for a in appointments]
+
+    def test_expand_query_count_is_constant(self):
+        self._seed(3)
+        small_page = self._count_queries(self._list_expanded)
+        db.session.expunge_all()
+
+        self._seed(30, offset=3)
+        large_page = self._count_queries(self._list_expanded)
+
+        self.assertEqual(small_page, 3)
+        self.assertEqual(large_page, small_page)
+
+    def test_get_by_id_loads_relations_in_one_query(self):
+        self._seed(1)
+
+        with self.assertMaxQueries(1):
+            appointment = self.repo.get_by_id(1)
+            names = (appointment.patient.name, appointment.doctor.name)
+
+        self.assertEqual(names, ("Patient 0", "Doctor 0"))
+
+    def test_filter_without_expand_does_not_load_relations(self):
+        self._seed(2)
+        appointments = self.repo.filter_appointments(AppointmentFilter())
+
+        self.assertEqual(len(appointments), 2)
+        self.assertNotIn('patient', appointments[0].__dict__)
+
+    def test_doctor_appointments_are_read_live(self):
+        self._seed(1)
+        repo = AppointmentRepository(db, Cache(MemoryBackend()))
+        window = (datetime(2024, 1, 1, 9, 0), datetime(2024, 1, 1, 17, 0))
+        self.assertEqual(len(repo.get_doctor_appointments(1, *window)), 1)
+
+        # Committed without invalidating any tag, as by another worker
+        db.session.add(Appointment(patient_id=1, doctor_id=1, datetime=datetime(2024, 1, 1, 10, 0)))
+        db.session.commit()
+
+        self.assertEqual(len(repo.get_doctor_appointments(1, *window)), 2)
+
+if __name__ == '__main__':
+    unittest.main()
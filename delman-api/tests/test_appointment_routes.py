@@ -4,7 +4,8 @@ from flask import Flask
 from app.routes.appointment import create_appointment_blueprint
 from app.services.appointment import AppointmentService
 from app.exts import jwt
-from datetime import datetime
+from datetime import datetime, date
+from app.models.gender import Gender
 from app.models.appointment import Appointment, AppointmentStatus
 from app.exceptions import ResourceNotFoundError, ValidationError
 from app.utils import CustomJSONProvider
@@ -128,6 +129,59 @@ class TestAppointmentRoutes(unittest.TestCase):
         data = response.get_json()
         self.assertEqual(len(data['result']), 2)
 
+    def test_get_all_appointments_expand(self):
+        mock_patient = Mock(id=1, birthdate=date(1990, 1, 1), gender=Gender.MALE)
+        mock_patient.name = "John Doe"
+        mock_doctor = Mock(id=2, birthdate=date(1980, 1, 1), gender=Gender.FEMALE)
+        mock_doctor.name = "Dr. Jane"
+        mock_appointment = Mock()
+        mock_appointment.id = 1
+        mock_appointment.patient_id = 1
+        mock_appointment.doctor_id = 2
+        mock_appointment.datetime = datetime(2023, 6, 1, 10, 0)
+        mock_appointment.status = AppointmentStatus.IN_QUEUE
+        mock_appointment.diagnose = None
+        mock_appointment.notes = None
+        mock_appointment.patient = mock_patient
+        mock_appointment.doctor = mock_doctor
+        self.mock_service.filter_appointments.return_value = [mock_appointment]
+
+        response = self.client.get('/appointments?expand=patient,doctor')
+
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data['result'][0]['patient']['name'], 'John Doe')
+        self.assertEqual(data['result'][0]['doctor']['name'], 'Dr. Jane')
+        filter_data = self.mock_service.filter_appointments.call_args[0][0]
+        self.assertEqual(filter_data.expand, ['patient', 'doctor'])
+
+    def test_get_all_appointments_invalid_expand(self):
+        response = self.client.get('/appointments?expand=notes')
+
+        self.assertEqual(response.status_code, 400)
+        data = response.get_json()
+        self.assertEqual(data['error']['code'], 'appointment/validation-error')
+        self.mock_service.filter_appointments.assert_not_called()
+
+    def test_get_appointments_by_ids(self):
+        mock_appointment = Mock()
+        mock_appointment.id = 4
+        mock_appointment.patient_id = 1
+        mock_appointment.doctor_id = 2
+        mock_appointment.datetime = datetime(2023, 6, 1, 10, 0)
+        mock_appointment.status = AppointmentStatus.DONE
+        mock_appointment.diagnose = None
+        mock_appointment.notes = None
+        self.mock_service.get_appointments_by_ids.return_value = ([mock_appointment], [3])
+
+        response = self.client.get('/appointments?ids=4,3')
+
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data['result']['items'][0]['id'], 4)
+        self.assertEqual(data['result']['missing'], [3])
+        self.mock_service.filter_appointments.assert_not_called()
+
     def test_get_appointment_by_id_success(self):
         mock_patient = Mock()
         mock_patient.id = 1
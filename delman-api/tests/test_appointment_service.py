@@ -90,6 +90,15 @@ class TestAppointmentService(unittest.TestCase):
         self.assertEqual(len(result), 2)
         self.appointment_repo.get_all.assert_called_once()
 
+    def test_get_appointments_by_ids(self):
+        appointment = Mock(id=5)
+        self.appointment_repo.get_by_ids.return_value = [appointment]
+
+        found, missing = self.service.get_appointments_by_ids([6, 5])
+
+        self.assertEqual(found, [appointment])
+        self.assertEqual(missing, [6])
+
     def test_get_appointment_by_id_success(self):
         mock_appointment = Mock(id=1)
         self.appointment_repo.get_by_id.return_value = mock_appointment
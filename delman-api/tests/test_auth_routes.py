@@ -1,8 +1,9 @@
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 from flask import Flask
 from app.routes.auth import create_auth_blueprint
 from app.services.auth import AuthService
+from app.exceptions import PasswordHasherBusyError
 
 class TestAuthRoutes(unittest.TestCase):
     def setUp(self):
@@ -70,5 +71,46 @@ class TestAuthRoutes(unittest.TestCase):
         data = response.get_json()
         self.assertEqual(data['error']['code'], 'auth/login-failed')
 
+    def test_login_hasher_busy(self):
+        self.mock_service.login.side_effect = PasswordHasherBusyError()
+        response = self.client.post('/auth/login', json={
+            'username': 'testuser',
+            'password': 'testpassword'
+        })
+
+        # Assert
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers['Retry-After'], '1')
+        data = response.get_json()
+        self.assertEqual(data['error']['code'], 'auth/busy')
+
+    @patch('app.routes.auth.get_jwt')
+    @patch('app.routes.auth.get_jwt_identity')
+    @patch('flask_jwt_extended.view_decorators.verify_jwt_in_request')
+    def test_refresh_success(self, mock_verify, mock_identity, mock_jwt):
+        mock_identity.return_value = 1
+        mock_jwt.return_value = {'jti': 'abc', 'exp': 1700000000, 'type': 'refresh'}
+        self.mock_service.refresh.return_value = {'access_token': 'new_access_token'}
+
+        response = self.client.post('/auth/refresh')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['result'], {'access_token': 'new_access_token'})
+        self.assertTrue(mock_verify.call_args.args[2])  # refresh=True
+        self.mock_service.refresh.assert_called_once_with(1, mock_jwt.return_value)
+
+    @patch('app.routes.auth.get_jwt')
+    @patch('app.routes.auth.get_jwt_identity')
+    @patch('flask_jwt_extended.view_decorators.verify_jwt_in_request')
+    def test_refresh_revoked(self, mock_verify, mock_identity, mock_jwt):
+        mock_identity.return_value = 1
+        mock_jwt.return_value = {'jti': 'abc', 'exp': 1700000000, 'type': 'refresh'}
+        self.mock_service.refresh.return_value = None
+
+        response = self.client.post('/auth/refresh')
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.get_json()['error']['code'], 'auth/token-revoked')
+
 if __name__ == '__main__':
     unittest.main()
@@ -3,7 +3,8 @@ from unittest.mock import Mock, patch
 from app.services.auth import AuthService
 from app.models.employee import Employee, Gender
 from werkzeug.security import generate_password_hash
-from datetime import date
+from datetime import date, datetime
+from flask import Flask
 
 class TestAuthService(unittest.TestCase):
     def setUp(self):
@@ -92,5 +93,91 @@ class TestAuthService(unittest.TestCase):
         mock_access_token.assert_called_once_with(identity=1)
         self.mock_repo.get_by_username.assert_called_once_with("testuser")
 
+    @patch('app.services.auth.create_access_token')
+    @patch('app.services.auth.create_refresh_token')
+    @patch('app.services.auth.password_hasher')
+    def test_login_rehashes_outdated_hash(self, mock_hasher, mock_refresh_token, mock_access_token):
+        mock_hasher.verify.return_value = True
+        mock_hasher.needs_rehash.return_value = True
+        mock_hasher.hash.return_value = "new_hash"
+        mock_employee = Mock(id=1, password="old_hash")
+        self.mock_repo.get_by_username.return_value = mock_employee
+
+        result = self.auth_service.login("testuser", "correctpassword")
+
+        self.assertIsNotNone(result)
+        mock_hasher.hash.assert_called_once_with("correctpassword")
+        self.mock_repo.update.assert_called_once_with(1, {'password': "new_hash"})
+        mock_hasher.count.assert_called_once_with('rehashed')
+
+    @patch('app.services.auth.create_access_token')
+    @patch('app.services.auth.create_refresh_token')
+    @patch('app.services.auth.password_hasher')
+    def test_login_skips_rehash_for_current_hash(self, mock_hasher, mock_refresh_token, mock_access_token):
+        mock_hasher.verify.return_value = True
+        mock_hasher.needs_rehash.return_value = False
+        self.mock_repo.get_by_username.return_value = Mock(id=1, password="current_hash")
+
+        self.auth_service.login("testuser", "correctpassword")
+
+        mock_hasher.hash.assert_not_called()
+        self.mock_repo.update.assert_not_called()
+
+class TestAuthServiceRefresh(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.mock_repo = Mock()
+        self.mock_revoked_token_repo = Mock()
+        self.auth_service = AuthService(self.mock_repo, self.mock_revoked_token_repo)
+        self.token = {'jti': 'abc', 'exp': 1700000000, 'type': 'refresh'}
+
+    @patch('app.services.auth.create_access_token')
+    @patch('app.services.auth.create_refresh_token')
+    def test_refresh_without_rotation(self, mock_refresh_token, mock_access_token):
+        mock_access_token.return_value = "new_access_token"
+
+        with self.app.app_context():
+            result = self.auth_service.refresh(1, self.token)
+
+        self.assertEqual(result, {"access_token": "new_access_token"})
+        mock_refresh_token.assert_not_called()
+        self.mock_revoked_token_repo.revoke.assert_not_called()
+        self.mock_repo.get_by_username.assert_not_called()
+
+    @patch('app.services.auth.create_access_token')
+    @patch('app.services.auth.create_refresh_token')
+    def test_refresh_with_rotation(self, mock_refresh_token, mock_access_token):
+        self.app.config['JWT_REFRESH_TOKEN_ROTATION'] = True
+        mock_access_token.return_value = "new_access_token"
+        mock_refresh_token.return_value = "new_refresh_token"
+        self.mock_revoked_token_repo.revoke.return_value = True
+
+        with self.app.app_context():
+            result = self.auth_service.refresh(1, self.token)
+
+        self.assertEqual(result, {"access_token": "new_access_token", "refresh_token": "new_refresh_token"})
+        self.mock_revoked_token_repo.revoke.assert_called_once_with('abc', datetime(2023, 11, 14, 22, 13, 20))
+
+    @patch('app.services.auth.create_access_token')
+    def test_refresh_replayed_token(self, mock_access_token):
+        self.app.config['JWT_REFRESH_TOKEN_ROTATION'] = True
+        self.mock_revoked_token_repo.revoke.return_value = False
+
+        with self.app.app_context():
+            result = self.auth_service.refresh(1, self.token)
+
+        self.assertIsNone(result)
+        mock_access_token.assert_not_called()
+
+    @patch('app.services.auth.create_access_token')
+    def test_refresh_deleted_employee(self, mock_access_token):
+        self.mock_repo.get_by_id.return_value = None
+
+        with self.app.app_context():
+            result = self.auth_service.refresh(1, self.token)
+
+        self.assertIsNone(result)
+        mock_access_token.assert_not_called()
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+from unittest.mock import Mock
+from datetime import date, time
+from sqlalchemy import event
+from app.exts import db
+from app.models.gender import Gender
+from app.models.patient import Patient
+from app.repositories.patient import PatientRepository
+from app.repositories.doctor import DoctorRepository
+from tests.helpers import SQLiteTestCase
+
+class TestBaseRepository(SQLiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.repo = PatientRepository(db)
+        self.statements = []
+        event.listen(db.engine, 'before_cursor_execute', self._record)
+
+    def tearDown(self):
+        event.remove(db.engine, 'before_cursor_execute', self._record)
+        super().tearDown()
+
+    def _record(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def _rows(self, count, start=0):
+        return [{
+            'name': f'Patient {i}', 'gender': Gender.FEMALE, 'birthdate': date(1990, 1, 1),
+            'no_ktp': f'{i:016d}', 'address': f'Jl. Merdeka {i}'
+        } for i in range(start, start + count)]
+
+    def test_bulk_create_and_get_many(self):
+        patients = self.repo.bulk_create(self._rows(3))
+        ids = [patient.id for patient in patients]
+
+        self.assertEqual(sorted(p.name for p in self.repo.get_many(ids + [999])), ['Patient 0', 'Patient 1', 'Patient 2'])
+        self.assertEqual(self.repo.get_many([]), [])
+
+    def test_bulk_update(self):
+        ids = [patient.id for patient in self.repo.bulk_create(self._rows(3))]
+        self.statements.clear()
+
+        updated = self.repo.bulk_update([{'id': ids[0], 'address': 'A'}, {'id': ids[2], 'address': 'C'}])
+
+        self.assertEqual(updated, 2)
+        self.assertEqual(len([s for s in self.statements if s.startswith('UPDATE')]), 1)
+        db.session.expunge_all()
+        self.assertEqual([p.address for p in Patient.query.order_by(Patient.id)], ['A', 'Jl. Merdeka 1', 'C'])
+
+    def test_upsert_on_conflict(self):
+        existing = self.repo.create(self._rows(1)[0])
+        rows = self._rows(2)
+        rows[0]['address'] = 'Jl. Baru'
+
+        ids = self.repo.upsert_on_conflict(rows, index_elements=['no_ktp'], update_fields=['address'])
+
+        self.assertEqual(len(ids), 2)
+        self.assertIn(existing.id, ids)
+        db.session.expunge_all()
+        self.assertEqual(Patient.query.count(), 2)
+        self.assertEqual(self.repo.get_by_ktp('0000000000000000').address, 'Jl. Baru')
+
+    def test_upsert_on_conflict_rejects_other_dialects(self):
+        repo = PatientRepository(Mock())
+        repo.db.engine.dialect.name = 'mysql'
+
+        with self.assertRaisesRegex(ValueError, 'not supported on mysql'):
+            repo.upsert_on_conflict(self._rows(1), index_elements=['no_ktp'])
+
+    def test_iter_chunks(self):
+        self.repo.bulk_create(self._rows(25))
+
+        chunks = list(self.repo.iter_chunks(Patient.name != 'Patient 3', chunk_size=10))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [10, 10, 4])
+        self.assertEqual(chunks[0][0].name, 'Patient 0')
+
+    def test_count_estimate_falls_back_to_count(self):
+        self.repo.bulk_create(self._rows(4))
+
+        self.assertEqual(self.repo.count_estimate(), 4)
+
+    def test_writes_invalidate_cache_tags(self):
+        cache = Mock()
+        repo = DoctorRepository(db, cache)
+        doctor_id = repo.create({
+            'name': 'Dr. John', 'username': 'drjohn', 'password': 'x', 'gender': Gender.MALE,
+            'birthdate': date(1980, 1, 1), 'work_start_time': time(9, 0), 'work_end_time': time(17, 0)
+        }).id
+        cache.reset_mock()
+
+        repo.bulk_update([{'id': doctor_id, 'name': 'Dr. Jane'}])
+        cache.invalidate.assert_called_once_with('doctor', f'doctor:{doctor_id}')
+
+        cache.reset_mock()
+        repo.delete(doctor_id)
+        cache.invalidate.assert_called_once_with('doctor', f'doctor:{doctor_id}', 'appointment')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,224 @@
+import os
+import shutil
+import sqlite3
+import stat
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+from app.cache import Cache, create_cache
+from app.cache.backends import MemoryBackend, SQLiteBackend, NullBackend
+from app.cache.fragments import FragmentCache
+from app.schemas.appointment import AppointmentResponse
+from app.utils import CustomJSONProvider, list_response
+from flask import jsonify
+from flask import Flask
+from datetime import date, datetime, time
+from app.cache import to_row
+from app.models.doctor import Doctor
+from app.models.gender import Gender
+from app.models.appointment import AppointmentStatus
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = Cache(MemoryBackend(max_entries=2), default_ttl=60)
+
+    def test_get_or_load_hit_and_miss(self):
+        loader = Mock(return_value=[1, 2])
+
+        first = self.cache.get_or_load('doctor:all', ['doctor'], loader)
+        second = self.cache.get_or_load('doctor:all', ['doctor'], loader)
+
+        self.assertEqual(first, [1, 2])
+        self.assertEqual(second, [1, 2])
+        loader.assert_called_once()
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(stats['hit_ratio'], 0.5)
+
+    def test_invalidate_tag(self):
+        loader = Mock(side_effect=['old', 'new', 'other'])
+        self.cache.get_or_load('doctor:1', ['doctor:1'], loader)
+
+        self.cache.invalidate('doctor:1')
+
+        self.assertEqual(self.cache.get_or_load('doctor:1', ['doctor:1'], loader), 'new')
+        self.assertEqual(self.cache.stats()['invalidations'], 1)
+
+    def test_invalidate_unrelated_tag_keeps_entry(self):
+        loader = Mock(return_value='value')
+        self.cache.get_or_load('doctor:1', ['doctor:1'], loader)
+
+        self.cache.invalidate('doctor:2')
+        self.cache.get_or_load('doctor:1', ['doctor:1'], loader)
+
+        loader.assert_called_once()
+
+    def test_ttl_expiry(self):
+        loader = Mock(return_value='value')
+        with patch('app.cache.backends.time.monotonic', return_value=1000):
+            self.cache.get_or_load('key', [], loader)
+        with patch('app.cache.backends.time.monotonic', return_value=1061):
+            self.cache.get_or_load('key', [], loader)
+
+        self.assertEqual(loader.call_count, 2)
+
+    def test_lru_eviction(self):
+        loader = Mock(return_value='value')
+        self.cache.get_or_load('a', [], loader)
+        self.cache.get_or_load('b', [], loader)
+        self.cache.get_or_load('a', [], loader)
+        self.cache.get_or_load('c', [], loader)
+
+        self.cache.get_or_load('a', [], loader)
+        self.cache.get_or_load('b', [], loader)
+
+        self.assertEqual(loader.call_count, 4)
+
+    def test_null_backend_always_loads(self):
+        cache = Cache(NullBackend())
+        loader = Mock(return_value='value')
+        cache.get_or_load('key', [], loader)
+        cache.get_or_load('key', [], loader)
+        self.assertEqual(loader.call_count, 2)
+
+    def test_create_cache_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            create_cache({'CACHE_BACKEND': 'memcached'})
+
+class TestSQLiteBackend(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.sqlite3')
+        os.close(fd)
+        # Two caches on the same file stand in for two gunicorn workers
+        self.worker1 = Cache(SQLiteBackend(self.path))
+        self.worker2 = Cache(SQLiteBackend(self.path))
+
+    def tearDown(self):
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+
+    def test_entries_are_shared(self):
+        self.worker1.get_or_load('doctor:all', ['doctor'], lambda: [{'id': 1}])
+        loader = Mock()
+
+        self.assertEqual(self.worker2.get_or_load('doctor:all', ['doctor'], loader), [{'id': 1}])
+        loader.assert_not_called()
+
+    def test_invalidation_is_seen_by_other_workers(self):
+        self.worker1.get_or_load('doctor:all', ['doctor'], lambda: 'old')
+        self.worker2.invalidate('doctor')
+
+        self.assertEqual(self.worker1.get_or_load('doctor:all', ['doctor'], lambda: 'new'), 'new')
+
+    def test_rows_round_trip_as_json(self):
+        row = {'id': 1, 'gender': Gender.MALE, 'status': AppointmentStatus.DONE, 'birthdate': date(1980, 1, 2),
+               'datetime': datetime(2024, 3, 1, 9, 30), 'work_start_time': time(8), 'notes': None}
+        self.worker1.get_or_load('rows', [], lambda: [row])
+        self.worker1.get_or_load('version', [], lambda: (3, datetime(2024, 1, 1)))
+
+        self.assertEqual(self.worker2.get_or_load('rows', [], Mock()), [row])
+        self.assertEqual(self.worker2.get_or_load('version', [], Mock()), (3, datetime(2024, 1, 1)))
+        stored = sqlite3.connect(self.path).execute('SELECT value FROM cache_entry').fetchone()[0]
+        self.assertIsInstance(stored, str)
+
+    def test_undecodable_entry_is_a_miss(self):
+        self.worker1.get_or_load('doctor:1', [], lambda: 'old')
+        with sqlite3.connect(self.path) as conn:
+            conn.execute("UPDATE cache_entry SET value = '{\"__enum__\": \"os\", \"value\": 1}'")
+
+        with self.assertLogs('app.cache.backends', 'WARNING'):
+            self.assertEqual(self.worker2.get_or_load('doctor:1', [], lambda: 'new'), 'new')
+
+    def test_file_is_made_private(self):
+        os.chmod(self.path, 0o644)
+        SQLiteBackend(self.path)
+
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+
+    def test_missing_directory_is_created_private(self):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, 'instance', 'cache.sqlite3')
+        try:
+            SQLiteBackend(path)
+            self.assertEqual(stat.S_IMODE(os.stat(os.path.dirname(path)).st_mode), 0o700)
+            self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o600)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_to_row_leaves_password_out(self):
+        doctor = Doctor(id=1, name='Doctor', username='doctor', password='pbkdf2:sha256:hash', gender=Gender.MALE)
+
+        self.assertNotIn('password', to_row(doctor))
+        self.assertEqual(to_row(doctor)['username'], 'doctor')
+
+class TestFragmentCache(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.json = CustomJSONProvider(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.fragments = FragmentCache()
+
+    def tearDown(self):
+        self.ctx.pop()
+
+    def _appointment(self, id=1, notes=None, updated_at=datetime(2024, 1, 1, 8, 0), version=1):
+        return Mock(id=id, patient_id=1, doctor_id=2, datetime=datetime(2024, 1, 2, 10, 0),
+                    status='IN_QUEUE', diagnose=None, notes=notes, updated_at=updated_at, version=version)
+
+    def test_encode_matches_jsonify(self):
+        fragment = self.fragments.encode(AppointmentResponse, self._appointment())
+
+        self.assertEqual(fragment, (
+            b'{"id":1,"patient_id":1,"doctor_id":2,"datetime":"2024-01-02T10:00:00",'
+            b'"status":"IN_QUEUE","diagnose":null,"notes":null}'
+        ))
+
+    def test_unchanged_row_is_not_reserialised(self):
+        self.fragments.encode(AppointmentResponse, self._appointment(notes='first'))
+
+        fragment = self.fragments.encode(AppointmentResponse, self._appointment(notes='second'))
+
+        self.assertIn(b'"notes":"first"', fragment)
+        self.assertEqual(self.fragments.stats()['hits'], 1)
+
+    def test_updated_row_is_reserialised(self):
+        self.fragments.encode(AppointmentResponse, self._appointment(notes='first'))
+
+        fragment = self.fragments.encode(AppointmentResponse, self._appointment(
+            notes='second', updated_at=datetime(2024, 1, 1, 9, 0)
+        ))
+
+        self.assertIn(b'"notes":"second"', fragment)
+
+    def test_write_within_the_same_second_is_reserialised(self):
+        self.fragments.encode(AppointmentResponse, self._appointment(notes='first'))
+
+        fragment = self.fragments.encode(AppointmentResponse, self._appointment(notes='second', version=2))
+
+        self.assertIn(b'"notes":"second"', fragment)
+
+    def test_list_response_matches_jsonify(self):
+        items = [self._appointment(id=1), self._appointment(id=2)]
+        body = {'ok': True, 'result': [AppointmentResponse.model_validate(item).model_dump() for item in items]}
+
+        for debug in (False, True):
+            self.app.debug = debug
+            with self.app.test_request_context():
+                response, _ = list_response(items, AppointmentResponse)
+                self.assertEqual(response.get_data(), jsonify(body).get_data())
+
+    def test_memory_is_bounded(self):
+        size = len(self.fragments.encode(AppointmentResponse, self._appointment()))
+        self.fragments = FragmentCache(max_bytes=size * 2)
+
+        for id in range(1, 6):
+            self.fragments.encode(AppointmentResponse, self._appointment(id=id))
+
+        stats = self.fragments.stats()
+        self.assertEqual(stats['entries'], 2)
+        self.assertLessEqual(stats['bytes'], size * 2)
+
+if __name__ == '__main__':
+    unittest.main()
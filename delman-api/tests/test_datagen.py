@@ -0,0 +1,124 @@
+import csv
+import os
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta
+from unittest.mock import MagicMock
+from flask import Flask
+from app.exts import db
+from app.models.appointment import Appointment, AppointmentStatus
+from app.models.doctor import Doctor
+from app.models.gender import Gender
+from app.models.patient import Patient
+from benchmarks.datagen import Spec, Writer, generate, appointment_share, no_ktp, APPOINTMENT_COLUMNS
+
+TODAY = date(2024, 6, 3)
+
+class TestGenerate(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        db.init_app(self.app)
+        self.vaccines_dir = tempfile.mkdtemp()
+
+    def generate(self, seed=1, **volumes):
+        volumes = dict(dict(patients=300, doctors=4, appointments=900, days=20, future_days=3), **volumes)
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+            counts = generate(db.engine, Spec(today=TODAY, chunk_size=100, employees=2, **volumes), seed, 'hash',
+                              vaccines_dir=self.vaccines_dir)
+            rows = {
+                'patients': [(p.id, p.name, p.no_ktp, p.birthdate) for p in db.session.query(Patient).order_by(Patient.id)],
+                'doctors': [(d.id, d.work_start_time, d.work_end_time) for d in db.session.query(Doctor).order_by(Doctor.id)],
+                'appointments': [(a.id, a.doctor_id, a.patient_id, a.datetime, a.status)
+                                 for a in db.session.query(Appointment).order_by(Appointment.id)],
+            }
+        return counts, rows
+
+    def test_volumes(self):
+        counts, rows = self.generate()
+
+        self.assertEqual(counts, {'employee': 2, 'doctor': 4, 'patient': 300, 'appointment': 900})
+        self.assertEqual([row[0] for row in rows['appointments']], list(range(1, 901)))
+
+    def test_no_double_bookings_and_within_shift(self):
+        _, rows = self.generate()
+        shifts = {doctor_id: (start, end) for doctor_id, start, end in rows['doctors']}
+
+        booked = sorted((doctor_id, at) for _, doctor_id, _, at, _ in rows['appointments'])
+        for (doctor, at), (next_doctor, next_at) in zip(booked, booked[1:]):
+            if doctor == next_doctor:
+                self.assertGreaterEqual(next_at - at, timedelta(minutes=30))
+        for doctor, at in booked:
+            start, end = shifts[doctor]
+            self.assertTrue(start <= at.time() < end)
+
+    def test_status_follows_time(self):
+        _, rows = self.generate()
+        today = datetime.combine(TODAY, datetime.min.time())
+
+        for _, _, _, at, status in rows['appointments']:
+            if at >= today:
+                self.assertEqual(status, AppointmentStatus.IN_QUEUE)
+            else:
+                self.assertIn(status, (AppointmentStatus.DONE, AppointmentStatus.CANCELLED))
+
+    def test_unique_ktp(self):
+        _, rows = self.generate()
+
+        ktps = [row[2] for row in rows['patients']]
+        self.assertEqual(len(set(ktps)), len(ktps))
+        self.assertTrue(all(len(ktp) == 16 and ktp.isdigit() for ktp in ktps))
+
+    def test_deterministic_by_seed(self):
+        self.assertEqual(self.generate(seed=5)[1], self.generate(seed=5)[1])
+        self.assertNotEqual(self.generate(seed=5)[1]['patients'], self.generate(seed=6)[1]['patients'])
+
+    def test_vaccine_dataset_matches_patients(self):
+        _, rows = self.generate()
+        ktps = {row[2] for row in rows['patients']}
+
+        records = []
+        for name in sorted(os.listdir(self.vaccines_dir)):
+            with open(os.path.join(self.vaccines_dir, name)) as file:
+                records.extend(csv.DictReader(file))
+
+        self.assertEqual(len(os.listdir(self.vaccines_dir)), 3)
+        known = [record for record in records if record['no_ktp'] in ktps]
+        self.assertGreater(len(known), 0.7 * len(ktps))
+        self.assertTrue(all(record['no_ktp'].startswith('99') for record in records if record['no_ktp'] not in ktps))
+        self.assertTrue(all(1 <= int(record['vaccine_count']) <= 4 for record in records))
+
+    def test_capacity_is_checked(self):
+        with self.assertRaises(ValueError):
+            Spec(patients=10, doctors=1, appointments=10000, days=10, future_days=0).check()
+
+class TestHelpers(unittest.TestCase):
+    def test_appointment_share_is_contiguous_and_complete(self):
+        spec = Spec(patients=10, doctors=3, appointments=10)
+
+        shares = [appointment_share(spec, doctor_id) for doctor_id in (1, 2, 3)]
+
+        self.assertEqual(shares, [(1, 4), (5, 3), (8, 3)])
+
+    def test_no_ktp_carries_birthdate(self):
+        self.assertEqual(no_ktp(12345, Gender.FEMALE, date(1990, 5, 7)), '1101024705902345')
+        self.assertEqual(no_ktp(7, Gender.MALE, date(2001, 12, 25)), '1101012512010007')
+
+    def test_copy_writes_csv_with_enum_names_and_nulls(self):
+        engine = MagicMock()
+        engine.dialect.name = 'postgresql'
+        cursor = engine.raw_connection.return_value.cursor.return_value.__enter__.return_value
+
+        Writer(engine).write('appointment', APPOINTMENT_COLUMNS, [
+            (1, 2, 3, datetime(2024, 1, 2, 9, 30), AppointmentStatus.DONE, 'Flu', None)
+        ])
+
+        sql, buffer = cursor.copy_expert.call_args.args
+        self.assertEqual(sql, 'COPY appointment (id, patient_id, doctor_id, datetime, status, diagnose, notes) FROM STDIN WITH (FORMAT csv)')
+        self.assertEqual(buffer.getvalue(), '1,2,3,2024-01-02 09:30:00,DONE,Flu,\r\n')
+        engine.raw_connection.return_value.commit.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
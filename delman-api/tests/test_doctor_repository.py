@@ -0,0 +1,116 @@
+import unittest
+from datetime import date, time, datetime
+from sqlalchemy import event
+from app.exts import db
+from app.cache import Cache
+from app.cache.backends import MemoryBackend
+from app.models.gender import Gender
+from app.repositories.doctor import DoctorRepository
+from app.models.appointment import Appointment
+from app.models.patient import Patient
+from tests.helpers import SQLiteTestCase
+
+class TestDoctorRepository(SQLiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache = Cache(MemoryBackend())
+        self.repo = DoctorRepository(db, self.cache)
+        self.statements = []
+        event.listen(db.engine, 'before_cursor_execute', self._record)
+
+    def tearDown(self):
+        event.remove(db.engine, 'before_cursor_execute', self._record)
+        super().tearDown()
+
+    def _record(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def _create_doctor(self, username='drjohn'):
+        return self.repo.create({
+            'name': 'Dr. John', 'username': username, 'password': 'x', 'gender': Gender.MALE,
+            'birthdate': date(1980, 1, 1), 'work_start_time': time(9, 0), 'work_end_time': time(17, 0)
+        })
+
+    def test_get_all_is_served_from_cache(self):
+        self._create_doctor()
+        self.repo.get_all()
+        db.session.remove()
+        self.statements.clear()
+
+        doctors = self.repo.get_all()
+
+        self.assertEqual([d.name for d in doctors], ['Dr. John'])
+        self.assertEqual(self.statements, [])
+
+    def test_update_invalidates_cached_reads(self):
+        doctor_id = self._create_doctor().id
+        self.repo.get_all()
+        self.repo.get_by_id(doctor_id)
+        db.session.remove()
+
+        self.repo.update(doctor_id, {'name': 'Dr. Jane'})
+        db.session.remove()
+
+        self.assertEqual(self.repo.get_by_id(doctor_id).name, 'Dr. Jane')
+        self.assertEqual(self.repo.get_all()[0].name, 'Dr. Jane')
+
+    def test_update_returns_row_without_reloading(self):
+        doctor = self._create_doctor()
+        doctor_id = doctor.id
+        self.statements.clear()
+
+        updated = self.repo.update(doctor_id, {'name': 'Dr. Jane'})
+
+        self.assertIs(updated, doctor)
+        self.assertEqual((updated.name, updated.username), ('Dr. Jane', 'drjohn'))
+        self.assertEqual(len(self.statements), 1)
+        self.assertTrue(self.statements[0].startswith('UPDATE'))
+
+    def test_delete_cascades_in_database(self):
+        doctor_id = self._create_doctor().id
+        patient = Patient(name='Pat One', gender=Gender.FEMALE, birthdate=date(1990, 1, 1), no_ktp='1234567890123456', address='Jl. Sudirman')
+        db.session.add(patient)
+        db.session.flush()
+        db.session.add_all([
+            Appointment(patient_id=patient.id, doctor_id=doctor_id, datetime=datetime(2024, 1, day, 10, 0))
+            for day in range(1, 21)
+        ])
+        db.session.commit()
+        db.session.remove()
+        self.statements.clear()
+
+        self.assertTrue(self.repo.delete(doctor_id))
+
+        # The appointments are never loaded, the FK cascade removes them
+        self.assertEqual(len(self.statements), 1)
+        self.assertTrue(self.statements[0].startswith('DELETE FROM doctor'))
+        self.assertEqual(Appointment.query.count(), 0)
+        self.assertFalse(self.repo.delete(doctor_id))
+
+    def test_bulk_create_is_one_transaction(self):
+        self._create_doctor('taken')
+        self.repo.get_all()
+        self.statements.clear()
+
+        doctors = self.repo.bulk_create([{
+            'name': f'Dr. {i}', 'username': f'dr{i}', 'password': 'x', 'gender': Gender.FEMALE,
+            'birthdate': date(1980, 1, 1), 'work_start_time': time(9, 0), 'work_end_time': time(17, 0)
+        } for i in range(20)])
+
+        self.assertEqual(len(doctors), 20)
+        # Batched INSERT, then one SELECT to reload the rows
+        self.assertLessEqual(len([s for s in self.statements if s.startswith('INSERT')]), 2)
+        self.assertEqual(len([s for s in self.statements if s.startswith('SELECT')]), 1)
+        self.assertEqual(len(self.repo.get_all()), 21)
+        self.assertEqual(self.repo.get_existing_usernames(['taken', 'dr3', 'free']), {'taken', 'dr3'})
+
+    def test_cached_instance_can_be_deleted(self):
+        doctor_id = self._create_doctor().id
+        self.repo.get_by_id(doctor_id)
+        db.session.remove()
+
+        self.assertTrue(self.repo.delete(doctor_id))
+        self.assertIsNone(self.repo.get_by_id(doctor_id))
+
+if __name__ == '__main__':
+    unittest.main()
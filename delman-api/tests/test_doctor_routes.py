@@ -5,7 +5,7 @@ from app.routes.doctor import create_doctor_blueprint
 from app.services.doctor import DoctorService
 from app.exts import jwt
 from app.models.gender import Gender
-from datetime import date, time
+from datetime import date, time, datetime
 from app.models.doctor import Doctor
 from app.exceptions import UsernameAlreadyExistsError
 from app.utils import CustomJSONProvider
@@ -25,9 +25,32 @@ class TestDoctorRoutes(unittest.TestCase):
         self.jwt_patcher = patch('flask_jwt_extended.view_decorators.verify_jwt_in_request')
         self.jwt_patcher.start()
 
+        self.mock_service.get_doctors_version.return_value = (2, datetime(2024, 1, 1, 8, 0))
+
     def tearDown(self):
         self.jwt_patcher.stop()
 
+    def test_bulk_create_doctors(self):
+        mock_doctor = Mock()
+        mock_doctor.id = 1
+        mock_doctor.name = "Dr. John Doe"
+        mock_doctor.username = "drjohndoe"
+        mock_doctor.gender = Gender.MALE
+        mock_doctor.birthdate = date(1980, 1, 1)
+        mock_doctor.work_start_time = time(9, 0)
+        mock_doctor.work_end_time = time(17, 0)
+        self.mock_service.bulk_create_doctors.return_value = ([mock_doctor], [])
+
+        response = self.client.post('/doctors/bulk', json={'items': [{
+            'name': 'Dr. John Doe', 'username': 'drjohndoe', 'password': 'Password!23', 'gender': 'male',
+            'birthdate': '1980-01-01', 'work_start_time': '09:00', 'work_end_time': '17:00'
+        }]})
+
+        self.assertEqual(response.status_code, 201)
+        data = response.get_json()['result']
+        self.assertEqual(data['created'][0]['username'], 'drjohndoe')
+        self.assertEqual(data['errors'], [])
+
     def test_create_doctor_success(self):
         mock_doctor = Mock(spec=Doctor)
         mock_doctor.id = 1
@@ -133,6 +156,47 @@ class TestDoctorRoutes(unittest.TestCase):
         data = response.get_json()
         self.assertEqual(len(data['result']), 2)
 
+    def test_get_all_doctors_sparse_fields(self):
+        mock_doctor = Mock()
+        mock_doctor.id = 1
+        mock_doctor.name = "Dr. John Doe"
+        mock_doctor.work_start_time = time(9, 0)
+        self.mock_service.get_all_doctors.return_value = [mock_doctor]
+
+        response = self.client.get('/doctors?fields=name,work_start_time')
+
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data['result'], [{'name': 'Dr. John Doe', 'work_start_time': '09:00:00'}])
+        self.mock_service.get_all_doctors.assert_called_once_with(['name', 'work_start_time'])
+
+    def test_get_doctors_by_ids(self):
+        mock_doctor = Mock()
+        mock_doctor.id = 2
+        mock_doctor.name = "Dr. Jane Doe"
+        mock_doctor.username = "drjanedoe"
+        mock_doctor.gender = Gender.FEMALE
+        mock_doctor.birthdate = date(1985, 2, 2)
+        mock_doctor.work_start_time = time(8, 0)
+        mock_doctor.work_end_time = time(16, 0)
+        self.mock_service.get_doctors_by_ids.return_value = ([mock_doctor], [5])
+
+        response = self.client.get('/doctors?ids=2,5')
+
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual([d['id'] for d in data['result']['items']], [2])
+        self.assertEqual(data['result']['missing'], [5])
+        self.mock_service.get_doctors_by_ids.assert_called_once_with([2, 5])
+        self.mock_service.get_all_doctors.assert_not_called()
+
+    def test_get_doctors_by_ids_invalid(self):
+        response = self.client.get('/doctors?ids=1,abc')
+
+        self.assertEqual(response.status_code, 400)
+        data = response.get_json()
+        self.assertEqual(data['error']['code'], 'doctor/validation-error')
+
     def test_get_doctor_by_id_success(self):
         mock_doctor = Mock(spec=Doctor)
         mock_doctor.id = 1
@@ -142,6 +206,7 @@ class TestDoctorRoutes(unittest.TestCase):
         mock_doctor.birthdate = date(1980, 1, 1)
         mock_doctor.work_start_time = time(9, 0)
         mock_doctor.work_end_time = time(17, 0)
+        mock_doctor.updated_at = datetime(2024, 1, 1, 8, 0)
 
         self.mock_service.get_doctor_by_id.return_value = mock_doctor
 
@@ -151,6 +216,43 @@ class TestDoctorRoutes(unittest.TestCase):
         data = response.get_json()
         self.assertEqual(data['result']['name'], 'Dr. John Doe')
 
+    def test_get_doctor_by_id_not_modified(self):
+        mock_doctor = Mock()
+        mock_doctor.id = 1
+        mock_doctor.name = "Dr. John Doe"
+        mock_doctor.username = "drjohndoe"
+        mock_doctor.gender = Gender.MALE
+        mock_doctor.birthdate = date(1980, 1, 1)
+        mock_doctor.work_start_time = time(9, 0)
+        mock_doctor.work_end_time = time(17, 0)
+        mock_doctor.updated_at = datetime(2024, 1, 1, 8, 0)
+        self.mock_service.get_doctor_by_id.return_value = mock_doctor
+
+        etag = self.client.get('/doctors/1').headers['ETag']
+        response = self.client.get('/doctors/1', headers={'If-None-Match': etag})
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+
+    def test_get_all_doctors_not_modified(self):
+        self.mock_service.get_all_doctors.return_value = []
+        etag = self.client.get('/doctors').headers['ETag']
+        self.mock_service.get_all_doctors.reset_mock()
+
+        response = self.client.get('/doctors', headers={'If-None-Match': etag})
+
+        self.assertEqual(response.status_code, 304)
+        self.assertIn('ETag', response.headers)
+        self.mock_service.get_all_doctors.assert_not_called()
+
+    def test_get_all_doctors_ignores_if_modified_since(self):
+        # Deleting an older doctor lowers the count but leaves the newest updated_at as it was
+        self.mock_service.get_all_doctors.return_value = []
+        response = self.client.get('/doctors', headers={'If-Modified-Since': 'Mon, 01 Jan 2024 08:00:00 GMT'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Last-Modified', response.headers)
+
     def test_get_doctor_by_id_not_found(self):
         self.mock_service.get_doctor_by_id.return_value = None
 
@@ -157,6 +157,14 @@ class TestDoctorService(unittest.TestCase):
         self.assertEqual(result.id, 1)
         self.mock_repo.get_by_id.assert_called_once_with(1)
 
+    def test_get_doctors_by_ids(self):
+        doctor1, doctor3 = Mock(id=1), Mock(id=3)
+        self.mock_repo.get_by_ids.return_value = [doctor1, doctor3]
+        found, missing = self.service.get_doctors_by_ids([3, 2, 1, 3])
+        self.assertEqual(found, [doctor3, doctor1])
+        self.assertEqual(missing, [2])
+        self.mock_repo.get_by_ids.assert_called_once_with([3, 2, 1, 3])
+
     def test_delete_doctor(self):
         self.mock_repo.delete.return_value = True
         result = self.service.delete_doctor(1)
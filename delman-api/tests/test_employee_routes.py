@@ -92,6 +92,40 @@ class TestEmployeeRoutes(unittest.TestCase):
         data = response.get_json()
         self.assertEqual(data['error']['code'], 'employee/creation-failed')
 
+    def test_bulk_create_employees(self):
+        mock_employee = Mock()
+        mock_employee.id = 1
+        mock_employee.name = "John Doe"
+        mock_employee.username = "johndoe"
+        mock_employee.gender = Gender.MALE
+        mock_employee.birthdate = date(1990, 1, 1)
+        # Service errors index into the items that passed validation
+        self.mock_service.bulk_create_employees.return_value = ([mock_employee], [
+            {'index': 1, 'code': 'employee/username-exists', 'message': 'taken'}
+        ])
+        valid = {'name': 'John Doe', 'username': 'johndoe', 'password': 'Password!23', 'gender': 'male', 'birthdate': '1990-01-01'}
+
+        response = self.client.post('/employees/bulk', json={'items': [
+            valid,
+            dict(valid, password='short'),
+            dict(valid, username='taken'),
+        ]})
+
+        self.assertEqual(response.status_code, 207)
+        data = response.get_json()['result']
+        self.assertEqual([employee['username'] for employee in data['created']], ['johndoe'])
+        self.assertEqual([(error['index'], error['code']) for error in data['errors']], [
+            (1, 'employee/validation-error'), (2, 'employee/username-exists')
+        ])
+        self.assertEqual(len(self.mock_service.bulk_create_employees.call_args.args[0]), 2)
+
+    def test_bulk_create_employees_empty(self):
+        response = self.client.post('/employees/bulk', json={'items': []})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()['error']['code'], 'employee/validation-error')
+        self.mock_service.bulk_create_employees.assert_not_called()
+
     def test_get_all_employees(self):
         mock_employee1 = Mock(spec=Employee)
         mock_employee1.id = 1
@@ -116,6 +150,23 @@ class TestEmployeeRoutes(unittest.TestCase):
         data = response.get_json()
         self.assertEqual(len(data['result']), 2)
 
+    def test_get_employees_by_ids(self):
+        mock_employee = Mock()
+        mock_employee.id = 3
+        mock_employee.name = "Jane Doe"
+        mock_employee.username = "janedoe"
+        mock_employee.gender = Gender.FEMALE
+        mock_employee.birthdate = date(1992, 2, 2)
+        self.mock_service.get_employees_by_ids.return_value = ([mock_employee], [])
+
+        response = self.client.get('/employees?ids=3')
+
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data['result']['items'][0]['username'], 'janedoe')
+        self.assertEqual(data['result']['missing'], [])
+        self.mock_service.get_employees_by_ids.assert_called_once_with([3])
+
     def test_get_employee_by_id_success(self):
         mock_employee = Mock(spec=Employee)
         mock_employee.id = 1
@@ -1,12 +1,12 @@
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 from app.services.employee import EmployeeService
 from app.schemas.employee import EmployeeCreate, EmployeeUpdate
 from app.models.gender import Gender
 from datetime import date
 from pydantic import ValidationError
 from sqlalchemy.exc import IntegrityError
-from app.exceptions import UsernameAlreadyExistsError
+from app.exceptions import UsernameAlreadyExistsError, DuplicateResourceError
 
 class TestEmployeeService(unittest.TestCase):
     def setUp(self):
@@ -145,6 +145,49 @@ class TestEmployeeService(unittest.TestCase):
         self.assertEqual(result.id, 1)
         self.mock_repo.get_by_id.assert_called_once_with(1)
 
+    @patch('app.services.employee.current_user_cache')
+    def test_update_employee_invalidates_current_user(self, mock_cache):
+        self.mock_repo.update.return_value = Mock(id=1)
+        self.service.update_employee(1, EmployeeUpdate(name="John Doe Updated"))
+        mock_cache.invalidate.assert_called_once_with('employee:1')
+
+    @patch('app.services.employee.current_user_cache')
+    def test_delete_employee_invalidates_current_user(self, mock_cache):
+        self.mock_repo.delete.return_value = True
+        self.service.delete_employee(1)
+        mock_cache.invalidate.assert_called_once_with('employee:1')
+
+    @patch('app.services.employee.current_user_cache')
+    def test_bulk_create_employees(self, mock_cache):
+        items = [
+            EmployeeCreate(name="John Doe", username="johndoe", password="Password!23", gender=Gender.MALE, birthdate=date(1990, 1, 1)),
+            EmployeeCreate(name="Jane Doe", username="taken", password="Password!23", gender=Gender.FEMALE, birthdate=date(1990, 1, 1)),
+            EmployeeCreate(name="John Again", username="johndoe", password="Password!23", gender=Gender.MALE, birthdate=date(1990, 1, 1)),
+            EmployeeCreate(name="Mary Doe", username="marydoe", password="Password!23", gender=Gender.FEMALE, birthdate=date(1990, 1, 1)),
+        ]
+        self.mock_repo.get_existing_usernames.return_value = {'taken'}
+        created = [Mock(id=2, username='marydoe'), Mock(id=1, username='johndoe')]
+        self.mock_repo.bulk_create.return_value = created
+
+        employees, errors = self.service.bulk_create_employees(items)
+
+        self.assertEqual([employee.username for employee in employees], ['johndoe', 'marydoe'])
+        self.assertEqual([(error['index'], error['code']) for error in errors], [
+            (1, 'employee/username-exists'), (2, 'employee/username-exists')
+        ])
+        inserted = self.mock_repo.bulk_create.call_args.args[0]
+        self.assertEqual([data['username'] for data in inserted], ['johndoe', 'marydoe'])
+        self.assertTrue(all(data['password'].startswith('pbkdf2:') for data in inserted))
+        self.assertEqual(mock_cache.invalidate.call_count, 2)
+
+    def test_bulk_create_employees_concurrent_duplicate(self):
+        self.mock_repo.get_existing_usernames.return_value = set()
+        self.mock_repo.bulk_create.side_effect = IntegrityError(None, None, Exception("UNIQUE constraint failed: employee.username"))
+        items = [EmployeeCreate(name="John Doe", username="johndoe", password="Password!23", gender=Gender.MALE, birthdate=date(1990, 1, 1))]
+
+        with self.assertRaises(DuplicateResourceError):
+            self.service.bulk_create_employees(items)
+
     def test_delete_employee(self):
         self.mock_repo.delete.return_value = True
         result = self.service.delete_employee(1)
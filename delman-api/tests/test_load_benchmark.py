@@ -0,0 +1,57 @@
+import unittest
+from datetime import date, datetime
+from flask import Flask
+from app.exts import db
+from app.models.appointment import Appointment
+from app.models.doctor import Doctor
+from app.models.employee import Employee
+from app.models.patient import Patient
+from benchmarks.load import Dataset, seed_dataset, percentile, summarize, compare, USERNAME
+
+class TestLoadReport(unittest.TestCase):
+    def test_percentile_is_nearest_rank(self):
+        values = list(range(1, 101))
+
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile(values, 1.0), 100)
+        self.assertIsNone(percentile([], 0.5))
+
+    def test_summarize(self):
+        samples = [('login', 0.010, 200, True), ('login', 0.030, 200, True), ('login', 0.020, 500, False)]
+
+        summary = summarize(samples, 2)
+
+        self.assertEqual(summary['requests'], 3)
+        self.assertEqual(summary['rps'], 1.5)
+        self.assertEqual(summary['error_rate'], 0.3333)
+        self.assertEqual(summary['latency_ms']['p50'], 20.0)
+        self.assertEqual(summary['latency_ms']['max'], 30.0)
+        self.assertEqual(summary['status'], {'200': 2, '500': 1})
+
+    def test_compare_flags_slower_runs_only(self):
+        def result(rps, p95):
+            return {'operations': {'login': {'rps': rps, 'error_rate': 0.0, 'latency_ms': {'p95': p95}}}}
+
+        self.assertEqual(compare(result(100, 50), result(100, 50), 0.1), [])
+        self.assertEqual(compare(result(95, 54), result(100, 50), 0.1), [])
+        self.assertEqual(len(compare(result(80, 70), result(100, 50), 0.1)), 2)
+
+class TestSeedDataset(unittest.TestCase):
+    def test_bench_employee_and_dataset(self):
+        app = Flask(__name__)
+        app.config.update(SQLALCHEMY_DATABASE_URI='sqlite:///:memory:', PASSWORD_HASH_METHOD='pbkdf2:sha256:1000',
+                          PASSWORD_HASH_SALT_LENGTH=8)
+        db.init_app(app)
+        with app.app_context():
+            db.create_all()
+            seed_dataset(app, Dataset(doctors=3, patients=40, appointments=300, days=10, hot_doctors=2), 1)
+
+            self.assertEqual(db.session.query(Employee).filter_by(username=USERNAME).count(), 1)
+            self.assertEqual(db.session.query(Doctor).count(), 3)
+            self.assertEqual(db.session.query(Patient).count(), 40)
+            # History only: bookings made during the run are the only future ones
+            self.assertEqual(db.session.query(Appointment).filter(Appointment.datetime >= datetime.combine(date.today(), datetime.min.time())).count(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
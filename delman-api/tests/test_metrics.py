@@ -0,0 +1,72 @@
+import unittest
+from flask import Flask, g
+from app.metrics import timing
+from app.routes.metrics import create_metrics_blueprint
+from app.utils import success_response
+
+class TestRequestTiming(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config['METRICS_ALLOWED_NETWORKS'] = ['127.0.0.0/8']
+        timing.init_app(self.app)
+        self.app.register_blueprint(create_metrics_blueprint())
+
+        @self.app.route('/doctors/<int:id>')
+        def get_doctor(id):
+            timing.add('db', 0.002)
+            timing.add('db', 0.003)
+            return success_response({'id': id})
+
+        self.client = self.app.test_client()
+
+    def test_server_timing_header(self):
+        response = self.client.get('/doctors/1')
+
+        entries = dict(entry.split(';dur=') for entry in response.headers['Server-Timing'].split(', '))
+        self.assertEqual(float(entries['db']), 5.0)
+        self.assertIn('serialize', entries)
+        self.assertIn('total', entries)
+
+    def test_server_timing_needs_an_allowed_address(self):
+        response = self.client.get('/doctors/1', environ_base={'REMOTE_ADDR': '203.0.113.7'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Server-Timing', response.headers)
+
+    def test_metrics_are_labelled_by_route(self):
+        self.client.get('/doctors/1')
+        self.client.get('/doctors/2')
+
+        body = self.client.get('/metrics').data.decode()
+
+        self.assertIn('delman_http_request_duration_seconds_count{method="GET",route="/doctors/<int:id>",status="200"}', body)
+        self.assertIn('delman_http_request_segment_seconds_total{route="/doctors/<int:id>",segment="db"}', body)
+        self.assertNotIn('route="/doctors/1"', body)
+
+    def _segment_totals(self):
+        body = self.client.get('/metrics').data.decode()
+        return [line for line in body.splitlines() if line.startswith('delman_http_request_segment_seconds_total')]
+
+    def test_add_outside_request_is_ignored(self):
+        self.client.get('/doctors/1')
+        before = self._segment_totals()
+
+        with self.app.app_context():
+            timing.add('db', 1.0)
+            self.assertNotIn('timing_segments', g)
+
+        # Scraping adds no db time, so any change would come from the add above
+        self.assertEqual(self._segment_totals(), before)
+
+    def test_metrics_need_an_allowed_address(self):
+        self.app.config['METRICS_ALLOWED_NETWORKS'] = ['10.0.0.0/8']
+
+        outside = self.client.get('/metrics', environ_base={'REMOTE_ADDR': '203.0.113.7'})
+        inside = self.client.get('/metrics', environ_base={'REMOTE_ADDR': '10.1.2.3'})
+
+        self.assertEqual(outside.status_code, 403)
+        self.assertEqual(outside.get_json()['error']['code'], 'metrics/forbidden')
+        self.assertEqual(inside.status_code, 200)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+from benchmarks.micro import CASES, measure, compare, format_time, environment, environment_mismatch
+
+class TestMicroBenchmarks(unittest.TestCase):
+    def test_every_case_runs(self):
+        # Keeps the cases in step with the schemas: a renamed field would otherwise only fail at benchmark time
+        for name, (setup, sizes) in CASES.items():
+            with self.subTest(name):
+                steps = setup(1)
+                next(steps)()
+                next(steps, None)
+
+    def test_measure(self):
+        calls = []
+
+        result = measure(lambda: calls.append(1), rounds=3, min_time=0.001)
+
+        self.assertEqual(result['rounds'], 3)
+        self.assertGreaterEqual(len(calls), result['loops'] * 4)
+        self.assertLessEqual(result['min'], result['median'])
+
+    def test_compare_reports_slowdowns_beyond_tolerance(self):
+        baseline = {'a[1]': {'median': 1.0}, 'b[1]': {'median': 1.0}}
+        results = {'a[1]': {'median': 1.2}, 'b[1]': {'median': 1.5}, 'c[1]': {'median': 9.0}}
+
+        self.assertEqual([key for key, *_ in compare(results, baseline, 0.25)], ['b[1]'])
+
+    def test_environment_mismatch(self):
+        meta = dict(environment(), saved_at='2024-01-01T00:00:00')
+
+        self.assertEqual(environment_mismatch(meta), [])
+        self.assertEqual(environment_mismatch(dict(meta, python='3.7.16')), ['python'])
+
+    def test_format_time(self):
+        self.assertEqual(format_time(1.5), '1.50s')
+        self.assertEqual(format_time(0.0025), '2.50ms')
+        self.assertEqual(format_time(0.000004), '4.00us')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import threading
+import time
+import unittest
+from app.passwords import PasswordHasher
+from app.exceptions import PasswordHasherBusyError
+from werkzeug.security import generate_password_hash
+
+class TestPasswordHasher(unittest.TestCase):
+    def setUp(self):
+        self.hasher = PasswordHasher(method='pbkdf2:sha256:1000', salt_length=8)
+
+    def test_hash_and_verify_inline(self):
+        pwhash = self.hasher.hash('Secret123!')
+
+        self.assertTrue(pwhash.startswith('pbkdf2:sha256:1000$'))
+        self.assertTrue(self.hasher.verify(pwhash, 'Secret123!'))
+        self.assertFalse(self.hasher.verify(pwhash, 'wrong'))
+        self.assertEqual((self.hasher.stats()['hashes'], self.hasher.stats()['verifications']), (1, 2))
+
+    def test_counters_add_up_across_threads(self):
+        threads = [threading.Thread(target=lambda: [self.hasher.count('rehashed') for _ in range(1000)]) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.hasher.stats()['rehashed'], 8000)
+
+    def test_needs_rehash(self):
+        self.assertFalse(self.hasher.needs_rehash(self.hasher.hash('Secret123!')))
+        self.assertTrue(self.hasher.needs_rehash(generate_password_hash('Secret123!', 'pbkdf2:sha256:2000', 8)))
+        self.assertTrue(self.hasher.needs_rehash(generate_password_hash('Secret123!', 'pbkdf2:sha256:1000', 16)))
+
+    def test_needs_rehash_default_iterations(self):
+        hasher = PasswordHasher(method='pbkdf2:sha256', salt_length=16)
+
+        self.assertFalse(hasher.needs_rehash(generate_password_hash('Secret123!')))
+
+    def test_hash_in_pool(self):
+        hasher = PasswordHasher(method='pbkdf2:sha256:1000', salt_length=8, workers=1, queue_limit=1)
+        try:
+            pwhash = hasher.hash('Secret123!')
+            self.assertTrue(hasher.verify(pwhash, 'Secret123!'))
+        finally:
+            hasher.shutdown()
+
+    def test_hash_many_in_pool(self):
+        hasher = PasswordHasher(method='pbkdf2:sha256:1000', salt_length=8, workers=1, bulk_workers=2)
+
+        hashes = hasher.hash_many(['Secret123!', 'Other456?', 'Third789#'])
+
+        self.assertEqual(len(set(hashes)), 3)
+        self.assertTrue(hasher.verify(hashes[1], 'Other456?'))
+        self.assertEqual(hasher.stats()['hashes'], 3)
+        hasher.shutdown()
+
+    def test_saturated_pool_fails_fast(self):
+        hasher = PasswordHasher(method='pbkdf2:sha256:1000', salt_length=8, workers=1, queue_limit=0)
+        # Occupy the only slot, as a concurrent request would
+        hasher._slots.acquire()
+
+        with self.assertRaises(PasswordHasherBusyError):
+            hasher.hash('Secret123!')
+        self.assertEqual(hasher.stats()['rejected'], 1)
+
+        hasher._slots.release()
+
+    def test_timed_out_hash_keeps_its_slot_until_done(self):
+        hasher = PasswordHasher(method='pbkdf2:sha256:1000', salt_length=8, workers=1, queue_limit=0)
+        try:
+            # Starts the pool, so the slow call below times out on the work and not on process start-up
+            hasher.hash('Secret123!')
+            hasher.timeout = 0.05
+            with self.assertRaises(PasswordHasherBusyError):
+                hasher._run(time.sleep, 1)
+
+            # The abandoned call still runs in the pool: no new work may queue behind it
+            with self.assertRaises(PasswordHasherBusyError):
+                hasher.hash('Secret123!')
+
+            time.sleep(1.5)
+            hasher.timeout = 10
+            self.assertTrue(hasher.hash('Secret123!').startswith('pbkdf2:sha256:1000$'))
+        finally:
+            hasher.shutdown()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+from datetime import date
+from sqlalchemy import event
+from app.exts import db
+from app.models.gender import Gender
+from app.models.patient import Patient
+from app.repositories.patient import PatientRepository
+from tests.helpers import SQLiteTestCase
+
+class TestPatientRepository(SQLiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.repo = PatientRepository(db)
+
+    def _add_patient(self, name, no_ktp, address):
+        patient = Patient(name=name, gender=Gender.MALE, birthdate=date(1990, 1, 1), no_ktp=no_ktp, address=address)
+        db.session.add(patient)
+        db.session.commit()
+        return patient
+
+    def test_get_all_loads_only_requested_columns(self):
+        self._add_patient("John Doe", "1234567890123456", "Jl. Sudirman")
+        db.session.expunge_all()
+
+        patients = self.repo.get_all(fields=['id', 'name'])
+
+        self.assertEqual(patients[0].name, "John Doe")
+        self.assertNotIn('address', patients[0].__dict__)
+
+    def test_update_is_one_statement(self):
+        patient_id = self._add_patient("John Doe", "1234567890123456", "Jl. Sudirman").id
+        statements = []
+        record = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            patient = self.repo.update(patient_id, {'address': 'Jl. Thamrin'})
+            result = (patient.name, patient.address, patient.updated_at is not None)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+
+        self.assertEqual(result, ("John Doe", "Jl. Thamrin", True))
+        self.assertEqual(len(statements), 1)
+        self.assertTrue(statements[0].startswith('UPDATE'))
+        self.assertIn('RETURNING', statements[0])
+        db.session.expunge_all()
+        self.assertEqual(self.repo.get_by_id(patient_id).address, 'Jl. Thamrin')
+
+    def test_update_missing_patient(self):
+        self.assertIsNone(self.repo.update(42, {'address': 'Jl. Thamrin'}))
+
+    def test_get_version(self):
+        self.assertEqual(tuple(self.repo.get_version()), (0, None))
+        self._add_patient("John Doe", "1234567890123456", "Jl. Sudirman")
+
+        count, last_modified = self.repo.get_version()
+
+        self.assertEqual(count, 1)
+        self.assertIsNotNone(last_modified)
+
+    def test_get_by_ktps(self):
+        first = self._add_patient("John Doe", "1234567890123456", "Jl. Sudirman")
+        self._add_patient("Jane Roe", "6543210987654321", "Jl. Thamrin")
+
+        result = self.repo.get_by_ktps(["1234567890123456", "0000000000000000"])
+
+        self.assertEqual([p.id for p in result], [first.id])
+        self.assertEqual(self.repo.get_by_ktps([]), [])
+        self.assertEqual(self.repo.get_by_ktp("6543210987654321").name, "Jane Roe")
+
+    def test_search_ktp_prefix_ranks_first(self):
+        self._add_patient("Budi 3174", "1111222233334444", "Jl. 3174 Jakarta")
+        match = self._add_patient("Siti Aminah", "3174000011112222", "Jl. Merdeka")
+
+        result = self.repo.search("3174", 10)
+
+        self.assertEqual(result[0].id, match.id)
+        self.assertEqual(len(result), 2)
+
+    def test_search_name_and_address(self):
+        by_name = self._add_patient("John Doe", "1234567890123456", "Jl. Sudirman")
+        by_address = self._add_patient("Jane Roe", "6543210987654321", "Johnson Street")
+        self._add_patient("Siti Aminah", "1111222233334444", "Jl. Merdeka")
+
+        result = self.repo.search("joh", 10)
+
+        self.assertEqual([p.id for p in result], [by_name.id, by_address.id])
+
+    def test_search_escapes_wildcards_and_paginates(self):
+        for i in range(3):
+            self._add_patient(f"Patient {i}", f"123456789012345{i}", "Jl. Sudirman")
+
+        self.assertEqual(self.repo.search("%", 10), [])
+        self.assertEqual(len(self.repo.search("patient", 2, 2)), 1)
+
+if __name__ == '__main__':
+    unittest.main()
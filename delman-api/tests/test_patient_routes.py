@@ -5,7 +5,7 @@ from app.routes.patient import create_patient_blueprint
 from app.services.patient import PatientService
 from app.exts import jwt
 from app.models.gender import Gender
-from datetime import date
+from datetime import date, datetime
 from app.models.patient import Patient
 from app.exceptions import DuplicateResourceError
 from app.utils import CustomJSONProvider
@@ -25,9 +25,24 @@ class TestPatientRoutes(unittest.TestCase):
         self.jwt_patcher = patch('flask_jwt_extended.view_decorators.verify_jwt_in_request')
         self.jwt_patcher.start()
 
+        self.mock_service.get_patients_version.return_value = (2, datetime(2024, 1, 1, 8, 0))
+
     def tearDown(self):
         self.jwt_patcher.stop()
 
+    def _make_patient(self, id=1, no_ktp="1234567890123456"):
+        patient = Mock()
+        patient.id = id
+        patient.name = "John Doe"
+        patient.gender = Gender.MALE
+        patient.birthdate = date(1990, 1, 1)
+        patient.no_ktp = no_ktp
+        patient.address = "123 Main St, City"
+        patient.vaccine_type = None
+        patient.vaccine_count = None
+        patient.updated_at = datetime(2024, 1, 1, 8, 0)
+        return patient
+
     def test_create_patient_success(self):
         mock_patient = Mock(spec=Patient)
         mock_patient.id = 1
@@ -127,6 +142,74 @@ class TestPatientRoutes(unittest.TestCase):
         data = response.get_json()
         self.assertEqual(len(data['result']), 2)
 
+    def test_get_all_patients_not_modified(self):
+        self.mock_service.get_all_patients.return_value = [self._make_patient()]
+
+        first = self.client.get('/patients')
+        second = self.client.get('/patients', headers={'If-None-Match': first.headers['ETag']})
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 304)
+        self.mock_service.get_all_patients.assert_called_once()
+
+    def test_get_all_patients_modified(self):
+        self.mock_service.get_all_patients.return_value = [self._make_patient()]
+        etag = self.client.get('/patients').headers['ETag']
+        self.mock_service.get_patients_version.return_value = (3, datetime(2024, 1, 1, 9, 0))
+
+        response = self.client.get('/patients', headers={'If-None-Match': etag})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_get_all_patients_after_deleting_an_older_patient(self):
+        self.mock_service.get_all_patients.return_value = [self._make_patient()]
+        first = self.client.get('/patients')
+        # The older of the two patients is deleted: the count drops, the newest updated_at stays
+        self.mock_service.get_patients_version.return_value = (1, datetime(2024, 1, 1, 8, 0))
+
+        response = self.client.get('/patients', headers={'If-Modified-Since': 'Mon, 01 Jan 2024 08:00:00 GMT'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Last-Modified', first.headers)
+        self.assertNotEqual(response.headers['ETag'], first.headers['ETag'])
+
+    def test_get_all_patients_error_has_no_validators(self):
+        response = self.client.get('/patients?fields=unknown')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn('ETag', response.headers)
+        self.assertNotIn('Last-Modified', response.headers)
+
+    def test_get_all_patients_sparse_fields(self):
+        self.mock_service.get_all_patients.return_value = [self._make_patient()]
+
+        response = self.client.get('/patients?fields=id,name')
+
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data['result'], [{'id': 1, 'name': 'John Doe'}])
+        self.mock_service.get_all_patients.assert_called_once_with(['id', 'name'])
+
+    def test_get_all_patients_unknown_field(self):
+        response = self.client.get('/patients?fields=id,password')
+
+        self.assertEqual(response.status_code, 400)
+        data = response.get_json()
+        self.assertEqual(data['error']['code'], 'patient/validation-error')
+        self.assertIn('password', data['error']['message'])
+
+    def test_get_patients_by_ids(self):
+        self.mock_service.get_patients_by_ids.return_value = ([self._make_patient(id=7)], [8])
+
+        response = self.client.get('/patients?ids=7,8')
+
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data['result']['items'][0]['id'], 7)
+        self.assertEqual(data['result']['missing'], [8])
+        self.mock_service.get_patients_by_ids.assert_called_once_with([7, 8])
+
     def test_get_patient_by_id_success(self):
         mock_patient = Mock(spec=Patient)
         mock_patient.id = 1
@@ -137,6 +220,7 @@ class TestPatientRoutes(unittest.TestCase):
         mock_patient.address = "123 Main St, City"
         mock_patient.vaccine_type = "Pfizer" 
         mock_patient.vaccine_count = 2 
+        mock_patient.updated_at = datetime(2024, 1, 1, 8, 0)
 
         self.mock_service.get_patient_by_id.return_value = mock_patient
 
@@ -146,6 +230,67 @@ class TestPatientRoutes(unittest.TestCase):
         data = response.get_json()
         self.assertEqual(data['result']['name'], 'John Doe')
 
+    def test_search_patients(self):
+        self.mock_service.search_patients.return_value = ([self._make_patient()], True)
+
+        response = self.client.get('/patients/search?q=john&page=1&per_page=1')
+
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(len(data['result']['items']), 1)
+        self.assertEqual(data['result']['items'][0]['name'], 'John Doe')
+        self.assertTrue(data['result']['has_more'])
+        self.assertEqual(data['result']['per_page'], 1)
+
+    def test_search_patients_missing_query(self):
+        response = self.client.get('/patients/search?q=%20')
+
+        self.assertEqual(response.status_code, 400)
+        data = response.get_json()
+        self.assertEqual(data['error']['code'], 'patient/validation-error')
+        self.mock_service.search_patients.assert_not_called()
+
+    def test_get_patient_by_ktp_success(self):
+        self.mock_service.get_patient_by_ktp.return_value = self._make_patient()
+
+        response = self.client.get('/patients/by-ktp/1234567890123456')
+
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data['result']['no_ktp'], '1234567890123456')
+        self.mock_service.get_patient_by_ktp.assert_called_once_with('1234567890123456')
+
+    def test_get_patient_by_ktp_not_found(self):
+        self.mock_service.get_patient_by_ktp.return_value = None
+
+        response = self.client.get('/patients/by-ktp/9999999999999999')
+
+        self.assertEqual(response.status_code, 404)
+        data = response.get_json()
+        self.assertEqual(data['error']['code'], 'patient/not-found')
+
+    def test_lookup_patients(self):
+        self.mock_service.lookup_patients.return_value = ([self._make_patient()], ['6543210987654321'])
+
+        response = self.client.post('/patients/lookup', json={
+            'no_ktp': ['1234567890123456', '6543210987654321']
+        })
+
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(len(data['result']['items']), 1)
+        self.assertEqual(data['result']['missing'], ['6543210987654321'])
+
+    def test_lookup_patients_validation_error(self):
+        response = self.client.post('/patients/lookup', json={
+            'no_ktp': ['123']
+        })
+
+        self.assertEqual(response.status_code, 400)
+        data = response.get_json()
+        self.assertEqual(data['error']['code'], 'patient/validation-error')
+        self.mock_service.lookup_patients.assert_not_called()
+
     def test_get_patient_by_id_not_found(self):
         self.mock_service.get_patient_by_id.return_value = None
 
@@ -2,7 +2,7 @@ import unittest
 from unittest.mock import Mock
 from app.services.patient import PatientService
 from app.repositories.patient import PatientRepository
-from app.schemas.patient import PatientCreate, PatientUpdate
+from app.schemas.patient import PatientCreate, PatientUpdate, PatientSearch, PatientLookup
 from app.models.gender import Gender
 from app.exceptions import DuplicateResourceError
 from sqlalchemy.exc import IntegrityError
@@ -121,6 +121,47 @@ class TestPatientService(unittest.TestCase):
         with self.assertRaises(IntegrityError):
             self.service.update_patient(1, update_data)
 
+    def test_get_patient_by_ktp(self):
+        self.mock_repo.get_by_ktp.return_value = Mock(id=1)
+
+        result = self.service.get_patient_by_ktp("1234567890123456")
+
+        self.assertEqual(result.id, 1)
+        self.mock_repo.get_by_ktp.assert_called_once_with("1234567890123456")
+
+    def test_lookup_patients_keeps_order_and_reports_missing(self):
+        first = Mock(no_ktp="1111111111111111")
+        second = Mock(no_ktp="2222222222222222")
+        self.mock_repo.get_by_ktps.return_value = [first, second]
+
+        found, missing = self.service.lookup_patients(PatientLookup(
+            no_ktp=["2222222222222222", "3333333333333333", "1111111111111111", "2222222222222222"]
+        ))
+
+        self.assertEqual(found, [second, first])
+        self.assertEqual(missing, ["3333333333333333"])
+        self.mock_repo.get_by_ktps.assert_called_once_with(
+            ["2222222222222222", "3333333333333333", "1111111111111111"]
+        )
+
+    def test_search_patients_has_more(self):
+        self.mock_repo.search.return_value = [Mock(id=1), Mock(id=2), Mock(id=3)]
+
+        patients, has_more = self.service.search_patients(PatientSearch(q="john", page=2, per_page=2))
+
+        self.assertEqual(len(patients), 2)
+        self.assertTrue(has_more)
+        self.mock_repo.search.assert_called_once_with("john", 3, 2)
+
+    def test_search_patients_last_page(self):
+        self.mock_repo.search.return_value = [Mock(id=1)]
+
+        patients, has_more = self.service.search_patients(PatientSearch(q="john"))
+
+        self.assertEqual(len(patients), 1)
+        self.assertFalse(has_more)
+        self.mock_repo.search.assert_called_once_with("john", 21, 0)
+
     def test_delete_patient(self):
         self.mock_repo.delete.return_value = True
 
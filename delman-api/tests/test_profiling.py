@@ -0,0 +1,111 @@
+import json
+import os
+import tempfile
+import unittest
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+from app.metrics.profiling import RequestProfiler, summarize, _layer
+from app.routes.profiles import create_profiles_blueprint
+
+class TestRequestProfiler(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.app = Flask(__name__)
+        self.app.config.update(
+            JWT_SECRET_KEY='test',
+            PROFILING_ENABLED=True,
+            PROFILING_ADMIN_IDS=['1'],
+            PROFILING_DIR=self.directory,
+        )
+        JWTManager(self.app)
+        self.profiler = RequestProfiler()
+        self.profiler.init_app(self.app)
+        self.app.register_blueprint(create_profiles_blueprint(self.profiler))
+
+        @self.app.route('/work')
+        def work():
+            return {"total": sum(range(1000))}
+
+        with self.app.app_context():
+            self.admin = {'Authorization': 'Bearer ' + create_access_token(identity=1)}
+            self.employee = {'Authorization': 'Bearer ' + create_access_token(identity=2)}
+        self.client = self.app.test_client()
+
+    def test_admin_request_is_profiled_and_stored(self):
+        response = self.client.get('/work', headers=dict(self.admin, **{'X-Profile': '1'}))
+
+        report_id = response.headers['X-Profile-Id']
+        self.assertTrue(os.path.exists(os.path.join(self.directory, report_id + '.prof')))
+        report = self.client.get(f'/profiles/{report_id}', headers=self.admin).get_json()['result']
+        self.assertEqual(report['route'], '/work')
+        self.assertEqual(report['status'], 200)
+        self.assertIn('layers_ms', report)
+
+    def test_non_admin_header_is_ignored(self):
+        response = self.client.get('/work', headers=dict(self.employee, **{'X-Profile': '1'}))
+
+        self.assertNotIn('X-Profile-Id', response.headers)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_anonymous_header_is_ignored(self):
+        response = self.client.get('/work', headers={'X-Profile': '1'})
+
+        self.assertNotIn('X-Profile-Id', response.headers)
+
+    def test_sampling_profiles_without_header(self):
+        self.profiler.sample_rate = 1.0
+
+        response = self.client.get('/work')
+
+        self.assertIn('X-Profile-Id', response.headers)
+
+    def test_reports_are_admin_only(self):
+        report_id = self.client.get('/work', headers=dict(self.admin, **{'X-Profile': '1'})).headers['X-Profile-Id']
+
+        response = self.client.get(f'/profiles/{report_id}', headers=self.employee)
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_report_id_cannot_escape_directory(self):
+        response = self.client.get('/profiles/..%2F..%2Fetc%2Fpasswd', headers=self.admin)
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_disabled_profiler_adds_no_hooks(self):
+        app = Flask(__name__)
+        profiler = RequestProfiler()
+        profiler.init_app(app)
+
+        self.assertFalse(profiler.enabled)
+        self.assertEqual(app.before_request_funcs, {})
+
+    def test_directory_is_private_and_defaults_to_instance_path(self):
+        app = Flask(__name__, instance_path=os.path.join(self.directory, 'instance'))
+        app.config['PROFILING_ENABLED'] = True
+        profiler = RequestProfiler()
+        profiler.init_app(app)
+
+        self.assertEqual(profiler.directory, os.path.join(app.instance_path, 'profiles'))
+        self.assertEqual(os.stat(profiler.directory).st_mode & 0o777, 0o700)
+
+class TestSummarize(unittest.TestCase):
+    def test_layers(self):
+        self.assertEqual(_layer('/srv/delman-api/app/routes/doctor.py'), 'route')
+        self.assertEqual(_layer('/srv/delman-api/app/services/appointment.py'), 'service')
+        self.assertEqual(_layer('/srv/delman-api/app/repositories/patient.py'), 'repository')
+        self.assertEqual(_layer('/usr/lib/python3/site-packages/sqlalchemy/orm/session.py'), 'db')
+        self.assertEqual(_layer("<method 'execute' of 'sqlite3.Cursor' objects>"), 'db')
+
+    def test_summary_shape(self):
+        import cProfile
+        profile = cProfile.Profile()
+        profile.runcall(sum, range(100))
+
+        summary = summarize(profile, 0.001)
+
+        self.assertEqual(summary['total_ms'], 1.0)
+        self.assertIsInstance(summary['layers_ms'], dict)
+        json.dumps(summary)
+
+if __name__ == '__main__':
+    unittest.main()
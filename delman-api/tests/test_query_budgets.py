@@ -0,0 +1,99 @@
+import os
+import unittest
+from unittest.mock import patch
+from datetime import date, datetime, time, timedelta
+from flask import Flask
+from app import create_app
+from app.exts import db
+from app.metrics import timing
+from app.models.gender import Gender
+from app.models.patient import Patient
+from app.models.doctor import Doctor
+from app.models.appointment import Appointment
+from tests.helpers import QueryCountAssertions
+
+class TestQueryBudgets(QueryCountAssertions, unittest.TestCase):
+    """List endpoints must issue a constant number of statements, whatever the row count."""
+
+    def setUp(self):
+        with patch.dict(os.environ, {'FLASK_ENV': 'testing'}):
+            self.app = create_app()
+        self.app.config['QUERY_COUNT_HEADER'] = True
+        timing.count_header = True
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self._seed(20)
+        self.client = self.app.test_client()
+        self.jwt_patcher = patch('flask_jwt_extended.view_decorators.verify_jwt_in_request')
+        self.jwt_patcher.start()
+
+    def tearDown(self):
+        self.jwt_patcher.stop()
+        timing.count_header = False
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _seed(self, count):
+        start = datetime(2024, 1, 1, 9, 0)
+        for i in range(count):
+            doctor = Doctor(name=f"Doctor {i}", username=f"doctor{i}", password="x", gender=Gender.FEMALE,
+                            birthdate=date(1980, 1, 1), work_start_time=time(9, 0), work_end_time=time(17, 0))
+            patient = Patient(name=f"Patient {i}", gender=Gender.MALE, birthdate=date(1990, 1, 1),
+                              no_ktp=f"{i:016d}", address="Jl. Sudirman")
+            db.session.add(Appointment(patient=patient, doctor=doctor, datetime=start + timedelta(days=i)))
+        db.session.commit()
+        db.session.remove()
+
+    def _get(self, url, limit):
+        with self.assertMaxQueries(limit):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_list_appointments(self):
+        self._get('/appointments', 1)
+
+    def test_list_appointments_expanded(self):
+        response = self._get('/appointments?expand=patient,doctor', 3)
+
+        self.assertEqual(len(response.get_json()['result']), 20)
+        self.assertEqual(response.headers['X-Query-Count'], '3')
+
+    def test_list_doctors_and_patients(self):
+        self._get('/doctors', 2)
+        self._get('/patients', 2)
+
+
+class TestRepeatedQueryLog(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.app.config['QUERY_REPEAT_THRESHOLD'] = 5
+        db.init_app(self.app)
+        timing.init_app(self.app)
+
+        @self.app.route('/n-plus-one')
+        def n_plus_one():
+            for id in range(5):
+                db.session.get(Doctor, id)
+            return {}
+
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+
+    def tearDown(self):
+        timing.repeat_threshold = 10
+
+    def test_repeated_statement_is_logged(self):
+        with self.assertLogs('delman.requests', 'WARNING') as logs:
+            self.client.get('/n-plus-one')
+
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn('"event": "repeated_query"', logs.output[0])
+        self.assertIn('"count": 5', logs.output[0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import json
+import unittest
+from unittest.mock import Mock, patch
+from flask import Flask
+from datetime import date
+from app.exts import db
+from app.metrics import install_db_hooks
+from app.metrics.slow_queries import SlowQueryLog, slow_query_log, redact
+from app.models.gender import Gender
+from app.repositories.patient import PatientRepository
+
+class TestSlowQueryLog(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        # Anything counts as slow
+        self.app.config['SLOW_QUERY_THRESHOLD_MS'] = 0.0001
+        db.init_app(self.app)
+        slow_query_log.init_app(self.app)
+        install_db_hooks()
+        self.repo = PatientRepository(db)
+
+        @self.app.route('/patients/search')
+        def search():
+            return {"count": len(self.repo.search('Budi', 10))}
+
+        with self.app.app_context():
+            db.create_all()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        slow_query_log.threshold = 0.0
+
+    def test_slow_query_is_logged_with_origin(self):
+        with self.assertLogs('delman.slow_queries', 'WARNING') as logs:
+            self.client.get('/patients/search')
+
+        entry = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(entry['event'], 'slow_query')
+        self.assertEqual(entry['route'], '/patients/search')
+        self.assertEqual(entry['repository'], 'PatientRepository.search')
+        self.assertTrue(entry['statement'].startswith('SELECT'))
+        self.assertNotIn('Budi', json.dumps(entry))
+
+    def test_base_repository_methods_are_attributed_to_the_subclass(self):
+        with self.app.app_context(), self.assertLogs('delman.slow_queries', 'WARNING') as logs:
+            patient = self.repo.create({'name': 'Budi', 'gender': Gender.MALE, 'birthdate': date(1990, 1, 1),
+                                        'no_ktp': '1234567890123456', 'address': 'Jl. Sudirman'})
+            self.repo.update(patient.id, {'address': 'Jl. Thamrin'})
+
+        repositories = [json.loads(record.getMessage())['repository'] for record in logs.records]
+        self.assertIn('PatientRepository.create', repositories)
+        self.assertIn('PatientRepository.update', repositories)
+
+    def test_fast_queries_are_not_logged(self):
+        slow_query_log.threshold = 10.0
+        with patch('app.metrics.slow_queries.logger') as mock_logger:
+            self.client.get('/patients/search')
+
+        mock_logger.warning.assert_not_called()
+
+
+class TestSlowQueryExplain(unittest.TestCase):
+    def test_redact(self):
+        self.assertEqual(redact({'name': 'Budi', 'id': 3}), {'name': 'str', 'id': 'int'})
+        self.assertEqual(redact(('Budi', 3, None)), ['str', 'int', 'NoneType'])
+
+    def test_explain_is_rate_limited_per_statement(self):
+        log = SlowQueryLog()
+        log.threshold = 0.001
+        log.explain = True
+        log._ensure_worker = Mock()
+        conn = Mock()
+        conn.dialect.name = 'postgresql'
+
+        for _ in range(3):
+            log.observe(conn, 'SELECT * FROM patient WHERE name = %(name)s', {'name': 'Budi'}, False, 1.0)
+        log.observe(conn, 'SELECT * FROM doctor', {}, False, 1.0)
+        log.observe(conn, 'SELECT * FROM doctor', {}, False, 0.0001)
+
+        self.assertEqual(log._explain_queue.qsize(), 2)
+
+    def test_explain_queue_is_bounded(self):
+        log = SlowQueryLog()
+        log.threshold = 0.001
+        log.explain = True
+        log._ensure_worker = Mock()
+        conn = Mock()
+        conn.dialect.name = 'postgresql'
+
+        for i in range(10):
+            log.observe(conn, f'SELECT {i}', {}, False, 1.0)
+
+        self.assertEqual(log._explain_queue.qsize(), 4)
+
+    def test_no_explain_on_sqlite(self):
+        log = SlowQueryLog()
+        log.threshold = 0.001
+        log.explain = True
+        conn = Mock()
+        conn.dialect.name = 'sqlite'
+
+        log.observe(conn, 'SELECT 1', {}, False, 1.0)
+
+        self.assertEqual(log._explain_queue.qsize(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import os
+import tempfile
+import unittest
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+from sqlalchemy import create_engine, inspect, text
+from app.metrics import capture_queries
+from startup import (prepare, upgrade, current_revisions, migration_lock, needs_seed, script_directory,
+                     StartupError, BASELINE, MIGRATION_LOCK)
+
+class TestPrepare(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        self.url = f'sqlite:///{self.path}'
+        self.heads = set(script_directory().get_heads())
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_fresh_database_is_migrated_to_head(self):
+        report = prepare(self.url, seed=False)
+
+        self.assertEqual(report['migration'], 'migrated')
+        self.assertEqual(report['from'], [])
+        self.assertIn('migrate', report['phases'])
+        self.assertEqual(current_revisions(create_engine(self.url)), self.heads)
+
+    def test_database_at_head_costs_one_query(self):
+        prepare(self.url, seed=False)
+
+        with capture_queries() as statements:
+            report = prepare(self.url, seed=False)
+
+        self.assertEqual(report['migration'], 'up-to-date')
+        self.assertNotIn('migrate', report['phases'])
+        self.assertEqual(statements, ['SELECT version_num FROM alembic_version'])
+
+    def test_pre_baseline_database_is_adopted(self):
+        # A database made before migrations/ was committed: baseline tables, autogenerated revision
+        upgrade(self.url, revision=BASELINE)
+        engine = create_engine(self.url)
+        with engine.begin() as connection:
+            connection.execute(text("UPDATE alembic_version SET version_num = 'ffffffffffff'"))
+
+        with self.assertLogs('delman.startup', 'WARNING'):
+            report = prepare(self.url, seed=False)
+
+        self.assertEqual(report['migration'], 'adopted')
+        self.assertEqual(current_revisions(engine), self.heads)
+        self.assertIn('version', [column['name'] for column in inspect(engine).get_columns('patient')])
+
+    def test_unknown_revision_on_a_newer_schema_stops_startup(self):
+        prepare(self.url, seed=False)
+        engine = create_engine(self.url)
+        with engine.begin() as connection:
+            connection.execute(text("UPDATE alembic_version SET version_num = 'ffffffffffff'"))
+
+        with self.assertRaisesRegex(StartupError, f'flask db stamp {BASELINE}'):
+            prepare(self.url, seed=False)
+        self.assertEqual(current_revisions(engine), {'ffffffffffff'})
+
+    def test_seed_runs_under_the_migration_lock(self):
+        prepare(self.url, seed=False)
+        events = []
+
+        @contextmanager
+        def recording_lock(engine):
+            events.append('lock')
+            yield
+            events.append('unlock')
+
+        with patch('startup.migration_lock', recording_lock), \
+                patch('seed.seed_data', side_effect=lambda: events.append('seed')):
+            report = prepare(self.url)
+
+        self.assertEqual(events, ['lock', 'seed', 'unlock'])
+        self.assertEqual(report['migration'], 'up-to-date')
+
+    def test_needs_seed_until_employees_and_doctors_exist(self):
+        prepare(self.url, seed=False)
+        engine = create_engine(self.url)
+
+        self.assertTrue(needs_seed(engine))
+        with engine.begin() as connection:
+            connection.execute(text("INSERT INTO employee (name, username, password, gender, birthdate) VALUES ('A', 'a', 'x', 'MALE', '1990-01-01')"))
+            self.assertTrue(needs_seed(engine))
+            connection.execute(text("INSERT INTO doctor (name, username, password, gender, birthdate, work_start_time, work_end_time) "
+                                    "VALUES ('B', 'b', 'x', 'MALE', '1990-01-01', '08:00:00', '16:00:00')"))
+        self.assertFalse(needs_seed(engine))
+
+class TestMigrationLock(unittest.TestCase):
+    def test_postgres_holds_advisory_lock(self):
+        engine = MagicMock()
+        engine.dialect.name = 'postgresql'
+        connection = engine.connect.return_value.execution_options.return_value.__enter__.return_value
+
+        with migration_lock(engine):
+            statements = [str(call.args[0]) for call in connection.execute.call_args_list]
+            self.assertEqual(statements, ['SELECT pg_advisory_lock(:key)'])
+
+        statements = [str(call.args[0]) for call in connection.execute.call_args_list]
+        self.assertEqual(statements[-1], 'SELECT pg_advisory_unlock(:key)')
+        self.assertEqual(connection.execute.call_args.args[1], {'key': MIGRATION_LOCK})
+
+    def test_other_databases_need_no_lock(self):
+        engine = MagicMock()
+        engine.dialect.name = 'sqlite'
+
+        with migration_lock(engine):
+            pass
+
+        engine.connect.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+from flask import Flask
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from app.exts import db
+from app.metrics.tracing import Tracing, tracing
+from app.repositories.patient import PatientRepository
+
+class PatientLookup:
+    def __init__(self, repo):
+        self.repo = repo
+
+    def find(self, name):
+        return self._check(self.repo.search(name, 10))
+
+    def _check(self, patients):
+        return patients
+
+    def each(self):
+        yield 1
+
+class TestTracing(unittest.TestCase):
+    def setUp(self):
+        self.exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(self.exporter))
+        tracing._provider = provider
+
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.app.config['TRACING_EXPORTER'] = 'console'
+        db.init_app(self.app)
+        tracing.init_app(self.app)
+        self.repo = tracing.instrument(PatientRepository(db), 'repository')
+        self.service = tracing.instrument(PatientLookup(self.repo), 'service')
+
+        @self.app.route('/patients/search')
+        def search():
+            return {"count": len(self.service.find('Budi'))}
+
+        with self.app.app_context():
+            db.create_all()
+        self.exporter.clear()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        tracing.enabled = False
+        tracing.tracer = None
+        tracing._provider = None
+
+    def spans(self):
+        return {span.name: span for span in self.exporter.get_finished_spans()}
+
+    def test_request_is_split_into_layers(self):
+        self.client.get('/patients/search')
+
+        spans = self.spans()
+        request = spans['GET /patients/search']
+        service = spans['PatientLookup.find']
+        repository = spans['PatientRepository.search']
+        statement = spans['SELECT']
+        self.assertEqual(request.attributes['http.status_code'], 200)
+        self.assertEqual(service.parent.span_id, request.context.span_id)
+        self.assertEqual(repository.parent.span_id, service.context.span_id)
+        self.assertEqual(statement.parent.span_id, repository.context.span_id)
+        self.assertEqual(statement.attributes['delman.layer'], 'db')
+        self.assertEqual(spans['PatientLookup._check'].parent.span_id, service.context.span_id)
+
+    def test_all_spans_share_one_trace(self):
+        self.client.get('/patients/search')
+
+        self.assertEqual(len({span.context.trace_id for span in self.exporter.get_finished_spans()}), 1)
+
+    def test_failed_statement_span_is_closed(self):
+        with self.app.app_context():
+            with self.assertRaises(Exception):
+                db.session.execute(db.text('SELECT * FROM missing_table'))
+
+        self.assertIn('ERROR', str(self.spans()['SELECT'].status.status_code))
+
+    def test_generator_methods_are_left_alone(self):
+        self.assertEqual(list(self.service.each()), [1])
+        self.assertNotIn('PatientLookup.each', self.spans())
+
+    def test_instrument_without_exporter_returns_instance_untouched(self):
+        disabled = Tracing()
+        disabled.init_app(Flask(__name__))
+        lookup = PatientLookup(None)
+
+        self.assertIs(disabled.instrument(lookup, 'service'), lookup)
+        self.assertNotIn('find', vars(lookup))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from unittest.mock import patch
+from flask import Flask
+from datetime import date
+from sqlalchemy import event
+from app.exts import db
+from app.models.employee import Employee
+from app.models.gender import Gender
+from app.utils import jwt_and_current_user_required, current_user_cache
+
+class TestCurrentUserRequired(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        db.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.employee = Employee(name="John Doe", username="johndoe", password="x",
+                                 gender=Gender.MALE, birthdate=date(1990, 1, 1))
+        db.session.add(self.employee)
+        db.session.commit()
+        current_user_cache.invalidate(f'employee:{self.employee.id}')
+
+        @jwt_and_current_user_required()
+        def view(current_user):
+            return current_user.username
+        self.view = view
+
+        self.identity_patcher = patch('app.utils.get_jwt_identity', return_value=self.employee.id)
+        self.identity_patcher.start()
+        self.statements = []
+        event.listen(db.engine, 'before_cursor_execute', self._record)
+
+    def tearDown(self):
+        event.remove(db.engine, 'before_cursor_execute', self._record)
+        self.identity_patcher.stop()
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _record(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def test_lookup_is_cached(self):
+        self.assertEqual(self.view(), "johndoe")
+        db.session.remove()
+        self.statements.clear()
+
+        self.assertEqual(self.view(), "johndoe")
+        self.assertEqual(self.statements, [])
+
+    def test_invalidated_lookup_hits_database(self):
+        self.view()
+        db.session.delete(self.employee)
+        db.session.commit()
+        current_user_cache.invalidate(f'employee:{self.employee.id}')
+
+        with self.app.test_request_context():
+            response, status_code = self.view()
+
+        self.assertEqual(status_code, 401)
+        self.assertEqual(response.get_json()['error']['code'], 'auth/user-not-found')
+
+if __name__ == '__main__':
+    unittest.main()
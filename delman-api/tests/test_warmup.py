@@ -0,0 +1,71 @@
+import os
+import runpy
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+from flask import Flask
+from sqlalchemy import create_engine
+from app.utils import CustomJSONProvider
+from app.warmup import REQUESTS, warm_schemas, prime_connections, pool_capacity
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class TestWarmup(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        self.engine = create_engine(f'sqlite:///{self.path}', pool_size=3)
+
+    def tearDown(self):
+        self.engine.dispose()
+        os.remove(self.path)
+
+    def test_warm_schemas_runs_every_sample(self):
+        app = Flask(__name__)
+        app.json = CustomJSONProvider(app)
+
+        self.assertEqual(warm_schemas(app), len(REQUESTS) + 5)
+
+    def test_prime_connections_leaves_them_in_the_pool(self):
+        self.assertEqual(prime_connections(self.engine, 3), 3)
+
+        self.assertEqual(self.engine.pool.checkedin(), 3)
+        self.assertEqual(self.engine.pool.checkedout(), 0)
+
+    def test_pool_capacity_is_capped_by_pool_size(self):
+        self.assertEqual(pool_capacity(self.engine, 8), 3)
+        self.assertEqual(pool_capacity(self.engine, 2), 2)
+
+class TestGunicornConfig(unittest.TestCase):
+    def load(self, **env):
+        with patch.dict(os.environ, env):
+            os.environ.pop('DB_POOL_SIZE', None)
+            settings = runpy.run_path(os.path.join(ROOT, 'gunicorn.conf.py'))
+            settings['environ'] = dict(os.environ)
+        return settings
+
+    def test_defaults(self):
+        settings = self.load()
+
+        self.assertTrue(settings['preload_app'])
+        self.assertEqual(settings['workers'], settings['cpus'])
+        self.assertLessEqual(settings['threads'], 4)
+        self.assertEqual(settings['environ']['DB_POOL_SIZE'], str(settings['threads']))
+        self.assertGreater(settings['max_requests_jitter'], 0)
+
+    def test_environment_overrides(self):
+        settings = self.load(GUNICORN_WORKERS='3', GUNICORN_THREADS='1', PORT='8080')
+
+        self.assertEqual((settings['workers'], settings['threads']), (3, 1))
+        self.assertEqual(settings['bind'], '0.0.0.0:8080')
+
+    def test_child_exit_marks_worker_dead(self):
+        settings = self.load()
+        with patch.dict(os.environ, PROMETHEUS_MULTIPROC_DIR='/tmp/metrics'), \
+                patch('prometheus_client.multiprocess.mark_process_dead') as mark_process_dead:
+            settings['child_exit'](MagicMock(), MagicMock(pid=4242))
+
+        mark_process_dead.assert_called_once_with(4242)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,20 +1,33 @@
+import csv
+import glob
 import schedule
 import time
 from google.cloud import bigquery
 from google.oauth2 import service_account
 from sqlalchemy import create_engine, text
 import os
+from contextlib import contextmanager
 from dotenv import load_dotenv
 
+try:
+    from opentelemetry import trace
+except ImportError:  # optional: the job runs the same without spans
+    trace = None
+
 # Load environment variables from .env file
 load_dotenv()
 
+# Offline runs read the vaccine records from CSV files (as written by delman-api's
+# benchmarks/datagen.py) instead of BigQuery, e.g. VACCINE_SOURCE_FILES=/data/vaccines/*.csv
+vaccine_source_files = os.getenv('VACCINE_SOURCE_FILES')
+
 # Set up BigQuery client
-credentials_path = os.path.join(os.path.dirname(__file__),  'credentials.json')
-credentials = service_account.Credentials.from_service_account_file(
-    credentials_path
-)
-bq_client = bigquery.Client(credentials=credentials, project=credentials.project_id)
+if not vaccine_source_files:
+    credentials_path = os.path.join(os.path.dirname(__file__),  'credentials.json')
+    credentials = service_account.Credentials.from_service_account_file(
+        credentials_path
+    )
+    bq_client = bigquery.Client(credentials=credentials, project=credentials.project_id)
 
 # Set up SQLAlchemy engine for your database
 db_url = os.getenv('DATABASE_URL')
@@ -22,27 +35,105 @@ if not db_url:
     raise ValueError("DATABASE_URL environment variable is not set")
 
 bq_table_name = os.getenv('BIG_QUERY_TABLE_NAME')
+bq_page_size = int(os.getenv('BIG_QUERY_PAGE_SIZE', 10000))
 engine = create_engine(db_url)
 
+def setup_tracing():
+    """Export spans like the API does: TRACING_EXPORTER is console, file or otlp, empty for none."""
+    exporter = os.getenv('TRACING_EXPORTER', '')
+    if not exporter or trace is None:
+        return None
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+
+    if exporter == 'otlp':
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        span_exporter = OTLPSpanExporter(endpoint=os.getenv('TRACING_OTLP_ENDPOINT', 'http://localhost:4318/v1/traces'))
+    elif exporter == 'file':
+        span_exporter = ConsoleSpanExporter(
+            out=open(os.getenv('TRACING_FILE', '/tmp/delman-scheduler-traces.jsonl'), 'a'),
+            formatter=lambda span: span.to_json(indent=None) + os.linesep
+        )
+    else:
+        span_exporter = ConsoleSpanExporter()
+    provider = TracerProvider(resource=Resource.create({'service.name': 'delman-scheduler'}))
+    provider.add_span_processor(BatchSpanProcessor(span_exporter))
+    return provider.get_tracer('delman-scheduler')
+
+tracer = setup_tracing()
+
+@contextmanager
+def span(name, **attributes):
+    if tracer is None:
+        yield None
+        return
+    with tracer.start_as_current_span(name, attributes=attributes) as current:
+        yield current
+
+def read_vaccine_files(pattern):
+    """Vaccine records from the CSV files matching `pattern`, one at a time."""
+    for path in sorted(glob.glob(pattern)):
+        with open(path, newline='') as file:
+            for row in csv.DictReader(file):
+                yield {'vaccine_type': row['vaccine_type'], 'vaccine_count': int(row['vaccine_count']), 'no_ktp': row['no_ktp']}
+
+class TimedRows:
+    """Iterates `rows` and adds up the time spent fetching them, apart from what the caller does with each."""
+
+    def __init__(self, rows):
+        self.rows = iter(rows)
+        self.count = 0
+        self.seconds = 0.0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            row = next(self.rows)
+        finally:
+            self.seconds += time.perf_counter() - started
+        self.count += 1
+        return row
+
 def update_patients_data():
-    print(f"Updating patient data from BigQuery table {bq_table_name}...")
+    with span('update_patients_data', **{'bigquery.table': vaccine_source_files or bq_table_name}):
+        _update_patients_data()
+
+def _update_patients_data():
+    if vaccine_source_files:
+        print(f"Updating patient data from {vaccine_source_files}...")
+    else:
+        print(f"Updating patient data from BigQuery table {bq_table_name}...")
     # Query BigQuery
     query = f"""
     SELECT vaccine_type, vaccine_count, no_ktp
     FROM `{bq_table_name}`
     """
-    query_job = bq_client.query(query)
-    results = query_job.result()
+    # Rows are streamed (BigQuery pages of BIG_QUERY_PAGE_SIZE), never all held in memory;
+    # the time spent inside the iterator is the fetch time, the rest of the loop the writes
+    with span('bigquery.query'):
+        if vaccine_source_files:
+            rows = read_vaccine_files(vaccine_source_files)
+        else:
+            rows = bq_client.query(query).result(page_size=bq_page_size)
 
-    # Update database
-    with engine.connect() as connection:
+    results = TimedRows(rows)
+    with span('patients.write') as current, engine.connect() as connection:
+        started = time.perf_counter()
         for row in results:
             update_query = text("""
             UPDATE patient
             SET 
                 vaccine_type = :vaccine_type,
-                vaccine_count = :vaccine_count
+                vaccine_count = :vaccine_count,
+                updated_at = CURRENT_TIMESTAMP,
+                version = version + 1
             WHERE no_ktp = :no_ktp
+              AND (vaccine_type IS DISTINCT FROM :vaccine_type
+                   OR vaccine_count IS DISTINCT FROM :vaccine_count)
             """)
             connection.execute(update_query, {
                 'vaccine_type': row['vaccine_type'],
@@ -50,6 +141,11 @@ def update_patients_data():
                 'no_ktp': row['no_ktp']
             })
         connection.commit()
+        if current is not None:
+            elapsed = time.perf_counter() - started
+            current.set_attribute('rows', results.count)
+            current.set_attribute('fetch_ms', round(results.seconds * 1000, 1))
+            current.set_attribute('write_ms', round((elapsed - results.seconds) * 1000, 1))
 
     print("Patient data updated successfully.")
 